@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import UTC, datetime
+
+from sentinel.core.archive import ArchiveSeries, import_klines, stored_timeframes, symbol_dir
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="SENTINEL: import bulk kline dumps for offline backtests.")
+    p.add_argument("--dir", default=".sentinel_cache/archive", help="archive root")
+    p.add_argument("--exchange", default="binance")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="merge CSV/zip kline files into the archive")
+    imp.add_argument("--symbol", required=True, help="e.g. BTC/USDT")
+    imp.add_argument("--timeframe", default="1m", help="timeframe of the files")
+    imp.add_argument("files", nargs="+")
+
+    info = sub.add_parser("info", help="show what is archived for a symbol")
+    info.add_argument("--symbol", required=True)
+    return p.parse_args()
+
+
+def _fmt_ms(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=UTC).strftime("%Y-%m-%d %H:%M")
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "import":
+        t0 = time.perf_counter()
+        n = import_klines(args.dir, args.exchange, args.symbol, args.timeframe, args.files)
+        print(f"{args.symbol} {args.timeframe}: {n} candles stored ({time.perf_counter() - t0:.1f}s)")
+        return 0
+
+    tfs = stored_timeframes(args.dir, args.exchange, args.symbol)
+    if not tfs:
+        print(f"{args.symbol}: nothing archived under {args.dir}")
+        return 1
+    for tf in tfs:
+        s = ArchiveSeries.load(symbol_dir(args.dir, args.exchange, args.symbol) / tf)
+        span = f"{_fmt_ms(int(s.ts[0]))} → {_fmt_ms(int(s.ts[-1]))}" if len(s) else "empty"
+        print(f"{args.symbol} {tf}: {len(s)} candles, {span}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,67 @@
 from __future__ import annotations
 
 import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any
 
-from sentinel.core.backtest import BacktestResult, run_backtest
-from sentinel.core.exchange import ExchangeConfig, create_exchange
+import sentinel.core
+from sentinel.core.archive import load_archive
+from sentinel.core.backtest import (
+    BacktestResult,
+    BacktestStats,
+    Signal,
+    detect_signals,
+    simulate_r_series,
+    summarize,
+)
+from sentinel.core.bootstrap import BootstrapResult, bootstrap_outcomes
+from sentinel.core.config import load_config
+from sentinel.core.exchange import (
+    ExchangeConfig,
+    ExchangeError,
+    RateLimitConfig,
+    create_exchange,
+    fetch_tickers_safe,
+    load_markets_safe,
+)
+from sentinel.core.filters import rank_by_quote_volume
+from sentinel.core.history import HistoryConfig, fetch_ohlcv_range, parse_date_ms
 from sentinel.core.io import write_json, write_text
 from sentinel.core.ohlcv import OHLCVConfig, fetch_ohlcv_safe, split_ohlcv
-from sentinel.core.setups import (
-    BreakoutRetestConfig,
-    PullbackConfig,
-    detect_breakout_retest_long,
-    detect_pullback_long,
+from sentinel.core.portfolio import (
+    PortfolioConfig,
+    PortfolioResult,
+    SymbolStream,
+    run_portfolio,
+    symbol_stream,
+)
+from sentinel.core.profiler import profile_to
+from sentinel.core.regime_batch import REGIME_CODES, regime_history, stack_ohlcv
+from sentinel.core.resultcache import ResultCache, code_fingerprint, content_key
+from sentinel.core.risk import RiskConfig
+from sentinel.core.setups import BreakoutRetestConfig, PullbackConfig
+from sentinel.core.universe import load_universe
+from sentinel.core.walkforward import WalkForwardConfig, WalkForwardResult, parse_grid, walk_forward
+
+# CLI options a pair worker reads, copied out of the argparse namespace
+_PAIR_OPTIONS = (
+    "bars",
+    "archive_dir",
+    "history_workers",
+    "history_dir",
+    "bootstrap",
+    "block_size",
+    "seed",
+    "walk_forward",
+    "portfolio",
+    "result_cache",
+    "result_cache_mb",
 )
 
 
@@ -18,41 +69,303 @@ def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="SENTINEL backtest-lite (read-only).")
     p.add_argument("--exchange", default="binance")
     p.add_argument("--pairs", default="BTC/USDT,ETH/USDT", help="comma-separated")
+    p.add_argument("--universe", default=None, metavar="top:N", help="top N USDT spot pairs by quote volume (overrides --pairs)")
     p.add_argument("--timeframes", default="1h,4h", help="comma-separated")
     p.add_argument("--bars", type=int, default=800)
+    p.add_argument("--since", default=None, help="start date (ISO, UTC); downloads paginated history instead of --bars")
+    p.add_argument("--until", default=None, help="end date (ISO, UTC); default now")
+    p.add_argument("--history-workers", type=int, default=4)
+    p.add_argument("--history-dir", default=".sentinel_cache/history", help="resumable page cache ('' = off)")
+    p.add_argument("--archive-dir", default=None, help="read candles offline from `sentinel.archive` imports")
     p.add_argument("--format", choices=["text", "json"], default="text")
     p.add_argument("--out", default=None)
+    p.add_argument("--config", default="sentinel.toml")
+
+    p.add_argument("--portfolio", action="store_true", help="also replay all pairs on one time axis")
+    p.add_argument("--max-open", type=int, default=None, help="portfolio cap on concurrent positions")
+
+    p.add_argument("--regime-filter", default=None, help="only take signals on bars in these regimes, e.g. trend")
+    p.add_argument(
+        "--setup-params",
+        default=None,
+        help='detector settings over sentinel.toml\'s [setups], e.g. "pullback_tolerance_pct=2.5;breakout_lookback=30"',
+    )
+
+    p.add_argument("--bootstrap", type=int, default=0, metavar="N", help="resample each series' R outcomes N times")
+    p.add_argument("--block-size", type=int, default=1, help="bootstrap block length (>1 keeps streaks intact)")
+    p.add_argument("--seed", type=int, default=None)
+
+    p.add_argument("--walk-forward", action="store_true", help="rolling train/test folds instead of one in-sample run (not with --portfolio/--bootstrap/--regime-filter)")
+    p.add_argument("--train-bars", type=int, default=1000)
+    p.add_argument("--test-bars", type=int, default=250)
+    p.add_argument("--step-bars", type=int, default=None, help="default: --test-bars")
+    p.add_argument("--anchored", action="store_true", help="expanding train window")
+    p.add_argument("--grid", default=None, help='e.g. "pullback_tolerance_pct=1.5,2.2,3;breakout_lookback=30,40"')
+    p.add_argument("--workers", type=int, default=None, help="process pool size for pairs and walk-forward (default: CPU count)")
+    p.add_argument(
+        "--result-cache",
+        default=".sentinel_cache/results",
+        help="reuse signals and results of unchanged candles + settings ('' = off)",
+    )
+    p.add_argument("--result-cache-mb", type=int, default=512, help="evict least-recently-used results beyond this size")
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="sample this process's stacks into FILE (collapsed, flamegraph-ready); use --workers 1 to see pair work",
+    )
     return p.parse_args()
 
 
-def _plans_to_series(symbol: str, closes: list[float], lows: list[float]) -> tuple[list[float], list[float], list[float]]:
+def parse_universe(spec: str) -> int:
+    """
+    "top:200" → 200.
+    """
+    kind, _, n = spec.partition(":")
+    if kind.strip().lower() != "top" or not n.strip().isdigit() or int(n) <= 0:
+        raise ValueError(f"bad --universe {spec!r}, expected top:N")
+    return int(n)
+
+
+def parse_regime_filter(spec: str) -> set[int]:
+    """
+    "trend,range" → their REGIME_CODES indices.
+    """
+    valid = [r.value for r in REGIME_CODES]
+    names = [r.strip().lower() for r in spec.split(",") if r.strip()]
+    bad = [n for n in names if n not in valid]
+    if bad or not names:
+        raise ValueError(f"bad --regime-filter {spec!r}, expected a comma list of: {', '.join(valid)}")
+    return {valid.index(n) for n in names}
+
+
+def setup_configs(cfg, spec: str | None) -> tuple[PullbackConfig, BreakoutRetestConfig]:
+    """
+    Detector configs from the config file's [setups], with `spec` ("key=value;…")
+    overriding single fields.
+    """
+    params = {}
+    for key, values in (parse_grid(spec) if spec else {}).items():
+        if len(values) != 1:
+            raise ValueError(f"bad --setup-params {key!r}: expected exactly one value")
+        params[key] = values[0]
+    pb = PullbackConfig(pullback_lookback=cfg.pullback_lookback, pullback_tolerance_pct=cfg.pullback_tolerance_pct)
+    br = BreakoutRetestConfig(
+        breakout_lookback=cfg.breakout_lookback,
+        retest_lookback=cfg.retest_lookback,
+        retest_tolerance_pct=cfg.retest_tolerance_pct,
+    )
+    pb_fields, br_fields = vars(pb), vars(br)
+    return (
+        replace(pb, **{k: v for k, v in params.items() if k in pb_fields}),
+        replace(br, **{k: v for k, v in params.items() if k in br_fields}),
+    )
+
+
+def select_universe(ex, top_n: int) -> list[str]:
+    markets = load_markets_safe(ex)
+    pairs = load_universe(ex.id, markets).select(exclude_stables=True)
+    return rank_by_quote_volume(pairs, fetch_tickers_safe(ex))[:top_n]
+
+
+@dataclass(frozen=True)
+class PairOutcome:
+    symbol: str
+    results: list[BacktestResult] = field(default_factory=list)
+    boots: list[BootstrapResult] = field(default_factory=list)
+    streams: list[tuple[str, SymbolStream]] = field(default_factory=list)  # (timeframe, stream)
+    wf_series: list[tuple[str, str, list[float], list[float]]] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)  # "<tf>: <reason>"; other timeframes still count
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+_RESULT_CACHE: tuple[int, ResultCache] | None = None
+_CODE_VERSION: str | None = None
+
+
+def _result_cache(opts: dict) -> ResultCache | None:
     """
-    Build per-index stop and tp1 by detecting setups at each index.
-    For simplicity: evaluate setup using window up to i, and if setup exists, record stop/tp1.
+    This process's handle on the result cache in `opts`, or None when it is off.
     """
-    stops: list[float] = []
-    tp1s: list[float] = []
-    entries: list[float] = []
+    global _RESULT_CACHE
+    if not opts.get("result_cache"):
+        return None
+    if _RESULT_CACHE is None or _RESULT_CACHE[0] != os.getpid() or str(_RESULT_CACHE[1].root) != opts["result_cache"]:
+        _RESULT_CACHE = (os.getpid(), ResultCache(opts["result_cache"], opts["result_cache_mb"] * 1024 * 1024))
+    return _RESULT_CACHE[1]
+
+
+def _code_version() -> str:
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        # the whole core package (detectors reach features, indicators, mathutils, …)
+        # and this module, whose evaluate_signals / _regime_labels shape cached entries
+        _CODE_VERSION = code_fingerprint(sentinel.core, sys.modules[__name__])
+    return _CODE_VERSION
+
+
+def _cached(cache: ResultCache | None, key: str, fn, *args):
+    compute = partial(fn, *args)
+    return compute() if cache is None else cache.get_or_compute(key, compute)
+
+
+def _regime_labels(sym: str, ohlcv: list[list[float]]):
+    return regime_history(*stack_ohlcv({sym: ohlcv})).labels[0]
+
 
-    pb = PullbackConfig()
-    br = BreakoutRetestConfig()
+def evaluate_signals(sym: str, tf: str, signals: list[Signal], opts: dict) -> tuple[BacktestResult, BootstrapResult | None]:
+    if not signals:
+        return BacktestResult(sym, tf, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0), None
+    # For simulation we use entry closes list as "closes" series
+    r_outcomes = simulate_r_series([s.entry for s in signals], [s.stop for s in signals], [s.tp1 for s in signals])
+    boot = None
+    if opts["bootstrap"] > 0:
+        boot = bootstrap_outcomes(sym, tf, r_outcomes, opts["bootstrap"], opts["block_size"], seed=opts["seed"])
+    return summarize(sym, tf, r_outcomes), boot
 
-    for i in range(100, len(closes) - 1):
-        c_win = closes[: i + 1]
-        l_win = lows[: i + 1]
 
-        plan = detect_pullback_long(c_win, l_win, symbol, pb)
-        if plan is None:
-            plan = detect_breakout_retest_long(c_win, l_win, symbol, br)
+def backtest_pair(
+    ex,
+    sym: str,
+    tfs: list[str],
+    opts: dict,
+    allowed: set[int] | None,
+    since_ms: int | None,
+    until_ms: int,
+) -> PairOutcome:
+    """
+    Everything the backtest does for one symbol, across all timeframes.
+
+    With a result cache, signals, regime labels and per-series results are keyed by
+    a hash of the candles they came from plus every setting that shapes them, so a
+    rerun only recomputes the series whose data or parameters changed.
+    """
+    out = PairOutcome(sym)
+    cache = _result_cache(opts)
+    hits0, misses0 = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    for tf in tfs:
+        try:
+            if opts["archive_dir"]:
+                series = load_archive(opts["archive_dir"], ex.id, sym, tf, since_ms, until_ms, bars=opts["bars"])
+                if series is None:
+                    out.errors.append(f"{tf}: not in archive")
+                    continue
+                ohlcv = series.to_ohlcv()
+            elif since_ms is not None:
+                hcfg = HistoryConfig(timeframe=tf, workers=opts["history_workers"], cache_dir=opts["history_dir"] or None)
+                ohlcv = fetch_ohlcv_range(ex, sym, since_ms, until_ms, hcfg)
+            else:
+                ohlcv = fetch_ohlcv_safe(ex, sym, OHLCVConfig(timeframe=tf, limit=opts["bars"]))
+        except ExchangeError as e:
+            out.errors.append(f"{tf}: {e}")
+            continue
+        highs, lows, closes = split_ohlcv(ohlcv)
+        if not closes or len(closes) < 200:
+            continue
 
-        if plan is None:
+        if opts["walk_forward"]:
+            out.wf_series.append((sym, tf, closes, lows))
             continue
 
-        entries.append(c_win[-1])
-        stops.append(plan.stop)
-        tp1s.append(plan.tp1)
+        # part of signals_key: changing a setting recomputes signals, not everything else
+        pb, br = opts.get("pb") or PullbackConfig(), opts.get("br") or BreakoutRetestConfig()
+        data = content_key(_code_version(), highs, lows, closes)
+        signals_key = content_key("signals", data, pb, br)
+        signals = _cached(cache, signals_key, detect_signals, sym, closes, lows, pb, br)
+        if allowed is not None:
+            labels = _cached(cache, content_key("regimes", data), _regime_labels, sym, ohlcv)
+            signals = [s for s in signals if labels[s.index] in allowed]
+        if opts["portfolio"]:
+            out.streams.append((tf, symbol_stream(sym, ohlcv, signals)))  # candles stay in this process
 
-    return entries, stops, tp1s
+        # an unseeded bootstrap is meant to differ between runs: don't pin it
+        series_cache = cache if opts["bootstrap"] <= 0 or opts["seed"] is not None else None
+        series_key = content_key(
+            "series",
+            sym,
+            tf,
+            signals_key,
+            sorted(allowed) if allowed is not None else None,
+            opts["bootstrap"],
+            opts["block_size"],
+            opts["seed"],
+        )
+        result, boot = _cached(series_cache, series_key, evaluate_signals, sym, tf, signals, opts)
+        out.results.append(result)
+        if boot is not None:
+            out.boots.append(boot)
+    if cache is not None:
+        return replace(out, cache_hits=cache.hits - hits0, cache_misses=cache.misses - misses0)
+    return out
+
+
+_WORKER_EXCHANGE = None
+
+
+def create_pair_exchange(exchange_id: str, share: float):
+    """
+    Default per-worker exchange client: `share` of the exchange's request budget.
+    """
+    return create_exchange(ExchangeConfig(exchange_id=exchange_id, rate_limit=RateLimitConfig(share=share)))
+
+
+def _init_pair_worker(factory: Callable[[str, float], Any], exchange_id: str, share: float) -> None:
+    global _WORKER_EXCHANGE
+    _WORKER_EXCHANGE = factory(exchange_id, share)
+
+
+def _pair_task(task: tuple) -> PairOutcome:
+    return backtest_pair(_WORKER_EXCHANGE, *task)
+
+
+def _progress(done: int, total: int, o: PairOutcome) -> None:
+    parts = [f"{r.timeframe} n={r.trades} avg={r.avg_r:+.3f}R" for r in o.results]
+    summary = " | ".join(parts + [f"skipped {e}" for e in o.errors]) or "no data"
+    print(f"[{done}/{total}] {o.symbol}: {summary}", file=sys.stderr, flush=True)
+
+
+def run_pairs(
+    ex,
+    pairs: list[str],
+    tfs: list[str],
+    opts: dict,
+    allowed,
+    since_ms,
+    until_ms,
+    workers: int,
+    exchange_factory: Callable[[str, float], Any] = create_pair_exchange,
+    mp_context=None,
+) -> list[PairOutcome]:
+    """
+    Backtest every pair, sharded across `workers` processes (each with its own exchange
+    client and an equal share of the request budget). Progress streams to stderr as
+    pairs finish; outcomes come back in `pairs` order.
+
+    Workers build their client with `exchange_factory(ex.id, share)`, passed through
+    the pool initializer so it must be picklable; nothing relies on fork inheriting
+    module state, so any `mp_context` works.
+    """
+    tasks = [(sym, tfs, opts, allowed, since_ms, until_ms) for sym in pairs]
+    workers = min(workers, len(pairs))  # more processes than pairs would only idle
+    if workers <= 1:
+        return [backtest_pair(ex, *t) for t in tasks]
+
+    by_symbol: dict[str, PairOutcome] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_pair_worker,
+        initargs=(exchange_factory, ex.id, 1.0 / workers),
+    ) as pool:
+        futures = [pool.submit(_pair_task, t) for t in tasks]
+        for done, fut in enumerate(as_completed(futures), start=1):
+            o = fut.result()
+            by_symbol[o.symbol] = o
+            _progress(done, len(tasks), o)
+    return [by_symbol[sym] for sym in pairs]
 
 
 def format_text(results: list[BacktestResult]) -> str:
@@ -68,39 +381,162 @@ def format_text(results: list[BacktestResult]) -> str:
     return "\n".join(lines) + "\n"
 
 
-def main() -> int:
-    args = parse_args()
+def format_portfolio_text(tf: str, p: PortfolioResult) -> str:
+    win_rate = (p.wins / p.trades * 100) if p.trades else 0.0
+    lines = [
+        f"PORTFOLIO tf={tf}: {p.symbols} symbols | trades={p.trades} (timeouts {p.timeouts}) | win%={win_rate:.1f}",
+        f"  total={p.total_r:+.2f}R ({p.total_usdt:+.2f} USDT) | MDD={p.max_drawdown_r:.2f}R"
+        f" | max open={p.max_concurrent} | skipped by cap={p.skipped_by_cap}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def format_bootstrap_text(results: list[BootstrapResult]) -> str:
+    lines: list[str] = []
+    if not results:
+        return ""
+    b0 = results[0]
+    lines.append(f"BOOTSTRAP ({b0.samples} resamples, block={b0.block_size}, {b0.confidence*100:.0f}% CI)")
+    lines.append("-" * 90)
+    lines.append(
+        "SYMBOL".ljust(12) + "TF".ljust(6) + "EXP_LO".rjust(9) + "EXP_HI".rjust(9) + "P(E<0)".rjust(8)
+        + "MDD_P50".rjust(9) + "MDD_P95".rjust(9) + "STRK_P50".rjust(10) + "STRK_P95".rjust(10)
+    )
+    lines.append("-" * 90)
+    for b in results:
+        lines.append(
+            f"{b.symbol.ljust(12)}{b.timeframe.ljust(6)}{b.expectancy_lo:9.3f}{b.expectancy_hi:9.3f}{b.prob_negative_expectancy:8.2f}"
+            f"{b.max_drawdown_r['p50']:9.2f}{b.max_drawdown_r['p95']:9.2f}"
+            f"{b.longest_losing_streak['p50']:10.0f}{b.longest_losing_streak['p95']:10.0f}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def format_walk_forward_text(results: list[WalkForwardResult]) -> str:
+    lines: list[str] = []
+    lines.append("SENTINEL walk-forward (params fit on train, scored on the following test window)")
+    lines.append("-" * 90)
+    lines.append("SYMBOL".ljust(12) + "TF".ljust(6) + "FOLD".rjust(5) + "TRAIN_R".rjust(10) + "TEST_N".rjust(8) + "TEST_R".rjust(10) + "  PARAMS")
+    lines.append("-" * 90)
+    for wf in results:
+        for f in wf.folds:
+            params = " ".join(f"{k}={v}" for k, v in f.params.items())
+            lines.append(
+                f"{wf.symbol.ljust(12)}{wf.timeframe.ljust(6)}{f.fold.index:5d}{f.train.avg_r:10.3f}{f.test.trades:8d}{f.test.avg_r:10.3f}  {params}"
+            )
+    overall = BacktestStats()
+    for wf in results:
+        overall = overall.merge(wf.stats)
+
+    lines.append("")
+    lines.append("OUT-OF-SAMPLE AGGREGATE")
+    aggregates = [wf.aggregate for wf in results] + [overall.result("ALL", "*")]
+    lines.append(format_text(aggregates).split("\n", 1)[1].rstrip("\n"))
+    return "\n".join(lines) + "\n"
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.walk_forward:
+        # folds are scored on their own trade series; these would be silently ignored
+        ignored = (("--portfolio", args.portfolio), ("--bootstrap", args.bootstrap > 0), ("--regime-filter", args.regime_filter))
+        clash = [flag for flag, on in ignored if on]
+        if clash:
+            print(f"--walk-forward can't be combined with {', '.join(clash)}", file=sys.stderr)
+            return 2
+
+    allowed = None
+    if args.regime_filter:
+        try:
+            allowed = parse_regime_filter(args.regime_filter)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    cfg = load_config(args.config)
+    try:
+        pb, br = setup_configs(cfg, args.setup_params)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
     ex = create_exchange(ExchangeConfig(exchange_id=args.exchange))
 
-    pairs = [p.strip() for p in args.pairs.split(",") if p.strip()]
+    if args.universe:
+        try:
+            pairs = select_universe(ex, parse_universe(args.universe))
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    else:
+        pairs = [p.strip() for p in args.pairs.split(",") if p.strip()]
     tfs = [t.strip() for t in args.timeframes.split(",") if t.strip()]
 
-    results: list[BacktestResult] = []
+    since_ms = parse_date_ms(args.since) if args.since else None
+    until_ms = parse_date_ms(args.until) if args.until else int(time.time() * 1000)
 
-    for sym in pairs:
-        for tf in tfs:
-            ohlcv = fetch_ohlcv_safe(ex, sym, OHLCVConfig(timeframe=tf, limit=args.bars))
-            highs, lows, closes = split_ohlcv(ohlcv)
-            if not closes or len(closes) < 200:
-                continue
+    opts = {k: getattr(args, k) for k in _PAIR_OPTIONS} | {"pb": pb, "br": br}
+    workers = args.workers or os.cpu_count() or 1
+    outcomes = run_pairs(ex, pairs, tfs, opts, allowed, since_ms, until_ms, workers)
 
-            entries, stops, tp1s = _plans_to_series(sym, closes, lows)
-            if not entries:
-                results.append(BacktestResult(sym, tf, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0))
-                continue
+    results: list[BacktestResult] = [r for o in outcomes for r in o.results]
+    boots: list[BootstrapResult] = [b for o in outcomes for b in o.boots]
+    streams: dict[str, list[SymbolStream]] = {tf: [] for tf in tfs}
+    for o in outcomes:
+        for tf, stream in o.streams:
+            streams[tf].append(stream)
+    wf_series = [s for o in outcomes for s in o.wf_series]
+    skipped = [{"symbol": o.symbol, "reason": e} for o in outcomes for e in o.errors]
+    if args.result_cache:
+        hits, misses = sum(o.cache_hits for o in outcomes), sum(o.cache_misses for o in outcomes)
+        evicted = ResultCache(args.result_cache, args.result_cache_mb * 1024 * 1024).prune()
+        print(f"result cache: {hits} hits, {misses} misses, {evicted} evicted", file=sys.stderr)
+
+    if args.walk_forward:
+        wf_cfg = WalkForwardConfig(
+            train_bars=args.train_bars,
+            test_bars=args.test_bars,
+            step_bars=args.step_bars,
+            anchored=args.anchored,
+        )
+        grid = parse_grid(args.grid) if args.grid else None
+        wf = walk_forward(wf_series, wf_cfg, grid=grid, workers=args.workers)
+        if args.format == "json":
+            payload = {"exchange": ex.id, "pairs": pairs, "timeframes": tfs, "walk_forward": wf, "skipped": skipped}
+            if args.out:
+                write_json(args.out, payload)
+            else:
+                print(payload)
+        else:
+            text = format_walk_forward_text(wf)
+            if args.out:
+                write_text(args.out, text)
+            else:
+                print(text, end="")
+        return 0
 
-            # For simulation we use entry closes list as "closes" series
-            res = run_backtest(sym, tf, entries, stops, tp1s)
-            results.append(res)
+    portfolios: dict[str, PortfolioResult] = {}
+    if args.portfolio:
+        risk_cfg = RiskConfig(risk_usdt=cfg.risk_usdt, fee_buffer_pct=cfg.fee_buffer_pct)
+        pcfg = PortfolioConfig(max_open=args.max_open)
+        portfolios = {tf: run_portfolio(streams[tf], risk_cfg, pcfg) for tf in tfs}
 
     if args.format == "json":
-        payload = {"exchange": ex.id, "pairs": pairs, "timeframes": tfs, "results": results}
+        payload = {"exchange": ex.id, "pairs": pairs, "timeframes": tfs, "results": results, "skipped": skipped}
+        if args.portfolio:
+            payload["portfolio"] = portfolios
+        if args.bootstrap > 0:
+            payload["bootstrap"] = boots
         if args.out:
             write_json(args.out, payload)
         else:
             print(payload)
     else:
         text = format_text(results)
+        if boots:
+            text += "\n" + format_bootstrap_text(boots)
+        for tf, p in portfolios.items():
+            text += "\n" + format_portfolio_text(tf, p)
+        if skipped:
+            text += f"\nSKIPPED ({len(skipped)}):\n" + "".join(f"  {s['symbol']}: {s['reason']}\n" for s in skipped)
         if args.out:
             write_text(args.out, text)
         else:
@@ -109,5 +545,11 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    args = parse_args()
+    with profile_to(args.profile, "backtest"):
+        return run(args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from sentinel.core.history import timeframe_ms
+from sentinel.core.memo import candle_open_ms
+
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+
+def symbol_dir(root: str | Path, exchange_id: str, symbol: str) -> Path:
+    safe = symbol.replace("/", "_").replace(":", "_")
+    return Path(root) / exchange_id / safe
+
+
+def parse_kline_csv(text: str) -> np.ndarray:
+    """
+    Exchange bulk-data kline CSV (open_time, open, high, low, close, volume, ...)
+    → (N, 6) float64 array. A header row is skipped; microsecond open times
+    (newer Binance dumps) are converted to ms.
+    """
+    lines = text.lstrip().splitlines()
+    if lines and not lines[0][:1].isdigit():
+        lines = lines[1:]
+    if not lines:
+        return np.empty((0, 6))
+    arr = np.loadtxt(lines, delimiter=",", usecols=range(6), dtype=np.float64, ndmin=2)
+    us = arr[:, 0] >= 1e14
+    arr[us, 0] = np.floor(arr[us, 0] / 1000.0)
+    return arr
+
+
+def read_kline_file(path: str | Path) -> np.ndarray:
+    """
+    One .csv, or a .zip holding one or more .csv files.
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".zip":
+        return parse_kline_csv(path.read_text(encoding="utf-8"))
+    parts = []
+    with zipfile.ZipFile(path) as zf:
+        for name in zf.namelist():
+            if name.lower().endswith(".csv"):
+                with zf.open(name) as f:
+                    parts.append(parse_kline_csv(io.TextIOWrapper(f, encoding="utf-8").read()))
+    return np.concatenate(parts) if parts else np.empty((0, 6))
+
+
+def _save_column(path: Path, values: np.ndarray) -> None:
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, values)
+    os.replace(tmp, path)
+
+
+def import_klines(root: str | Path, exchange_id: str, symbol: str, timeframe: str, files: list[str | Path]) -> int:
+    """
+    Merge kline dumps into the columnar store (one .npy per column, sorted by ts,
+    de-duplicated; on overlap later files win over earlier ones and over stored rows). Returns the stored candle count.
+    """
+    # lowest precedence first: the stored rows, then each file in the order given
+    parts = [read_kline_file(f) for f in files]
+    d = symbol_dir(root, exchange_id, symbol) / timeframe
+    if (d / "ts.npy").exists():
+        old = ArchiveSeries.load(d)
+        parts.insert(0, np.column_stack([old.ts, old.open, old.high, old.low, old.close, old.volume]))
+    rows = np.concatenate(parts)[::-1] if parts else np.empty((0, 6))
+
+    ts = rows[:, 0].astype(np.int64)
+    _u, first = np.unique(ts, return_index=True)  # sorted; first in reversed order = last imported
+    rows = rows[first]
+
+    d.mkdir(parents=True, exist_ok=True)
+    _save_column(d / "ts.npy", rows[:, 0].astype(np.int64))
+    for i, name in enumerate(COLUMNS[1:], start=1):
+        _save_column(d / f"{name}.npy", np.ascontiguousarray(rows[:, i]))
+    meta = {"symbol": symbol, "timeframe": timeframe, "candles": int(len(rows))}
+    (d / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return len(rows)
+
+
+@dataclass(frozen=True, eq=False)
+class ArchiveSeries:
+    """
+    Read-only OHLCV columns. Opened from disk they are memory-mapped, and
+    `window` slices stay views, so nothing is copied until rows are materialized.
+    """
+
+    timeframe: str
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def load(cls, directory: str | Path) -> ArchiveSeries:
+        d = Path(directory)
+        cols = [np.load(d / f"{name}.npy", mmap_mode="r") for name in COLUMNS]
+        return cls(d.name, *cols)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def window(self, since_ms: int | None = None, until_ms: int | None = None) -> ArchiveSeries:
+        lo = 0 if since_ms is None else int(np.searchsorted(self.ts, since_ms, side="left"))
+        hi = len(self.ts) if until_ms is None else int(np.searchsorted(self.ts, until_ms, side="left"))
+        return ArchiveSeries(self.timeframe, *(getattr(self, c)[lo:hi] for c in COLUMNS))
+
+    def tail(self, bars: int) -> ArchiveSeries:
+        n = len(self.ts)
+        return ArchiveSeries(self.timeframe, *(getattr(self, c)[max(n - bars, 0) :] for c in COLUMNS))
+
+    def resample(self, timeframe: str) -> ArchiveSeries:
+        """
+        Aggregate into `timeframe` candles with `reduceat`, bucketed like the exchange
+        opens them (`candle_open_ms`: Monday weeks, calendar months).
+        A trailing bucket that hasn't seen its last base candle is dropped.
+        """
+        if timeframe == self.timeframe or len(self.ts) == 0:
+            return self
+        base, tf = timeframe_ms(self.timeframe), timeframe_ms(timeframe)
+        if tf < base or tf % base or (timeframe.endswith("M") and _DAY_MS % base):
+            raise ValueError(f"cannot resample {self.timeframe} into {timeframe}")
+
+        bucket, next_open = _bucket_opens(timeframe, self.ts)
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(bucket)) + 1])
+        ends = np.append(starts[1:], len(self.ts))
+        if self.ts[-1] + base < next_open:
+            starts, ends = starts[:-1], ends[:-1]
+        if len(starts) == 0:
+            return ArchiveSeries(timeframe, *(np.empty(0, dtype=getattr(self, c).dtype) for c in COLUMNS))
+
+        cut = ends[-1]  # reduceat runs to the end of the array; trim the partial bucket first
+        return ArchiveSeries(
+            timeframe,
+            bucket[starts],
+            self.open[starts],
+            np.maximum.reduceat(self.high[:cut], starts),
+            np.minimum.reduceat(self.low[:cut], starts),
+            self.close[ends - 1],
+            np.add.reduceat(self.volume[:cut], starts),
+        )
+
+    def to_ohlcv(self) -> list[list[float]]:
+        """
+        Rows in `fetch_ohlcv` layout: [ts, o, h, l, c, v].
+        """
+        return np.column_stack([getattr(self, c) for c in COLUMNS]).astype(np.float64).tolist()
+
+
+_DAY_MS = 86_400_000
+
+
+def _bucket_opens(timeframe: str, ts: np.ndarray) -> tuple[np.ndarray, int]:
+    """
+    Open time of the `timeframe` candle holding each of `ts`, plus the open of the
+    candle after the last one.
+    """
+    if not timeframe.endswith("M"):
+        tf, offset = timeframe_ms(timeframe), candle_open_ms(timeframe, 0)
+        opens = (ts.astype(np.int64) - offset) // tf * tf + offset
+        return opens, int(opens[-1]) + tf
+    # months differ in length: step through the calendar boundaries instead
+    span = int(timeframe[:-1] or 1) * 32 * _DAY_MS
+    bounds = [candle_open_ms(timeframe, int(ts[0]))]
+    while bounds[-1] <= ts[-1]:
+        bounds.append(candle_open_ms(timeframe, bounds[-1] + span))
+    edges = np.array(bounds, dtype=np.int64)
+    idx = np.searchsorted(edges, ts, side="right") - 1
+    return edges[idx], bounds[int(idx[-1]) + 1]
+
+
+def stored_timeframes(root: str | Path, exchange_id: str, symbol: str) -> list[str]:
+    d = symbol_dir(root, exchange_id, symbol)
+    if not d.is_dir():
+        return []
+    found = [p.name for p in d.iterdir() if (p / "ts.npy").exists()]
+    return sorted(found, key=timeframe_ms)
+
+
+def load_archive(
+    root: str | Path,
+    exchange_id: str,
+    symbol: str,
+    timeframe: str,
+    since_ms: int | None = None,
+    until_ms: int | None = None,
+    bars: int | None = None,
+) -> ArchiveSeries | None:
+    """
+    `timeframe` candles for [since, until) from the coarsest stored timeframe that
+    divides it (resampled on the fly). Without `since`, `bars` keeps only the most
+    recent candles, and only their base rows get aggregated.
+    None if nothing usable is archived.
+    """
+    target = timeframe_ms(timeframe)
+    monthly = timeframe.endswith("M")
+    usable = [
+        t
+        for t in stored_timeframes(root, exchange_id, symbol)
+        if target % timeframe_ms(t) == 0 and not (monthly and _DAY_MS % timeframe_ms(t))
+    ]
+    if not usable:
+        return None
+    base = ArchiveSeries.load(symbol_dir(root, exchange_id, symbol) / usable[-1])
+    if since_ms is None and bars is not None:
+        # calendar months run up to 31 days against ccxt's 30
+        span = target * 31 // 30 if monthly else target
+        ratio = -(-span // timeframe_ms(usable[-1]))
+        # one spare bucket covers a partial first one and a dropped partial last one
+        return base.window(None, until_ms).tail((bars + 2) * ratio).resample(timeframe).tail(bars)
+    # widen the window to whole target buckets so the first one isn't cut short
+    lo = None if since_ms is None else candle_open_ms(timeframe, since_ms)
+    return base.window(lo, until_ms).resample(timeframe).window(since_ms, until_ms)
@@ -2,6 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from sentinel.core.setups import (
+    BreakoutRetestConfig,
+    PullbackConfig,
+    detect_breakout_retest_long,
+    detect_pullback_long,
+)
+
 
 @dataclass(frozen=True)
 class BacktestResult:
@@ -17,7 +24,50 @@ class BacktestResult:
     max_drawdown_r: float
 
 
-def _simulate_r_series(closes: list[float], stops: list[float], tp1s: list[float]) -> list[float]:
+@dataclass(frozen=True)
+class Signal:
+    index: int  # bar index the setup was detected on (entry at that close)
+    entry: float
+    stop: float
+    tp1: float
+
+
+def detect_signals(
+    symbol: str,
+    closes: list[float],
+    lows: list[float],
+    pb: PullbackConfig | None = None,
+    br: BreakoutRetestConfig | None = None,
+    start: int = 100,
+    end: int | None = None,
+    setups: tuple[str, ...] = ("pullback", "breakout_retest"),
+) -> list[Signal]:
+    """
+    Detect setups bar by bar, using only the window up to each bar.
+    `setups` picks the detectors to run; pullback is checked first.
+    """
+    pb = pb or PullbackConfig()
+    br = br or BreakoutRetestConfig()
+    stop_at = len(closes) - 1 if end is None else min(end, len(closes) - 1)
+
+    out: list[Signal] = []
+    for i in range(start, stop_at):
+        c_win = closes[: i + 1]
+        l_win = lows[: i + 1]
+
+        plan = None
+        if "pullback" in setups:
+            plan = detect_pullback_long(c_win, l_win, symbol, pb)
+        if plan is None and "breakout_retest" in setups:
+            plan = detect_breakout_retest_long(c_win, l_win, symbol, br)
+        if plan is None:
+            continue
+
+        out.append(Signal(index=i, entry=c_win[-1], stop=plan.stop, tp1=plan.tp1))
+    return out
+
+
+def simulate_r_series(closes: list[float], stops: list[float], tp1s: list[float]) -> list[float]:
     """
     Very simple:
       - Entry at close[i]
@@ -55,48 +105,103 @@ def _simulate_r_series(closes: list[float], stops: list[float], tp1s: list[float
     return out
 
 
+@dataclass
+class BacktestStats:
+    """
+    Streaming summary of an R-outcome sequence: O(1) per trade, no trade list kept.
+    `a.merge(b)` is the stats of a's trades followed by b's, and is associative, so
+    shards computed in separate workers reduce in any grouping (order still matters
+    for drawdown, as it does for the underlying sequence).
+    """
+
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    total_r: float = 0.0
+    mean_r: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean (Welford)
+    gross_win: float = 0.0
+    gross_loss: float = 0.0
+    # cumulative-R path, starting at 0: highest point, lowest point, worst peak-to-trough
+    peak: float = 0.0
+    trough: float = 0.0
+    max_drawdown_r: float = 0.0
+
+    @classmethod
+    def from_outcomes(cls, r_outcomes: list[float]) -> BacktestStats:
+        st = cls()
+        for r in r_outcomes:
+            st.update(r)
+        return st
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.trades - 1) if self.trades > 1 else 0.0
+
+    def update(self, r: float) -> None:
+        self.trades += 1
+        if r > 0:
+            self.wins += 1
+            self.gross_win += r
+        elif r < 0:
+            self.losses += 1
+            self.gross_loss -= r
+
+        delta = r - self.mean_r
+        self.mean_r += delta / self.trades
+        self.m2 += delta * (r - self.mean_r)
+
+        self.total_r += r
+        if self.total_r > self.peak:
+            self.peak = self.total_r
+        if self.total_r < self.trough:
+            self.trough = self.total_r
+        dd = self.peak - self.total_r
+        if dd > self.max_drawdown_r:
+            self.max_drawdown_r = dd
+
+    def merge(self, other: BacktestStats) -> BacktestStats:
+        n = self.trades + other.trades
+        if n == 0:
+            return BacktestStats()
+        delta = other.mean_r - self.mean_r
+        return BacktestStats(
+            trades=n,
+            wins=self.wins + other.wins,
+            losses=self.losses + other.losses,
+            total_r=self.total_r + other.total_r,
+            mean_r=self.mean_r + delta * other.trades / n,
+            m2=self.m2 + other.m2 + delta * delta * self.trades * other.trades / n,
+            gross_win=self.gross_win + other.gross_win,
+            gross_loss=self.gross_loss + other.gross_loss,
+            peak=max(self.peak, self.total_r + other.peak),
+            trough=min(self.trough, self.total_r + other.trough),
+            # other's path is shifted by our final equity; its lowest point may sit under our peak
+            max_drawdown_r=max(self.max_drawdown_r, other.max_drawdown_r, self.peak - (self.total_r + other.trough)),
+        )
+
+    def result(self, symbol: str, timeframe: str) -> BacktestResult:
+        if self.trades == 0:
+            return BacktestResult(symbol, timeframe, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        avg_r = self.total_r / self.trades
+        return BacktestResult(
+            symbol=symbol,
+            timeframe=timeframe,
+            trades=self.trades,
+            wins=self.wins,
+            losses=self.losses,
+            win_rate=self.wins / self.trades,
+            avg_r=avg_r,
+            expectancy=avg_r,
+            profit_factor=(self.gross_win / self.gross_loss) if self.gross_loss > 0 else float("inf"),
+            max_drawdown_r=self.max_drawdown_r,
+        )
+
+
 def summarize(symbol: str, timeframe: str, r_outcomes: list[float]) -> BacktestResult:
-    trades = len(r_outcomes)
-    if trades == 0:
-        return BacktestResult(symbol, timeframe, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
-
-    wins = sum(1 for r in r_outcomes if r > 0)
-    losses = sum(1 for r in r_outcomes if r < 0)
-    win_rate = wins / trades
-
-    avg_r = sum(r_outcomes) / trades
-    expectancy = avg_r
-
-    gross_win = sum(r for r in r_outcomes if r > 0)
-    gross_loss = -sum(r for r in r_outcomes if r < 0)
-    profit_factor = (gross_win / gross_loss) if gross_loss > 0 else float("inf")
-
-    # max drawdown in R
-    equity = 0.0
-    peak = 0.0
-    mdd = 0.0
-    for r in r_outcomes:
-        equity += r
-        if equity > peak:
-            peak = equity
-        dd = peak - equity
-        if dd > mdd:
-            mdd = dd
-
-    return BacktestResult(
-        symbol=symbol,
-        timeframe=timeframe,
-        trades=trades,
-        wins=wins,
-        losses=losses,
-        win_rate=win_rate,
-        avg_r=avg_r,
-        expectancy=expectancy,
-        profit_factor=profit_factor,
-        max_drawdown_r=mdd,
-    )
+    return BacktestStats.from_outcomes(r_outcomes).result(symbol, timeframe)
 
 
 def run_backtest(symbol: str, timeframe: str, closes: list[float], stops: list[float], tp1s: list[float]) -> BacktestResult:
-    r_outcomes = _simulate_r_series(closes, stops, tp1s)
+    r_outcomes = simulate_r_series(closes, stops, tp1s)
     return summarize(symbol, timeframe, r_outcomes)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+_PCTS = (5, 50, 95, 99)
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    symbol: str
+    timeframe: str
+    trades: int
+    samples: int
+    block_size: int
+    confidence: float
+    expectancy_mean: float
+    expectancy_lo: float
+    expectancy_hi: float
+    prob_negative_expectancy: float
+    max_drawdown_r: dict[str, float]  # percentiles: "p5", "p50", "p95", "p99"
+    longest_losing_streak: dict[str, float]
+
+
+def resample_indices(rng: np.random.Generator, n_trades: int, samples: int, block_size: int = 1) -> np.ndarray:
+    """
+    (samples, n_trades) index matrix.
+    block_size > 1 draws circular blocks of consecutive trades, so win/loss streaks
+    survive the resampling.
+    """
+    if block_size <= 1:
+        return rng.integers(0, n_trades, size=(samples, n_trades))
+    n_blocks = -(-n_trades // block_size)
+    starts = rng.integers(0, n_trades, size=(samples, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n_trades
+    return idx.reshape(samples, n_blocks * block_size)[:, :n_trades]
+
+
+def max_drawdowns(paths: np.ndarray) -> np.ndarray:
+    """
+    Max peak-to-trough drop of each row's cumulative R (equity starts at 0).
+    """
+    equity = np.cumsum(paths, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+    return (peak - equity).max(axis=1)
+
+
+def longest_losing_streaks(paths: np.ndarray) -> np.ndarray:
+    """
+    Longest run of consecutive losing trades in each row.
+    """
+    loss = paths < 0
+    count = np.cumsum(loss, axis=1)
+    # losses counted so far at the last non-loss, carried forward
+    reset = np.maximum.accumulate(np.where(loss, 0, count), axis=1)
+    return (count - reset).max(axis=1)
+
+
+def bootstrap_outcomes(
+    symbol: str,
+    timeframe: str,
+    r_outcomes: list[float],
+    samples: int = 10_000,
+    block_size: int = 1,
+    confidence: float = 0.95,
+    seed: int | None = None,
+    chunk: int = 2048,
+) -> BootstrapResult | None:
+    """
+    Resample the R-outcome sequence `samples` times and report the spread of
+    expectancy, max drawdown and longest losing streak.
+    Works in row chunks so memory stays at chunk × trades regardless of `samples`.
+    """
+    r = np.asarray(r_outcomes, dtype=np.float64)
+    n = r.size
+    if n == 0 or samples <= 0:
+        return None
+
+    rng = np.random.default_rng(seed)
+    exp = np.empty(samples)
+    mdd = np.empty(samples)
+    streak = np.empty(samples)
+    for lo in range(0, samples, chunk):
+        hi = min(lo + chunk, samples)
+        paths = r[resample_indices(rng, n, hi - lo, block_size)]
+        exp[lo:hi] = paths.mean(axis=1)
+        mdd[lo:hi] = max_drawdowns(paths)
+        streak[lo:hi] = longest_losing_streaks(paths)
+
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    e_lo, e_hi = np.percentile(exp, [tail, 100.0 - tail])
+
+    def pcts(a: np.ndarray) -> dict[str, float]:
+        return {f"p{p}": float(v) for p, v in zip(_PCTS, np.percentile(a, _PCTS), strict=True)}
+
+    return BootstrapResult(
+        symbol=symbol,
+        timeframe=timeframe,
+        trades=n,
+        samples=samples,
+        block_size=max(block_size, 1),
+        confidence=confidence,
+        expectancy_mean=float(exp.mean()),
+        expectancy_lo=float(e_lo),
+        expectancy_hi=float(e_hi),
+        prob_negative_expectancy=float((exp < 0).mean()),
+        max_drawdown_r=pcts(mdd),
+        longest_losing_streak=pcts(streak),
+    )
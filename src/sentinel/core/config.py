@@ -10,6 +10,9 @@ class SentinelConfig:
     fee_buffer_pct: float = 0.10
 
     min_quote_volume_usdt: float = 5_000_000.0
+    # liquidity stage; 0 = off
+    max_spread_pct: float = 0.0
+    min_top_depth_usdt: float = 0.0
 
     # setups
     pullback_lookback: int = 14
@@ -42,6 +45,8 @@ def load_config(path: str = "sentinel.toml") -> SentinelConfig:
         risk_usdt=float(get("risk", "risk_usdt", 1.0)),
         fee_buffer_pct=float(get("risk", "fee_buffer_pct", 0.10)),
         min_quote_volume_usdt=float(get("quality", "min_quote_volume_usdt", 5_000_000.0)),
+        max_spread_pct=float(get("quality", "max_spread_pct", 0.0)),
+        min_top_depth_usdt=float(get("quality", "min_top_depth_usdt", 0.0)),
         pullback_lookback=int(get("setups", "pullback_lookback", 14)),
         pullback_tolerance_pct=float(get("setups", "pullback_tolerance_pct", 2.2)),
         breakout_lookback=int(get("setups", "breakout_lookback", 40)),
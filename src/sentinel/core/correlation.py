@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def aligned_log_returns(series: dict[str, tuple[list[int], list[float]]], bars: int) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """
+    Per-symbol (open times, closes) → (symbols, ts axis, (S, T-1) log returns) on a
+    shared timestamp axis covering the last `bars` candles. A return is NaN where
+    either of its two candles is missing for that symbol.
+    """
+    symbols = list(series)
+    all_ts = np.unique(np.concatenate([np.asarray(ts[-bars:], dtype=np.int64) for ts, _c in series.values()] or [np.empty(0, np.int64)]))
+    axis = all_ts[-bars:]
+    closes = np.full((len(symbols), len(axis)), np.nan)
+    for i, sym in enumerate(symbols):
+        ts, c = series[sym]
+        ts_arr = np.asarray(ts, dtype=np.int64)
+        c_arr = np.asarray(c, dtype=np.float64)
+        keep = ts_arr >= (axis[0] if len(axis) else 0)
+        pos = np.searchsorted(axis, ts_arr[keep])
+        closes[i, pos] = c_arr[keep]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rets = np.diff(np.log(closes), axis=1)
+    return symbols, axis, rets
+
+
+def correlation_matrix(returns: np.ndarray, min_obs: int = 20) -> np.ndarray:
+    """
+    Pearson correlation of every symbol pair in one matrix product. Missing returns
+    count as flat (0); symbols with fewer than `min_obs` real returns get NaN rows.
+    """
+    valid = ~np.isnan(returns)
+    x = np.where(valid, returns, 0.0)
+    n = x.shape[1]
+    if n == 0:
+        return np.full((x.shape[0], x.shape[0]), np.nan)
+    x = x - x.mean(axis=1, keepdims=True)
+    norm = np.sqrt((x * x).sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = x / norm[:, None]
+    corr = z @ z.T
+    bad = (valid.sum(axis=1) < min_obs) | (norm == 0)
+    corr[bad, :] = np.nan
+    corr[:, bad] = np.nan
+    return corr
+
+
+class RollingCorrelation:
+    """
+    Correlation over the last `window` return vectors, kept as running sums
+    (Σx and Σxxᵀ). Each new candle is one O(S²) rank-1 update instead of a full
+    O(S²·window) recompute; the sums are rebuilt from the buffer every `window`
+    pushes to stop float drift. Missing returns count as flat, and symbols with
+    fewer than `min_obs` real ones get NaN, as in `correlation_matrix`.
+    """
+
+    def __init__(self, symbols: list[str], window: int, min_obs: int = 20) -> None:
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_obs = min_obs
+        self.last_ts: int | None = None
+        s = len(self.symbols)
+        self._buf: deque[np.ndarray] = deque()  # raw returns, NaN where missing
+        self._sum = np.zeros(s)
+        self._cross = np.zeros((s, s))
+        self._obs = np.zeros(s, dtype=np.int64)
+        self._pushes = 0
+
+    def _rebuild(self) -> None:
+        raw = np.asarray(self._buf).T if self._buf else np.zeros((len(self.symbols), 0))
+        x = np.where(np.isnan(raw), 0.0, raw)
+        self._sum = x.sum(axis=1)
+        self._cross = x @ x.T
+        self._obs = (~np.isnan(raw)).sum(axis=1)
+
+    @classmethod
+    def from_returns(
+        cls, symbols: list[str], returns: np.ndarray, window: int, last_ts: int | None = None, min_obs: int = 20
+    ) -> RollingCorrelation:
+        rc = cls(symbols, window, min_obs)
+        rc._buf.extend(returns[:, -window:].T.copy())
+        rc._rebuild()
+        rc.last_ts = last_ts
+        return rc
+
+    def push(self, returns: np.ndarray, ts: int | None = None) -> None:
+        valid = ~np.isnan(returns)
+        r = np.where(valid, returns, 0.0)
+        self._buf.append(returns.copy())
+        self._sum += r
+        self._cross += np.outer(r, r)
+        self._obs += valid
+        if len(self._buf) > self.window:
+            old = self._buf.popleft()
+            old_valid = ~np.isnan(old)
+            old = np.where(old_valid, old, 0.0)
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+            self._obs -= old_valid
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            self._rebuild()
+        if ts is not None:
+            self.last_ts = ts
+
+    def matrix(self) -> np.ndarray:
+        n = len(self._buf)
+        if n < 2:
+            return np.full(self._cross.shape, np.nan)
+        cov = n * self._cross - np.outer(self._sum, self._sum)
+        var = np.diag(cov).copy()
+        var[(var <= 1e-18) | (self._obs < self.min_obs)] = np.nan
+        sd = np.sqrt(var)
+        return cov / np.outer(sd, sd)
+
+
+def update_rolling(
+    state: RollingCorrelation | None,
+    symbols: list[str],
+    axis: np.ndarray,
+    returns: np.ndarray,
+    window: int,
+    closed_ts: int | None = None,
+) -> RollingCorrelation:
+    """
+    Advance `state` by the candles on `axis` it hasn't seen. Rebuilds from scratch
+    when the symbol set or window changed, or the gap is too large to bridge.
+    Returns ending on a candle opened after `closed_ts` (the forming one) are left
+    out: a pushed return is never revised, so it must be final.
+    """
+    if closed_ts is not None:
+        keep = int(np.searchsorted(axis, closed_ts, side="right"))
+        axis, returns = axis[:keep], returns[:, : max(keep - 1, 0)]
+    ret_ts = axis[1:]  # a return is stamped with the candle it ends on
+    if state is not None and state.symbols == symbols and state.window == window and state.last_ts is not None:
+        new = np.flatnonzero(ret_ts > state.last_ts)
+        seen = np.flatnonzero(ret_ts == state.last_ts)
+        if len(seen) and len(new) <= window:
+            for j in new:
+                state.push(returns[:, j], int(ret_ts[j]))
+            return state
+    last = int(ret_ts[-1]) if len(ret_ts) else None
+    return RollingCorrelation.from_returns(symbols, returns, window, last)
+
+
+@dataclass(frozen=True)
+class ClusterMark:
+    symbol: str
+    cluster: int
+    leader: str  # first candidate of the cluster, in the order given
+    rank: int  # 0 for the leader
+    rho: float  # correlation with the leader
+
+
+def mark_correlated(symbols: list[str], corr: np.ndarray, candidates: list[str], threshold: float = 0.85) -> dict[str, ClusterMark]:
+    """
+    Group `candidates` (e.g. symbols with an A+ setup, best first) around leaders:
+    each joins the best-ranked leader it correlates with at ρ ≥ `threshold`, or leads
+    a new cluster. Membership is judged against the leader itself, never through a
+    chain of other symbols, so every rank > 0 really is the same bet as its leader.
+    Cluster id = the leader's index in `symbols`.
+    """
+    pos = {s: i for i, s in enumerate(symbols)}
+    leaders: list[int] = []
+    counts: dict[int, int] = {}
+    out: dict[str, ClusterMark] = {}
+    for sym in candidates:
+        i = pos.get(sym)
+        if i is None:
+            continue
+        lead = next((j for j in leaders if corr[i, j] >= threshold), None)  # NaN never passes
+        if lead is None:
+            leaders.append(i)
+            counts[i] = 1
+            out[sym] = ClusterMark(sym, i, sym, 0, 1.0)
+            continue
+        out[sym] = ClusterMark(sym, lead, symbols[lead], counts[lead], float(corr[i, lead]))
+        counts[lead] += 1
+    return out
+
+
+def cluster_note(mark: ClusterMark, limited: bool) -> str:
+    if limited:
+        return f"skipped: same bet as {mark.leader} (ρ={mark.rho:.2f})"
+    return f"≈ {mark.leader} (ρ={mark.rho:.2f})"
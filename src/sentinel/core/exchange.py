@@ -1,27 +1,289 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
 
 import ccxt
 
+# Lower value = served first. Interactive scans (a user clicked "Run") go ahead of
+# background auto-refreshes that share the same exchange budget.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    # Sustained budget in request-weight units per second (0 = derive from ccxt's `rateLimit`)
+    weight_per_sec: float = 0.0
+    # Bucket size: how much weight may be spent in a burst
+    burst: float = 20.0
+
+    # Adaptive backoff on 429/418: pause, then shrink the refill rate
+    penalty_s: float = 5.0  # used when the exchange sends no Retry-After
+    backoff_factor: float = 0.5
+    min_rate_fraction: float = 0.05
+    # Fraction of the base rate regained per successful request
+    recovery_step: float = 0.05
+    # Part of the exchange budget this process may use; worker processes split it
+    share: float = 1.0
+
 
 @dataclass(frozen=True)
 class ExchangeConfig:
     exchange_id: str = "binance"
-    timeout_ms: int = 20000
+    # per-request cap; retries/hedging in `FetchPolicy` bound the tail, not this
+    timeout_ms: int = 10000
     enable_rate_limit: bool = True
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
 
 
 class ExchangeError(RuntimeError):
     pass
 
 
+class CircuitOpenError(ExchangeError):
+    pass
+
+
+class RequestScheduler:
+    """
+    Token bucket shared by every client of one exchange.
+    Waiters are served in (priority, rank, arrival) order, so an interactive scan
+    jumps ahead of background refreshes and high-volume pairs go before the tail.
+    """
+
+    def __init__(self, rate: float, cfg: RateLimitConfig, clock: Callable[[], float] = time.monotonic) -> None:
+        self.cfg = cfg
+        self.base_rate = rate
+        self.rate = rate
+        self._clock = clock
+        self._tokens = cfg.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._waiting: list[tuple[int, int, int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self.cfg.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self, weight: float = 1.0, priority: int = PRIORITY_INTERACTIVE, rank: int = 0) -> float:
+        """
+        Block until `weight` units are available and no better-placed waiter is queued.
+        Returns the time spent waiting (seconds).
+        """
+        t0 = self._clock()
+        ticket = (priority, rank, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    # a request heavier than the bucket runs once the bucket is full and goes into debt
+                    need = min(weight, self.cfg.burst)
+                    if self._waiting[0] == ticket and now >= self._paused_until and self._tokens >= need:
+                        self._tokens -= weight
+                        return self._clock() - t0
+
+                    if now < self._paused_until:
+                        timeout = self._paused_until - now
+                    elif self._waiting[0] == ticket:
+                        timeout = (need - self._tokens) / self.rate
+                    else:
+                        timeout = None  # woken when the head of the queue is served
+                    self._cond.wait(timeout)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def penalize(self, retry_after_s: float | None = None) -> None:
+        """
+        The exchange pushed back (HTTP 429/418): pause the bucket and halve the rate.
+        """
+        with self._cond:
+            pause = retry_after_s if retry_after_s and retry_after_s > 0 else self.cfg.penalty_s
+            self._paused_until = max(self._paused_until, self._clock() + pause)
+            floor = self.base_rate * self.cfg.min_rate_fraction
+            self.rate = max(floor, self.rate * self.cfg.backoff_factor)
+            self._tokens = min(self._tokens, 0.0)
+            self._cond.notify_all()
+
+    def record_success(self) -> None:
+        with self._cond:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * self.cfg.recovery_step)
+
+
+_SCHEDULERS: dict[str, RequestScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(ex: ccxt.Exchange) -> RequestScheduler | None:
+    return _SCHEDULERS.get(getattr(ex, "id", ""))
+
+
+def _register_scheduler(ex: ccxt.Exchange, cfg: RateLimitConfig) -> RequestScheduler:
+    """
+    One scheduler per exchange id, reused by every instance created in this process,
+    so concurrent scans draw from a single budget.
+    """
+    with _SCHEDULERS_LOCK:
+        sched = _SCHEDULERS.get(ex.id)
+        if sched is None:
+            rate = cfg.weight_per_sec
+            if rate <= 0:
+                ms_per_unit = float(getattr(ex, "rateLimit", 0) or 0)
+                rate = 1000.0 / ms_per_unit if ms_per_unit > 0 else 10.0
+            sched = RequestScheduler(rate * min(max(cfg.share, 0.01), 1.0), cfg)
+            _SCHEDULERS[ex.id] = sched
+        return sched
+
+
+class CircuitBreaker:
+    """
+    Fails fast for an exchange that keeps erroring.
+    closed → (N consecutive failures) → open → (cooldown) → half-open: one trial request
+    decides between closed and open again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_s: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at >= self.cooldown_s:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            st = self._state(time.monotonic())
+            if st == "closed":
+                return True
+            if st == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def record_throttled(self) -> None:
+        """
+        The exchange answered 429/418: it's up, we're just too fast. Neither a failure
+        nor a success; a half-open trial slot is handed back for the next request.
+        """
+        with self._lock:
+            self._trial_running = False
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(ex: ccxt.Exchange, failure_threshold: int = 5, cooldown_s: float = 30.0) -> CircuitBreaker:
+    """
+    One breaker per exchange id, shared by every scan in this process.
+    """
+    key = getattr(ex, "id", "")
+    with _SCHEDULERS_LOCK:
+        br = _BREAKERS.get(key)
+        if br is None:
+            br = CircuitBreaker(failure_threshold, cooldown_s)
+            _BREAKERS[key] = br
+        return br
+
+
+def retry_after_s(ex: ccxt.Exchange) -> float | None:
+    headers = getattr(ex, "last_response_headers", None) or {}
+    for k, v in headers.items():
+        if str(k).lower() == "retry-after":
+            try:
+                return float(v)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def call_with_budget(
+    ex: ccxt.Exchange,
+    method: str,
+    *args,
+    weight: float = 1.0,
+    priority: int = PRIORITY_INTERACTIVE,
+    rank: int = 0,
+    on_sent: Callable[[], None] | None = None,
+    **kwargs,
+):
+    """
+    Call `ex.<method>(*args, **kwargs)` through the exchange's request scheduler.
+    Falls through to a plain call when no scheduler is registered. `on_sent` runs
+    once the request leaves our queue, so callers can time the exchange alone.
+    """
+    fn = getattr(ex, method)
+    sched = get_scheduler(ex)
+    if sched is None:
+        if on_sent is not None:
+            on_sent()
+        return fn(*args, **kwargs)
+
+    sched.acquire(weight=weight, priority=priority, rank=rank)
+    if on_sent is not None:
+        on_sent()
+    try:
+        out = fn(*args, **kwargs)
+    except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+        # ccxt maps 429 to RateLimitExceeded and 418 (IP ban) to DDoSProtection
+        sched.penalize(retry_after_s(ex))
+        raise
+    sched.record_success()
+    return out
+
+
 def create_exchange(cfg: ExchangeConfig) -> ccxt.Exchange:
     """
     Create a CCXT exchange instance configured for safe, public-data usage.
-    No API keys required.
+    No API keys required. `exchange_id="stub"` gives the offline stub (see `core.stub`).
     """
+    if cfg.exchange_id == "stub":
+        from sentinel.core.stub import (
+            StubExchange,  # the stub uses history, which imports this module
+        )
+
+        ex = StubExchange()
+        if cfg.enable_rate_limit:
+            _register_scheduler(ex, cfg.rate_limit)
+        return ex
+
     try:
         klass = getattr(ccxt, cfg.exchange_id)
     except AttributeError as e:
@@ -29,10 +291,13 @@ def create_exchange(cfg: ExchangeConfig) -> ccxt.Exchange:
 
     ex = klass(
         {
-            "enableRateLimit": cfg.enable_rate_limit,
+            # our scheduler replaces ccxt's evenly-spaced throttle
+            "enableRateLimit": False,
             "timeout": cfg.timeout_ms,
         }
     )
+    if cfg.enable_rate_limit:
+        _register_scheduler(ex, cfg.rate_limit)
 
     # Optional: some exchanges require explicit options setup
     # Keep conservative defaults; public endpoints only.
@@ -44,11 +309,21 @@ def load_markets_safe(ex: ccxt.Exchange) -> dict:
     Load markets with clear error wrapping.
     """
     try:
-        return ex.load_markets()
+        return call_with_budget(ex, "load_markets", weight=10.0)
     except Exception as e:
         raise ExchangeError(f"Failed to load markets from {ex.id}: {e}") from e
 
 
+def fetch_tickers_safe(ex: ccxt.Exchange, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    """
+    All 24h tickers in one call; empty dict when the exchange refuses.
+    """
+    try:
+        return call_with_budget(ex, "fetch_tickers", weight=40.0, priority=priority) or {}
+    except Exception:
+        return {}
+
+
 def iter_usdt_symbols(markets: dict) -> Iterable[str]:
     """
     Yield symbols that trade against USDT (spot or futures depending on exchange defaults).
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from sentinel.core.indicators import atr_pct, trend_strength
+from sentinel.core.mathutils import ema
+from sentinel.core.ohlcv import split_ohlcv
+from sentinel.core.structure import recent_swing_low
+
+
+class Features:
+    """
+    Derived inputs for one symbol's candles, each computed on first use and kept.
+    Regime classification and every setup detector read from the same instance,
+    so EMA20/50, ATR and swing extremes cost one pass per symbol, not one per reader.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        highs: list[float],
+        lows: list[float],
+        closes: list[float],
+        ts: list[int] | None = None,
+    ) -> None:
+        self.symbol = symbol
+        self.ts = ts or []  # candle open times (ms), when known
+        self.highs = highs
+        self.lows = lows
+        self.closes = closes
+        self._cache: dict[tuple, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    @property
+    def price(self) -> float:
+        return self.closes[-1] if self.closes else 0.0
+
+    def _get(self, key: tuple, compute) -> float:
+        v = self._cache.get(key)
+        if v is None:
+            v = self._cache[key] = compute()
+        return v
+
+    def ema(self, period: int) -> float:
+        return self._get(("ema", period), lambda: ema(self.closes, period))
+
+    def atr_pct(self) -> float:
+        return self._get(("atr_pct",), lambda: atr_pct(self.highs, self.lows, self.closes))
+
+    def trend_strength(self, fast: int = 20, slow: int = 50, floor: float = 0.0005) -> float:
+        """
+        EMA separation as in `indicators.trend_strength`; values under `floor` read as 0.
+        """
+
+        def compute() -> float:
+            ts = trend_strength(self.ema(fast), self.ema(slow), self.price)
+            return 0.0 if ts < floor else ts
+
+        return self._get(("trend_strength", fast, slow, floor), compute)
+
+    def swing_low(self, lookback: int) -> float:
+        return self._get(("swing_low", lookback), lambda: recent_swing_low(self.lows, lookback=lookback))
+
+    def prior_high_close(self, lookback: int) -> float:
+        """
+        Highest close over the `lookback` bars before the last one (the breakout level).
+        """
+
+        def compute() -> float:
+            window = self.closes[:-1][-lookback:]
+            return max(window) if window else 0.0
+
+        return self._get(("prior_high_close", lookback), compute)
+
+
+def features_from_ohlcv(symbol: str, ohlcv: list[list[float]]) -> Features:
+    highs, lows, closes = split_ohlcv(ohlcv)
+    return Features(symbol, highs, lows, closes, ts=[int(r[0]) for r in ohlcv])
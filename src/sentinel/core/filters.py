@@ -15,12 +15,42 @@ class PairFilterConfig:
     require_active: bool = True
 
 
-_LEVERAGED_SUFFIXES = ("UP/USDT", "DOWN/USDT", "BULL/USDT", "BEAR/USDT")
+_LEVERAGED_SUFFIXES = ("UP", "DOWN", "BULL", "BEAR")
+
+STABLE_BASES = {
+    "USDT",
+    "USDC",
+    "FDUSD",
+    "TUSD",
+    "USDP",
+    "BUSD",
+    "DAI",
+    "USD1",
+    "USDE",
+    "EUR",
+    "EURC",
+}
+
+
+USD_PEGGED = STABLE_BASES - {"EUR", "EURC"}
+
+
+def is_leveraged_base(base: str) -> bool:
+    # BTCUP, ETHBULL… — the underlying must be at least 3 chars, so JUP or SUP don't match
+    b = base.upper()
+    return any(b.endswith(suf) and len(b) - len(suf) >= 3 for suf in _LEVERAGED_SUFFIXES)
 
 
 def is_leveraged_token(symbol: str) -> bool:
-    s = symbol.upper()
-    return any(s.endswith(suf) for suf in _LEVERAGED_SUFFIXES)
+    return is_leveraged_base(symbol.split("/", 1)[0])
+
+
+def is_stable_base(base: str) -> bool:
+    return base.upper().strip() in STABLE_BASES
+
+
+def is_stablecoin_pair(symbol: str) -> bool:
+    return is_stable_base(symbol.split("/", 1)[0])
 
 
 def market_is_active(market: dict) -> bool:
@@ -51,3 +81,57 @@ def quote_volume_usdt_from_ticker(ticker: dict) -> float | None:
         return float(qv)
     except (TypeError, ValueError):
         return None
+
+
+def _quote_rate_usdt(quote: str, tickers: dict) -> float | None:
+    # value of one unit of `quote` in USDT, from the same ticker snapshot
+    if quote == "USDT":
+        return 1.0
+    for sym, invert in ((f"{quote}/USDT", False), (f"USDT/{quote}", True)):
+        last = (tickers.get(sym) or {}).get("last")
+        try:
+            px = float(last)
+        except (TypeError, ValueError):
+            continue
+        if px > 0:
+            return 1.0 / px if invert else px
+    return 1.0 if quote in USD_PEGGED else None
+
+
+def quote_volume_in_usdt(symbol: str, tickers: dict) -> float | None:
+    """
+    24h quote volume of `symbol` converted to USDT via the quote's own USDT ticker
+    (BTC, ETH, EUR quotes); USD stablecoins without a ticker count at par. None when
+    the volume or the conversion is unknown.
+    """
+    qv = quote_volume_usdt_from_ticker(tickers.get(symbol, {}))
+    if qv is None:
+        return None
+    rate = _quote_rate_usdt(symbol.split("/", 1)[-1].split(":", 1)[0].upper(), tickers)
+    return qv * rate if rate is not None else None
+
+
+def rank_by_quote_volume(symbols: list[str], tickers: dict) -> list[str]:
+    """
+    Order symbols by 24h quote volume in USDT, most liquid first (unknown volume sorts last).
+    """
+    return sorted(symbols, key=lambda s: quote_volume_in_usdt(s, tickers) or 0.0, reverse=True)
+
+
+def rank_quality_pairs(markets: dict, pairs: list[str], min_qv: float, tickers: dict) -> list[str]:
+    """
+    Pairs passing the market filters, by USDT quote volume. Pairs whose volume can't be
+    converted to USDT skip the `min_qv` threshold and rank last; if nothing clears it,
+    every filtered pair is returned.
+    """
+    cfg = PairFilterConfig(min_quote_volume_usdt=min_qv)
+    scored: list[tuple[str, float | None]] = []
+    for sym in pairs:
+        if passes_market_filters(sym, markets.get(sym, {}), cfg):
+            scored.append((sym, quote_volume_in_usdt(sym, tickers)))
+
+    scored.sort(key=lambda x: -1.0 if x[1] is None else x[1], reverse=True)
+    above = [s for (s, qv) in scored if qv is None or qv >= min_qv]
+    if any(qv is not None and qv >= min_qv for (_s, qv) in scored):
+        return above
+    return [s for (s, _qv) in scored]
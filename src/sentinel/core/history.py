@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import ccxt
+
+from sentinel.core.exchange import PRIORITY_BACKGROUND
+from sentinel.core.ohlcv import FetchPolicy, OHLCVConfig, fetch_ohlcv_safe
+
+
+@dataclass(frozen=True)
+class HistoryConfig:
+    timeframe: str = "1h"
+    page_limit: int = 1000  # candles per page; a capped exchange is asked again until it's covered
+    workers: int = 4  # concurrent pages; the exchange scheduler still caps the request rate
+    cache_dir: str | None = ".sentinel_cache/history"  # completed pages, for resuming; None = off
+
+
+def parse_date_ms(value: str) -> int:
+    """
+    "2023-01-01" or any ISO-8601 datetime (naive = UTC) → epoch ms.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return int(dt.timestamp() * 1000)
+
+
+def timeframe_ms(timeframe: str) -> int:
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def plan_pages(since_ms: int, until_ms: int, tf_ms: int, page_limit: int) -> list[int]:
+    """
+    Start timestamps of the pages covering [since, until).
+    Pages are aligned to multiples of the page span, so reruns with a different
+    range hit the same page keys in the progress file.
+    """
+    span = tf_ms * page_limit
+    first = (since_ms // span) * span
+    return list(range(first, until_ms, span))
+
+
+def stitch(pages: Iterable[list[list[float]]], since_ms: int, until_ms: int) -> list[list[float]]:
+    """
+    Merge pages into one ascending series, dropping duplicate timestamps and
+    candles outside [since, until).
+    """
+    by_ts: dict[int, list[float]] = {}
+    for page in pages:
+        for row in page:
+            ts = int(row[0])
+            if since_ms <= ts < until_ms:
+                by_ts[ts] = row
+    return [by_ts[ts] for ts in sorted(by_ts)]
+
+
+class _PageStore:
+    """
+    Append-only JSONL of completed pages: {"start": ms, "rows": [...]}.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[int, list[list[float]]]:
+        if self.path is None or not self.path.exists():
+            return {}
+        pages: dict[int, list[list[float]]] = {}
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn write from an interrupted run
+            pages[int(rec["start"])] = rec["rows"]
+        return pages
+
+    def append(self, start: int, rows: list[list[float]]) -> None:
+        if self.path is None:
+            return
+        line = json.dumps({"start": start, "rows": rows}, separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def _store_path(ex_id: str, symbol: str, cfg: HistoryConfig) -> Path | None:
+    if not cfg.cache_dir:
+        return None
+    safe = symbol.replace("/", "_").replace(":", "_")
+    # "p2": stores written before short pages were completed may hold gaps
+    return Path(cfg.cache_dir) / ex_id / f"{safe}_{cfg.timeframe}_{cfg.page_limit}.p2.jsonl"
+
+
+def fetch_ohlcv_range(
+    ex: ccxt.Exchange,
+    symbol: str,
+    since_ms: int,
+    until_ms: int,
+    cfg: HistoryConfig,
+    policy: FetchPolicy | None = None,
+    priority: int = PRIORITY_BACKGROUND,
+) -> list[list[float]]:
+    """
+    Download [since, until) as `since=`-based pages, concurrently, and stitch them.
+    Fully closed pages are persisted as they land, so an interrupted download resumes
+    where it stopped.
+    """
+    tf_ms = timeframe_ms(cfg.timeframe)
+    store = _PageStore(_store_path(ex.id, symbol, cfg))
+    done = store.load()
+    starts = plan_pages(since_ms, until_ms, tf_ms, cfg.page_limit)
+    todo = [s for s in starts if s not in done]
+
+    now_ms = int(time.time() * 1000)
+    span = tf_ms * cfg.page_limit
+
+    def fetch_page(rank_start: tuple[int, int]) -> tuple[int, list[list[float]]]:
+        """
+        Everything in [start, start + span). Exchanges may cap a response below
+        `page_limit` (200–720 rows is common), so keep asking from the last candle
+        returned until a response reaches the end of the page. Responses run contiguously
+        from `since`, so whatever they skip (before a listing, exchange outages) is known
+        to be absent; a page is only final once a response has got past its end.
+        """
+        rank, start = rank_start
+        end = start + span
+        rows: list[list[float]] = []
+        cursor, complete = start, False
+        while not complete:
+            ohlcv_cfg = OHLCVConfig(timeframe=cfg.timeframe, limit=cfg.page_limit, since=cursor)
+            got = fetch_ohlcv_safe(ex, symbol, ohlcv_cfg, priority=priority, rank=rank, policy=policy)
+            last = max((int(r[0]) for r in got), default=None)
+            if last is None or last < cursor:
+                break  # nothing (more) yet, or delisted: not final
+            rows += [r for r in got if cursor <= int(r[0]) < end]
+            cursor = last + tf_ms
+            complete = cursor >= end
+        # only complete pages whose last candle has closed are final
+        if complete and end <= now_ms - tf_ms:
+            store.append(start, rows)
+        return start, rows
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(cfg.workers, 1)) as pool:
+            for start, rows in pool.map(fetch_page, enumerate(todo)):
+                done[start] = rows
+
+    return stitch((done[s] for s in starts if s in done), since_ms, until_ms)
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sentinel.core.risk import PositionSizing
+from sentinel.core.setups import TradePlan
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    opened_at INTEGER NOT NULL,          -- epoch ms
+    day TEXT NOT NULL,                   -- UTC date of opened_at, for daily rollups
+    exchange TEXT NOT NULL DEFAULT '',
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL DEFAULT '',
+    setup TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT '',
+    regime TEXT NOT NULL DEFAULT '',
+    direction TEXT NOT NULL DEFAULT 'long',
+    entry_ref REAL NOT NULL,
+    fill REAL NOT NULL,
+    stop REAL NOT NULL,
+    tp1 REAL,
+    tp2 REAL,
+    risk_usdt REAL,
+    size_units REAL,
+    plan_json TEXT NOT NULL,
+    sizing_json TEXT,
+    note TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS entries_day ON entries(day);
+CREATE INDEX IF NOT EXISTS entries_symbol ON entries(symbol, opened_at);
+CREATE INDEX IF NOT EXISTS entries_setup ON entries(setup, opened_at);
+CREATE INDEX IF NOT EXISTS entries_regime ON entries(regime, opened_at);
+
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL UNIQUE REFERENCES entries(id),
+    closed_at INTEGER NOT NULL,
+    exit_price REAL NOT NULL,
+    r REAL NOT NULL,
+    pnl_usdt REAL,
+    note TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS results_closed ON results(closed_at);
+
+-- Running per-setup aggregates, in order of closing. Drawdown is peak-to-trough
+-- of cumulative R starting from 0.
+CREATE TABLE IF NOT EXISTS setup_stats (
+    setup TEXT PRIMARY KEY,
+    trades INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    sum_r REAL NOT NULL DEFAULT 0,
+    sum_r2 REAL NOT NULL DEFAULT 0,
+    gross_win_r REAL NOT NULL DEFAULT 0,
+    gross_loss_r REAL NOT NULL DEFAULT 0,
+    peak_r REAL NOT NULL DEFAULT 0,
+    max_drawdown_r REAL NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS results_rollup AFTER INSERT ON results
+BEGIN
+    INSERT OR IGNORE INTO setup_stats(setup) SELECT setup FROM entries WHERE id = NEW.entry_id;
+    -- every right-hand side sees the row as it was before this UPDATE
+    UPDATE setup_stats SET
+        trades = trades + 1,
+        wins = wins + (NEW.r > 0),
+        losses = losses + (NEW.r < 0),
+        sum_r = sum_r + NEW.r,
+        sum_r2 = sum_r2 + NEW.r * NEW.r,
+        gross_win_r = gross_win_r + MAX(NEW.r, 0),
+        gross_loss_r = gross_loss_r + MAX(-NEW.r, 0),
+        peak_r = MAX(peak_r, sum_r + NEW.r),
+        max_drawdown_r = MAX(max_drawdown_r, MAX(peak_r, sum_r + NEW.r) - (sum_r + NEW.r))
+    WHERE setup = (SELECT setup FROM entries WHERE id = NEW.entry_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS entries_no_update BEFORE UPDATE ON entries
+BEGIN SELECT RAISE(ABORT, 'journal is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS entries_no_delete BEFORE DELETE ON entries
+BEGIN SELECT RAISE(ABORT, 'journal is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+BEGIN SELECT RAISE(ABORT, 'journal is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_delete BEFORE DELETE ON results
+BEGIN SELECT RAISE(ABORT, 'journal is append-only'); END;
+"""
+
+
+class JournalError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    id: int
+    opened_at: int
+    symbol: str
+    timeframe: str
+    setup: str
+    regime: str
+    direction: str
+    fill: float
+    stop: float
+    tp1: float | None
+    risk_usdt: float | None
+    # filled in once the trade is closed
+    closed_at: int | None = None
+    exit_price: float | None = None
+    r: float | None = None
+
+
+@dataclass(frozen=True)
+class SetupStats:
+    setup: str
+    trades: int
+    wins: int
+    losses: int
+    total_r: float
+    expectancy_r: float
+    stdev_r: float
+    profit_factor: float
+    max_drawdown_r: float
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _day(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=UTC).strftime("%Y-%m-%d")
+
+
+def r_multiple(direction: str, fill: float, stop: float, exit_price: float) -> float:
+    risk = fill - stop if direction == "long" else stop - fill
+    if risk <= 0:
+        raise JournalError(f"stop {stop} is on the wrong side of fill {fill} for a {direction}")
+    move = exit_price - fill if direction == "long" else fill - exit_price
+    return move / risk
+
+
+class Journal:
+    """
+    Local trade journal (SQLite, WAL). Entries and results are append-only — the
+    database refuses updates and deletes — and per-setup aggregates are kept current
+    by a trigger, so stats are a single-row read however long the journal gets.
+    """
+
+    def __init__(self, path: str | Path = ".sentinel_cache/journal.sqlite3") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> Journal:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record_entry(
+        self,
+        plan: TradePlan,
+        sizing: PositionSizing | None = None,
+        regime: str = "",
+        fill: float | None = None,
+        exchange: str = "",
+        timeframe: str = "",
+        opened_at: int | None = None,
+        note: str = "",
+    ) -> int:
+        """
+        Log a plan that was taken. `fill` defaults to the plan's entry reference.
+        """
+        ts = _now_ms() if opened_at is None else opened_at
+        fill = plan.entry_ref if fill is None else fill
+        r_multiple(plan.direction, fill, plan.stop, fill)  # validates the stop side
+        row = (
+            ts, _day(ts), exchange, plan.symbol, timeframe, plan.setup, plan.status, regime, plan.direction,
+            plan.entry_ref, fill, plan.stop, plan.tp1, plan.tp2,
+            sizing.risk_usdt if sizing else None, sizing.size_units if sizing else None,
+            json.dumps(asdict(plan)), json.dumps(asdict(sizing)) if sizing else None, note,
+        )  # fmt: skip
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO entries(opened_at, day, exchange, symbol, timeframe, setup, status, regime, direction,"
+                " entry_ref, fill, stop, tp1, tp2, risk_usdt, size_units, plan_json, sizing_json, note)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            return int(cur.lastrowid)
+
+    def record_result(self, entry_id: int, exit_price: float, closed_at: int | None = None, note: str = "") -> float:
+        """
+        Close an entry at `exit_price`; returns the R multiple. Each entry closes once.
+        """
+        with self._lock, self._conn:
+            found = self._conn.execute(
+                "SELECT direction, fill, stop, risk_usdt FROM entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+            if found is None:
+                raise JournalError(f"no journal entry {entry_id}")
+            direction, fill, stop, risk_usdt = found
+            r = r_multiple(direction, fill, stop, exit_price)
+            pnl = r * risk_usdt if risk_usdt is not None else None
+            try:
+                self._conn.execute(
+                    "INSERT INTO results(entry_id, closed_at, exit_price, r, pnl_usdt, note) VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry_id, _now_ms() if closed_at is None else closed_at, exit_price, r, pnl, note),
+                )
+            except sqlite3.IntegrityError as e:
+                raise JournalError(f"entry {entry_id} is already closed") from e
+            return r
+
+    def entries(
+        self,
+        symbol: str | None = None,
+        setup: str | None = None,
+        regime: str | None = None,
+        since_ms: int | None = None,
+        until_ms: int | None = None,
+        open_only: bool = False,
+        limit: int = 100,
+    ) -> list[JournalEntry]:
+        """
+        Most recent first.
+        """
+        where, args = [], []
+        for col, val in (("e.symbol", symbol), ("e.setup", setup), ("e.regime", regime)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        if since_ms is not None:
+            where.append("e.opened_at >= ?")
+            args.append(since_ms)
+        if until_ms is not None:
+            where.append("e.opened_at < ?")
+            args.append(until_ms)
+        if open_only:
+            where.append("r.id IS NULL")
+        sql = (
+            "SELECT e.id, e.opened_at, e.symbol, e.timeframe, e.setup, e.regime, e.direction, e.fill, e.stop, e.tp1,"
+            " e.risk_usdt, r.closed_at, r.exit_price, r.r FROM entries e LEFT JOIN results r ON r.entry_id = e.id"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY e.opened_at DESC, e.id DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*args, limit)).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def setup_stats(self) -> list[SetupStats]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT setup, trades, wins, losses, sum_r, sum_r2, gross_win_r, gross_loss_r, max_drawdown_r"
+                " FROM setup_stats ORDER BY setup"
+            ).fetchall()
+        out: list[SetupStats] = []
+        for setup, n, wins, losses, sum_r, sum_r2, gw, gl, mdd in rows:
+            mean = sum_r / n if n else 0.0
+            var = max(sum_r2 / n - mean * mean, 0.0) * n / (n - 1) if n > 1 else 0.0
+            pf = gw / gl if gl > 0 else float("inf")
+            out.append(SetupStats(setup, n, wins, losses, sum_r, mean, math.sqrt(var), pf, mdd))
+        return out
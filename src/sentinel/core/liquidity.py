@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import ccxt
+
+from sentinel.core.exchange import PRIORITY_INTERACTIVE, call_with_budget, fetch_tickers_safe
+
+# Request weights (Binance figures; other exchanges are in the same ballpark)
+_BIDS_ASKS_WEIGHT = 4.0
+_BOOK_WEIGHT = 5.0
+
+
+@dataclass(frozen=True)
+class LiquidityConfig:
+    # Reject symbols whose bid/ask spread is wider than this, in % of mid (0 = off)
+    max_spread_pct: float = 0.0
+    # Reject symbols with less than this much quote currency on the thinner side of the top level (0 = off)
+    min_top_depth: float = 0.0
+
+    # Fallback when no bulk source has a symbol: one order book per symbol
+    book_limit: int = 5
+    book_workers: int = 8
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_spread_pct > 0 or self.min_top_depth > 0
+
+
+@dataclass(frozen=True)
+class Quote:
+    symbol: str
+    bid: float
+    ask: float
+    bid_qty: float | None
+    ask_qty: float | None
+    source: str  # "bids_asks", "tickers" or "order_book"
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2.0
+
+    @property
+    def spread_pct(self) -> float:
+        return (self.ask - self.bid) / self.mid * 100.0
+
+    @property
+    def top_depth(self) -> float | None:
+        """
+        Quote-currency size of the thinner side of the top level; None when unknown.
+        """
+        if self.bid_qty is None or self.ask_qty is None:
+            return None
+        return min(self.bid * self.bid_qty, self.ask * self.ask_qty)
+
+
+def _pos(v) -> float | None:
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return f if f > 0 else None
+
+
+def quote_from_ticker(symbol: str, ticker: dict, source: str = "tickers") -> Quote | None:
+    bid, ask = _pos(ticker.get("bid")), _pos(ticker.get("ask"))
+    if bid is None or ask is None or ask < bid:
+        return None
+    return Quote(symbol, bid, ask, _pos(ticker.get("bidVolume")), _pos(ticker.get("askVolume")), source)
+
+
+def quote_from_order_book(symbol: str, book: dict) -> Quote | None:
+    bids, asks = book.get("bids") or [], book.get("asks") or []
+    if not bids or not asks:
+        return None
+    (bid, bid_qty, *_), (ask, ask_qty, *_) = bids[0], asks[0]
+    if _pos(bid) is None or _pos(ask) is None or ask < bid:
+        return None
+    return Quote(symbol, float(bid), float(ask), _pos(bid_qty), _pos(ask_qty), "order_book")
+
+
+def bulk_quotes(
+    ex: ccxt.Exchange,
+    symbols: list[str],
+    tickers: dict | None = None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> dict[str, Quote]:
+    """
+    Best bid/ask for as many of `symbols` as one bulk call can give: `fetch_bids_asks`
+    where the exchange has it, else the 24h tickers (`tickers` if the caller already has them).
+    """
+    wanted = set(symbols)
+    out: dict[str, Quote] = {}
+    if (getattr(ex, "has", None) or {}).get("fetchBidsAsks"):
+        try:
+            raw = call_with_budget(ex, "fetch_bids_asks", weight=_BIDS_ASKS_WEIGHT, priority=priority) or {}
+        except Exception:
+            raw = {}
+        for sym, t in raw.items():
+            if sym in wanted and (q := quote_from_ticker(sym, t or {}, "bids_asks")) is not None:
+                out[sym] = q
+    if len(out) < len(wanted):
+        if tickers is None:
+            tickers = fetch_tickers_safe(ex, priority=priority)
+        for sym in wanted - out.keys():
+            q = quote_from_ticker(sym, tickers.get(sym) or {})
+            if q is not None:
+                out[sym] = q
+    return out
+
+
+def order_book_quotes(
+    ex: ccxt.Exchange,
+    symbols: list[str],
+    cfg: LiquidityConfig,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> dict[str, Quote]:
+    """
+    Top of book per symbol from individual order book requests, `cfg.book_workers` at a
+    time. Symbols whose book can't be fetched are left out.
+    """
+
+    def one(rank_sym: tuple[int, str]) -> Quote | None:
+        rank, sym = rank_sym
+        try:
+            book = call_with_budget(
+                ex, "fetch_order_book", sym, cfg.book_limit, weight=_BOOK_WEIGHT, priority=priority, rank=rank
+            )
+        except Exception:
+            return None
+        return quote_from_order_book(sym, book or {})
+
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(cfg.book_workers, 1)) as pool:
+        quotes = list(pool.map(one, enumerate(symbols)))
+    return {q.symbol: q for q in quotes if q is not None}
+
+
+def liquidity_reject_reason(q: Quote | None, cfg: LiquidityConfig) -> str | None:
+    # no quote at all (book fetch failed): let the symbol through, like a missing volume
+    if q is None:
+        return None
+    if cfg.max_spread_pct > 0 and q.spread_pct > cfg.max_spread_pct:
+        return f"spread {q.spread_pct:.3f}% > {cfg.max_spread_pct:g}%"
+    if cfg.min_top_depth > 0:
+        depth = q.top_depth
+        if depth is None:
+            return "top-of-book depth unknown"
+        if depth < cfg.min_top_depth:
+            return f"top-of-book depth {depth:.0f} < {cfg.min_top_depth:.0f}"
+    return None
+
+
+def _needs_book(q: Quote | None, cfg: LiquidityConfig) -> bool:
+    # bulk quotes on some venues carry prices but no sizes: the depth check needs a book
+    return q is None or (cfg.min_top_depth > 0 and q.top_depth is None)
+
+
+def select_liquid(
+    ex: ccxt.Exchange,
+    symbols: list[str],
+    cfg: LiquidityConfig,
+    limit: int | None = None,
+    tickers: dict | None = None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> tuple[list[str], dict[str, Quote], list[dict]]:
+    """
+    Walk `symbols` in order and keep the first `limit` that pass the spread and depth
+    checks. Returns (kept, quotes, rejected as {"symbol", "reason"}).
+    Order books are only requested for symbols the bulk sources missed (or gave no
+    sizes for, when depth is checked), and only as many as are still needed to fill
+    `limit`.
+    """
+    quotes = bulk_quotes(ex, symbols, tickers, priority)
+    kept: list[str] = []
+    rejected: list[dict] = []
+    pending = list(symbols)
+    while pending and (limit is None or len(kept) < limit):
+        need = len(pending) if limit is None else limit - len(kept)
+        batch, pending = pending[:need], pending[need:]
+        quotes.update(order_book_quotes(ex, [s for s in batch if _needs_book(quotes.get(s), cfg)], cfg, priority))
+        for sym in batch:
+            reason = liquidity_reject_reason(quotes.get(sym), cfg)
+            if reason is None:
+                kept.append(sym)
+            else:
+                rejected.append({"symbol": sym, "reason": reason})
+    return kept, quotes, rejected
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sentinel.core.history import timeframe_ms
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AnalysisCache:
+    """
+    Size-bounded LRU of per-symbol analysis results. Thread-safe; a value is
+    computed outside the lock, so two callers racing on one key may both compute.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = max_entries
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._data), self.max_entries)
+
+
+# 1970-01-01 was a Thursday; exchanges open weekly candles on Monday 00:00 UTC
+_WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def candle_open_ms(timeframe: str, t_ms: int) -> int:
+    """
+    Open time of the candle containing `t_ms`. Weekly candles start on Monday and
+    monthly ones on the 1st (UTC), as on the exchanges; the rest align to the epoch.
+    """
+    if timeframe.endswith("M"):
+        months = int(timeframe[:-1] or 1)
+        d = datetime.fromtimestamp(t_ms / 1000, UTC)
+        index = (d.year * 12 + d.month - 1) // months * months
+        return int(datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC).timestamp() * 1000)
+    tf = timeframe_ms(timeframe)
+    offset = _WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+    return (t_ms - offset) // tf * tf + offset
+
+
+def last_closed_open_ms(timeframe: str, now_ms: int | None = None) -> int:
+    """
+    Open time of the most recent fully closed candle, from the clock alone (no fetch).
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    return candle_open_ms(timeframe, candle_open_ms(timeframe, now_ms) - 1)
+
+
+def drop_forming(ohlcv: list[list[float]], closed_open_ms: int) -> list[list[float]]:
+    """
+    The candles up to the last closed one: the forming bar's close is a live price
+    that would otherwise be frozen into results keyed on `closed_open_ms`.
+    """
+    end = len(ohlcv)
+    while end and ohlcv[end - 1][0] > closed_open_ms:
+        end -= 1
+    return ohlcv[:end]
+
+
+def config_hash(*cfgs: Any) -> str:
+    """
+    Stable short hash of dataclass configs (or plain JSON-able values).
+    """
+    parts = [asdict(c) if is_dataclass(c) and not isinstance(c, type) else c for c in cfgs]
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
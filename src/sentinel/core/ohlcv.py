@@ -1,27 +1,214 @@
 from __future__ import annotations
 
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 
 import ccxt
 
-from sentinel.core.exchange import ExchangeError
+from sentinel.core.exchange import (
+    PRIORITY_INTERACTIVE,
+    CircuitOpenError,
+    ExchangeError,
+    call_with_budget,
+    get_circuit_breaker,
+    retry_after_s,
+)
 
 
 @dataclass(frozen=True)
 class OHLCVConfig:
     timeframe: str = "15m"
     limit: int = 120  # enough for EMAs + ATR estimate
+    since: int | None = None  # ms; None = most recent `limit` candles
 
 
-def fetch_ohlcv_safe(ex: ccxt.Exchange, symbol: str, cfg: OHLCVConfig) -> list[list[float]]:
+@dataclass(frozen=True)
+class FetchPolicy:
+    # retries on network-type errors, with full-jitter exponential backoff
+    retries: int = 2
+    backoff_base_s: float = 0.25
+    backoff_max_s: float = 2.0
+    # stop retrying once this much time has gone into one symbol; checked between
+    # attempts, so an attempt in flight still runs up to ExchangeConfig.timeout_ms
+    deadline_s: float = 15.0
+
+    # send a duplicate request once the first is slower than the exchange's p95
+    hedge: bool = False
+    hedge_min_ms: float = 250.0
+
+    # circuit breaker (shared per exchange)
+    breaker_failures: int = 5
+    breaker_cooldown_s: float = 30.0
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent request latencies for one exchange.
+    """
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> float | None:
+        with self._lock:
+            if len(self._samples) < 20:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+_LATENCY: dict[str, LatencyTracker] = {}
+_LATENCY_LOCK = threading.Lock()
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sentinel-hedge")
+
+
+def latency_tracker(ex: ccxt.Exchange) -> LatencyTracker:
+    key = getattr(ex, "id", "")
+    with _LATENCY_LOCK:
+        tr = _LATENCY.get(key)
+        if tr is None:
+            tr = LatencyTracker()
+            _LATENCY[key] = tr
+        return tr
+
+
+def _hedged(call, hedge_after_s: float):
+    """
+    Run `call(sent)`; if it hasn't finished `hedge_after_s` after setting `sent` (its
+    request left our scheduler queue), race a duplicate. Time spent queued behind our
+    own rate limit never triggers a hedge. The first successful response wins; the
+    loser is left to finish in the pool.
+    """
+    sent = threading.Event()
+    first = _HEDGE_POOL.submit(call, sent)
+    first.add_done_callback(lambda _f: sent.set())
+    sent.wait()
+    done, _ = wait([first], timeout=hedge_after_s)
+    if done:
+        return first.result()
+
+    pending = {first, _HEDGE_POOL.submit(call)}
+    last_exc: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is None:
+                return f.result()
+            last_exc = f.exception()
+    raise last_exc  # type: ignore[misc]
+
+
+def _is_retryable(e: Exception) -> bool:
+    # timeouts, 5xx, 429/418 — not bad symbols or malformed requests
+    return isinstance(e, ccxt.NetworkError)
+
+
+def _is_throttled(e: Exception) -> bool:
+    # ccxt maps 429 to RateLimitExceeded and 418 (IP ban) to DDoSProtection
+    return isinstance(e, (ccxt.RateLimitExceeded, ccxt.DDoSProtection))
+
+
+def _backoff_s(attempt: int, policy: FetchPolicy) -> float:
+    return random.uniform(0.0, min(policy.backoff_max_s, policy.backoff_base_s * (2**attempt)))
+
+
+def ohlcv_request_weight(limit: int) -> float:
+    """
+    Request weight of one klines call (Binance-style tiers; a fair proxy elsewhere).
+    """
+    if limit <= 100:
+        return 1.0
+    if limit <= 500:
+        return 2.0
+    if limit <= 1000:
+        return 5.0
+    return 10.0
+
+
+def fetch_ohlcv_safe(
+    ex: ccxt.Exchange,
+    symbol: str,
+    cfg: OHLCVConfig,
+    priority: int = PRIORITY_INTERACTIVE,
+    rank: int = 0,
+    policy: FetchPolicy | None = None,
+) -> list[list[float]]:
     """
     Fetch OHLCV with error wrapping.
     Returns list of [timestamp, open, high, low, close, volume]
+    `rank` is the symbol's quote-volume rank: lower ranks are served first under load.
+    Network errors are retried per `policy` (`deadline_s` stops new attempts, it does
+    not cut one short); an exchange whose breaker is open fails fast with
+    CircuitOpenError. Rate-limit answers back off without counting against the breaker.
     """
-    try:
-        return ex.fetch_ohlcv(symbol, timeframe=cfg.timeframe, limit=cfg.limit)
-    except Exception as e:
-        raise ExchangeError(f"fetch_ohlcv failed for {symbol} on {ex.id}: {e}") from e
+    if policy is None:
+        policy = FetchPolicy()
+    breaker = get_circuit_breaker(ex, policy.breaker_failures, policy.breaker_cooldown_s)
+    tracker = latency_tracker(ex)
+
+    def call(sent: threading.Event | None = None) -> list[list[float]]:
+        sent_at: list[float] = []
+
+        def mark_sent() -> None:
+            sent_at.append(time.monotonic())
+            if sent is not None:
+                sent.set()
+
+        out = call_with_budget(
+            ex,
+            "fetch_ohlcv",
+            symbol,
+            timeframe=cfg.timeframe,
+            since=cfg.since,
+            limit=cfg.limit,
+            weight=ohlcv_request_weight(cfg.limit),
+            priority=priority,
+            rank=rank,
+            on_sent=mark_sent,
+        )
+        # exchange latency only: waiting in our own queue would inflate the hedge p95
+        tracker.record(time.monotonic() - sent_at[0])
+        return out
+
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {ex.id}; skipped {symbol}")
+        try:
+            if policy.hedge:
+                p95 = tracker.p95()
+                hedge_after = max(policy.hedge_min_ms / 1000.0, p95 or 0.0)
+                out = _hedged(call, hedge_after)
+            else:
+                out = call()
+            breaker.record_success()
+            return out
+        except Exception as e:
+            if not _is_retryable(e):
+                # the venue answered; it's this request that's wrong
+                breaker.record_success()
+                raise ExchangeError(f"fetch_ohlcv failed for {symbol} on {ex.id}: {e}") from e
+            pause = _backoff_s(attempt, policy)
+            if _is_throttled(e):
+                # back off (the scheduler has paused the bucket too) but don't trip the breaker
+                breaker.record_throttled()
+                pause = max(pause, retry_after_s(ex) or 0.0)
+            else:
+                breaker.record_failure()
+            attempt += 1
+            if attempt > policy.retries or time.monotonic() - started + pause > policy.deadline_s:
+                raise ExchangeError(f"fetch_ohlcv failed for {symbol} on {ex.id} after {attempt} attempt(s): {e}") from e
+            time.sleep(pause)
 
 
 def split_ohlcv(ohlcv: list[list[float]]) -> tuple[list[float], list[float], list[float]]:
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from sentinel.core.backtest import BacktestStats, Signal
+from sentinel.core.risk import RiskConfig, compute_position_sizing
+
+
+@dataclass(frozen=True)
+class PortfolioConfig:
+    max_open: int | None = None  # cap on concurrent positions (None = unlimited)
+    horizon_bars: int = 80  # close at market after this many bars (same cap as the series sim)
+
+
+@dataclass(frozen=True)
+class CandidateTrade:
+    signal: Signal
+    entry_ts: int
+    exit_ts: int | None  # None = still open when the data ends
+    r: float
+    timeout: bool  # closed at market after `horizon_bars`
+
+
+@dataclass(frozen=True)
+class SymbolStream:
+    symbol: str
+    trades: list[CandidateTrade]  # one per signal, ascending
+
+
+def symbol_stream(
+    symbol: str, ohlcv: list[list[float]], signals: list[Signal], cfg: PortfolioConfig | None = None
+) -> SymbolStream:
+    """
+    Each signal with the exit it would get if taken. A trade's exit depends on its own
+    symbol's bars only, so this runs where the candles are and they never travel.
+    """
+    horizon = (cfg or PortfolioConfig()).horizon_bars
+    trades = []
+    for sig in signals:
+        exit_ts, r, timeout = None, 0.0, False
+        for j in range(sig.index + 1, len(ohlcv)):
+            close = float(ohlcv[j][4])
+            if close <= sig.stop:
+                r = -1.0
+            elif close >= sig.tp1:
+                r = 1.0
+            elif j - sig.index >= horizon:
+                r, timeout = (close - sig.entry) / (sig.entry - sig.stop), True
+            else:
+                continue
+            exit_ts = int(ohlcv[j][0])
+            break
+        trades.append(CandidateTrade(sig, int(ohlcv[sig.index][0]), exit_ts, r, timeout))
+    return SymbolStream(symbol, trades)
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    symbols: int
+    trades: int
+    wins: int
+    losses: int
+    timeouts: int  # closed at market after `horizon_bars`
+    skipped_by_cap: int
+    max_concurrent: int
+    total_r: float
+    total_usdt: float
+    max_drawdown_r: float
+    # (timestamp ms, cumulative R) after each exit
+    equity_curve: list[tuple[int, float]] = field(default_factory=list)
+
+
+def _entries(stream: SymbolStream) -> Iterator[tuple[int, str, CandidateTrade]]:
+    for t in stream.trades:
+        yield t.entry_ts, stream.symbol, t
+
+
+def run_portfolio(streams: Iterable[SymbolStream], risk: RiskConfig, cfg: PortfolioConfig | None = None) -> PortfolioResult:
+    """
+    Replay every symbol on one time axis (k-way heap merge of per-symbol entries, plus
+    a heap of the open positions' exits). At each timestamp exits are settled before
+    new entries are considered, so a slot freed by one symbol can be taken by another
+    on the same bar. Exits come precomputed from `symbol_stream`, whose `cfg` sets
+    the horizon; here `cfg` only caps open positions.
+    """
+    if cfg is None:
+        cfg = PortfolioConfig()
+
+    streams = list(streams)
+    merged = heapq.merge(*(_entries(s) for s in streams), key=lambda e: (e[0], e[1]))
+
+    open_pos: dict[str, float] = {}  # symbol → risk in USDT
+    exits: list[tuple[int, str, float, bool]] = []  # (exit ts, symbol, R, timeout)
+    stats = BacktestStats()
+    timeouts = skipped = max_conc = 0
+    total_usdt = 0.0
+    curve: list[tuple[int, float]] = []
+
+    def settle(until_ts: float) -> None:
+        nonlocal timeouts, total_usdt
+        while exits and exits[0][0] <= until_ts:
+            ts, sym, r, timeout = heapq.heappop(exits)
+            stats.update(r)
+            total_usdt += r * open_pos.pop(sym)
+            timeouts += timeout
+            curve.append((ts, stats.total_r))
+
+    for ts, group in itertools.groupby(merged, key=lambda e: e[0]):
+        settle(ts)
+        for _ts, sym, t in group:
+            if sym in open_pos:
+                continue
+            if cfg.max_open is not None and len(open_pos) >= cfg.max_open:
+                skipped += 1
+                continue
+            sizing = compute_position_sizing(entry=t.signal.entry, stop=t.signal.stop, cfg=risk)
+            if sizing is None:
+                continue
+            open_pos[sym] = sizing.risk_usdt
+            if t.exit_ts is not None:
+                heapq.heappush(exits, (t.exit_ts, sym, t.r, t.timeout))
+        max_conc = max(max_conc, len(open_pos))
+    settle(float("inf"))
+
+    return PortfolioResult(
+        symbols=len(streams),
+        trades=stats.trades,
+        wins=stats.wins,
+        losses=stats.losses,
+        timeouts=timeouts,
+        skipped_by_cap=skipped,
+        max_concurrent=max_conc,
+        total_r=stats.total_r,
+        total_usdt=total_usdt,
+        max_drawdown_r=stats.max_drawdown_r,
+        equity_curve=curve,
+    )
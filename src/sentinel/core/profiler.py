@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    parts = Path(code.co_filename).parts
+    return f"{code.co_name} ({'/'.join(parts[-2:])}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack `1 / interval_s` times a second from a daemon
+    thread (`sys._current_frames`), so the profiled code runs unmodified and the cost
+    is one stack walk per thread per tick. Stacks are kept collapsed ("a;b;c" → count),
+    the input format of flamegraph.pl, speedscope and inferno.
+
+    With `package` set, stacks that never enter that package (idle pool workers, the
+    event loop waiting on sockets) are dropped.
+    """
+
+    def __init__(self, interval_s: float = 0.01, package: str | None = "sentinel") -> None:
+        self.interval_s = interval_s
+        self.package = package
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+        self.elapsed_s = 0.0
+
+    def _keep(self, frames: list[FrameType]) -> bool:
+        if self.package is None:
+            return True
+        marker = f"{self.package}/"
+        return any(marker in f.f_code.co_filename.replace("\\", "/") for f in frames)
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames: list[FrameType] = []
+            f: FrameType | None = frame
+            while f is not None:
+                frames.append(f)
+                f = f.f_back
+            if frames and self._keep(frames):
+                self.stacks[";".join(_frame_label(x) for x in reversed(frames))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+    def start(self) -> SamplingProfiler:
+        self._stop.clear()
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sentinel-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> SamplingProfiler:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.elapsed_s += time.monotonic() - self._started
+        return self
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def write_collapsed(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed(), encoding="utf-8")
+        return path
+
+    def top(self, n: int = 10) -> list[tuple[str, int]]:
+        """
+        Functions by self samples (where the stacks end), hottest first.
+        """
+        leaves: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+
+def default_profile_path(name: str, root: str = "reports") -> Path:
+    return Path(root) / f"profile-{name}-{datetime.now(UTC).strftime('%Y%m%d-%H%M%S')}.folded"
+
+
+@contextmanager
+def profile_to(path: str | None, name: str, interval_s: float = 0.01) -> Iterator[SamplingProfiler | None]:
+    """
+    Profile the block into `path` (collapsed stacks); `path=""` picks a timestamped
+    file under reports/, `None` disables profiling. A summary goes to stderr.
+    """
+    if path is None:
+        yield None
+        return
+    prof = SamplingProfiler(interval_s).start()
+    try:
+        yield prof
+    finally:
+        prof.stop()
+        out = prof.write_collapsed(path or default_profile_path(name))
+        lines = [f"profile: {prof.samples} samples over {prof.elapsed_s:.1f}s → {out}"]
+        total = sum(prof.stacks.values()) or 1
+        lines += [f"  {count * 100 / total:5.1f}%  {label}" for label, count in prof.top(8)]
+        print("\n".join(lines), file=sys.stderr)
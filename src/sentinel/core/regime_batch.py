@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from sentinel.core.regime import MarketRegime, RegimeConfig
+
+# Label codes in the (symbols × bars) matrix; -1 = not enough data on that bar.
+UNKNOWN = -1
+REGIME_CODES: tuple[MarketRegime, ...] = (MarketRegime.TREND, MarketRegime.RANGE, MarketRegime.CHAOS)
+TREND, RANGE, CHAOS = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class RegimeTransition:
+    symbol: str
+    bar: int  # first bar of the new regime
+    from_regime: MarketRegime
+    to_regime: MarketRegime
+
+
+@dataclass(frozen=True)
+class RegimeHistory:
+    symbols: list[str]
+    labels: np.ndarray  # (S, T) int8 codes, see REGIME_CODES
+    run_length: np.ndarray  # (S, T) bars spent in the current regime, including this one
+    transitions: list[RegimeTransition]
+
+    def current(self, symbol: str) -> tuple[MarketRegime | None, int]:
+        """
+        Last bar's regime for `symbol` and how many bars it has lasted.
+        """
+        i = self.symbols.index(symbol)
+        code = int(self.labels[i, -1])
+        if code == UNKNOWN:
+            return None, 0
+        return REGIME_CODES[code], int(self.run_length[i, -1])
+
+
+def stack_ohlcv(series: dict[str, list[list[float]]], bars: int | None = None) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-symbol OHLCV lists → (symbols, highs, lows, closes) matrices aligned on the
+    most recent bar. Shorter histories are left-padded with NaN.
+    """
+    symbols = list(series)
+    width = bars or max((len(v) for v in series.values()), default=0)
+    out = np.full((3, len(symbols), width), np.nan)
+    for i, sym in enumerate(symbols):
+        rows = series[sym][-width:] if width else []
+        if not rows:
+            continue
+        arr = np.asarray(rows, dtype=np.float64)
+        out[:, i, width - len(rows) :] = arr[:, [2, 3, 4]].T
+    return symbols, out[0], out[1], out[2]
+
+
+def ema_matrix(closes: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA of every prefix, row-wise — bar t equals `mathutils.ema(closes[:t+1], period)`:
+    running mean until `period` bars exist, then SMA-seeded recursion.
+    The loop runs over bars; each step is vectorized across all symbols.
+    """
+    if period <= 0:
+        raise ValueError("period must be > 0")
+    valid = ~np.isnan(closes)
+    count = np.cumsum(valid, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        running_mean = np.nancumsum(closes, axis=1) / count
+
+    # rows may be left-padded with NaN, so "period bars exist" is tracked per row
+    k = 2 / (period + 1)
+    out = np.empty_like(closes)
+    e = np.full(closes.shape[0], np.nan)
+    for j in range(closes.shape[1]):
+        e = np.where(count[:, j] > period, closes[:, j] * k + e * (1 - k), running_mean[:, j])
+        out[:, j] = e
+    return out
+
+
+def rolling_atr_pct(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, window: int = 100) -> np.ndarray:
+    """
+    Mean true range over the last `window` bars as % of close, for every bar.
+    Same estimate as `indicators.atr_pct`, evaluated on a rolling window.
+    """
+    prev = closes[:, :-1]
+    tr = np.maximum.reduce([highs[:, 1:] - lows[:, 1:], np.abs(highs[:, 1:] - prev), np.abs(lows[:, 1:] - prev)])
+    tr = np.concatenate([np.full((tr.shape[0], 1), np.nan), tr], axis=1)
+
+    csum = np.nancumsum(tr, axis=1)
+    count = np.cumsum(~np.isnan(tr), axis=1)
+    lagged_sum = np.zeros_like(csum)
+    lagged_cnt = np.zeros_like(count)
+    lagged_sum[:, window:] = csum[:, :-window]
+    lagged_cnt[:, window:] = count[:, :-window]
+    n = count - lagged_cnt
+    with np.errstate(invalid="ignore", divide="ignore"):
+        atr = (csum - lagged_sum) / n
+        return np.where((n > 0) & (closes > 0), atr / closes * 100.0, np.nan)
+
+
+def trend_strength_matrix(closes: np.ndarray, fast: int = 20, slow: int = 50, floor: float = 0.0005) -> np.ndarray:
+    """
+    |EMA fast − EMA slow| / price for every bar; values under `floor` read as 0 (as in scan).
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ts = np.abs(ema_matrix(closes, fast) - ema_matrix(closes, slow)) / closes
+    return np.where(ts < floor, 0.0, ts)
+
+
+def classify_regime_batch(atr_pct: np.ndarray, trend_strength: np.ndarray, cfg: RegimeConfig | None = None) -> np.ndarray:
+    """
+    Elementwise `classify_regime` over whole matrices; NaN inputs → UNKNOWN.
+    """
+    if cfg is None:
+        cfg = RegimeConfig()
+    labels = np.full(atr_pct.shape, RANGE, dtype=np.int8)
+    labels[(atr_pct >= cfg.min_atr_pct) & (atr_pct <= cfg.max_atr_pct) & (trend_strength >= cfg.min_trend_strength)] = TREND
+    labels[atr_pct > cfg.max_atr_pct] = CHAOS
+    labels[np.isnan(atr_pct) | np.isnan(trend_strength)] = UNKNOWN
+    return labels
+
+
+def run_lengths(labels: np.ndarray) -> np.ndarray:
+    s, t = labels.shape
+    bar = np.broadcast_to(np.arange(t), (s, t))
+    change = np.ones((s, t), dtype=bool)
+    change[:, 1:] = labels[:, 1:] != labels[:, :-1]
+    start = np.maximum.accumulate(np.where(change, bar, 0), axis=1)
+    return bar - start + 1
+
+
+def regime_history(
+    symbols: list[str],
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    cfg: RegimeConfig | None = None,
+    atr_window: int = 100,
+) -> RegimeHistory:
+    """
+    Regime label for every (symbol, bar) in one vectorized pass, plus run lengths
+    and the list of transitions between known regimes.
+    """
+    labels = classify_regime_batch(
+        rolling_atr_pct(highs, lows, closes, atr_window),
+        trend_strength_matrix(closes),
+        cfg,
+    )
+
+    prev, cur = labels[:, :-1], labels[:, 1:]
+    si, bi = np.nonzero((prev != cur) & (prev != UNKNOWN) & (cur != UNKNOWN))
+    transitions = [
+        RegimeTransition(symbols[s], int(b) + 1, REGIME_CODES[prev[s, b]], REGIME_CODES[cur[s, b]])
+        for s, b in zip(si.tolist(), bi.tolist(), strict=True)
+    ]
+    return RegimeHistory(symbols, labels, run_lengths(labels), transitions)
@@ -2,52 +2,104 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from sentinel.core.risk import PositionSizing
+from sentinel.core.setups import TradePlan
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolResult:
+    """
+    Everything one scanned symbol produced. The CLI text, the scan JSON, the web
+    rows and the briefing are all views rendered from it on demand.
+    """
 
-@dataclass(frozen=True)
-class ReportRow:
     symbol: str
     regime: str
+    atr_pct: float
+    trend_strength: float
     action: str
     note: str = ""
+    plan: TradePlan | None = None
+    sizing: PositionSizing | None = None
+    spread_pct: float | None = None  # bid/ask spread, when the liquidity stage ran
+    cluster: int | None = None  # correlation cluster, for A+ setups
+    correlated_with: str = ""  # better-ranked A+ symbol in the same cluster
+
+    @property
+    def is_setup(self) -> bool:
+        return self.action.startswith("A+")
+
+    def summary(self) -> dict:
+        """
+        The row the web UI shows.
+        """
+        return {
+            "symbol": self.symbol,
+            "regime": self.regime,
+            "atr_pct": self.atr_pct,
+            "trend_strength": self.trend_strength,
+            "action": self.action,
+            "note": self.note,
+            "cluster": self.cluster,
+            "correlated_with": self.correlated_with,
+        }
+
+    def to_json(self) -> dict:
+        """
+        The row in `scan --format json` (what `journal take --from-scan` reads).
+        """
+        return {**self.summary(), "plan": self.plan, "sizing": self.sizing, "spread_pct": self.spread_pct}
+
+    def text_lines(self) -> list[str]:
+        out = [f"{self.symbol.ljust(16)} {self.regime.ljust(8)} {self.atr_pct:7.2f} {self.trend_strength:7.3f}  {self.action}"]
+        p, s = self.plan, self.sizing
+        if self.is_setup and p is not None and s is not None:
+            spread = f" | SPREAD={self.spread_pct:.3f}%" if self.spread_pct is not None else ""
+            out.append(f"  ↳ ENTRY≈{p.entry_ref:.6f} SL={p.stop:.6f} TP1={p.tp1:.6f} TP2={p.tp2:.6f}")
+            out.append(f"     SIZE≈{s.size_units:.6f} units | NOTIONAL≈{s.notional_usdt:.2f} | STOP={s.stop_distance_pct:.2f}%{spread}")
+            out.append(f"     TRIGGER: {p.entry_trigger}")
+        return out
+
+
+# Briefing sections in print order: (title, cap on rows shown)
+_SECTIONS = {
+    "setups": ("A+ SETUPS (prioritize)", None),
+    "trend": ("TREND WATCHLIST (wait for A+ confirmation)", 20),
+    "range": ("RANGE / LIMITED (avoid forcing)", 15),
+    "chaos": ("CHAOS (NO TRADE)", 15),
+}
 
 
-def build_briefing_text(rows: list[ReportRow]) -> str:
+def build_briefing_text(rows: list[SymbolResult]) -> str:
     if not rows:
         return "No briefing rows.\n"
 
-    trend = [r for r in rows if r.regime == "trend" and not r.action.startswith("A+")]
-    setups = [r for r in rows if r.action.startswith("A+")]
-    chaos = [r for r in rows if r.regime == "chaos"]
-    ranges = [r for r in rows if r.regime == "range"]
+    # one pass: route each row to its section and render it there (setups only occur in trend)
+    sections: dict[str, list[str]] = {k: [] for k in _SECTIONS}
+    for r in rows:
+        key = "setups" if r.is_setup else r.regime
+        if key not in sections:
+            continue
+        lines, cap = sections[key], _SECTIONS[key][1]
+        if cap is not None and len(lines) >= cap:
+            continue
+        if key == "setups":
+            lines.append(f"- {r.symbol}: {r.action}  {r.note}".rstrip())
+        elif key == "chaos":
+            lines.append(f"- {r.symbol}: protect capital")
+        else:
+            lines.append(f"- {r.symbol}: {r.note}".rstrip())
 
     out: list[str] = []
     out.append("=" * 78)
     out.append("SENTINEL — TRADER BRIEFING (manual execution only)")
     out.append("=" * 78)
 
-    if setups:
-        out.append("\nA+ SETUPS (prioritize)")
-        out.append("-" * 78)
-        for r in setups:
-            out.append(f"- {r.symbol}: {r.action}  {r.note}".rstrip())
-
-    if trend:
-        out.append("\nTREND WATCHLIST (wait for A+ confirmation)")
-        out.append("-" * 78)
-        for r in trend[:20]:
-            out.append(f"- {r.symbol}: {r.note}".rstrip())
-
-    if ranges:
-        out.append("\nRANGE / LIMITED (avoid forcing)")
-        out.append("-" * 78)
-        for r in ranges[:15]:
-            out.append(f"- {r.symbol}: {r.note}".rstrip())
-
-    if chaos:
-        out.append("\nCHAOS (NO TRADE)")
-        out.append("-" * 78)
-        for r in chaos[:15]:
-            out.append(f"- {r.symbol}: protect capital".rstrip())
+    for key, (title, _cap) in _SECTIONS.items():
+        if sections[key]:
+            out.append(f"\n{title}")
+            out.append("-" * 78)
+            out.extend(sections[key])
 
     out.append("\nRISK RULES (v1)")
     out.append("-" * 78)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from collections.abc import Callable
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+
+def _feed(h, part: Any) -> None:
+    # arrays (and candle lists) by their bytes, configs by their fields, the rest as JSON
+    if isinstance(part, (list, tuple)) and part and isinstance(part[0], (int, float, list, tuple)):
+        part = np.asarray(part, dtype=np.float64)
+    if isinstance(part, np.ndarray):
+        h.update(f"nd:{part.dtype}:{part.shape}:".encode())
+        h.update(np.ascontiguousarray(part).tobytes())
+    elif is_dataclass(part) and not isinstance(part, type):
+        h.update(f"dc:{type(part).__name__}:".encode())
+        h.update(json.dumps(asdict(part), sort_keys=True, default=str).encode())
+    else:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode())
+    h.update(b"\x00")
+
+
+def content_key(*parts: Any) -> str:
+    """
+    Hex digest identifying a computation by its inputs.
+    """
+    h = hashlib.sha256()
+    for p in parts:
+        _feed(h, p)
+    return h.hexdigest()
+
+
+def code_fingerprint(*modules: ModuleType) -> str:
+    """
+    Hash of the modules' source (every .py under a package), part of every key:
+    editing a detector, an indicator it calls or the simulator invalidates the
+    results it produced.
+    """
+    h = hashlib.sha256()
+    for m in modules:
+        if hasattr(m, "__path__"):
+            files = sorted(p for root in m.__path__ for p in Path(root).rglob("*.py"))
+        else:
+            files = [Path(inspect.getsourcefile(m) or "")]
+        for f in files:
+            h.update(f.name.encode())
+            h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Content-addressed results on disk: one pickle per key under `root/ab/abcdef….pkl`.
+    Reads bump the file's mtime, and `prune()` deletes least-recently-used files until
+    the directory fits `max_bytes`. Writes are atomic (temp file + rename), so worker
+    processes can share a root.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            value = pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            path.unlink(missing_ok=True)  # truncated or from an incompatible version
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp.replace(path)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*/*.pkl"))
+
+    def prune(self) -> int:
+        """
+        Evict least-recently-used entries until the cache fits `max_bytes`; returns
+        how many were removed.
+        """
+        files = []
+        for p in self.root.glob("*/*.pkl"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _m, size, _p in files)
+        removed = 0
+        for _mtime, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -20,12 +20,18 @@ class PositionSizing:
     notional_usdt: float
 
 
-def compute_position_sizing(entry: float, stop: float, cfg: RiskConfig) -> PositionSizing | None:
+def compute_position_sizing(entry: float, stop: float, cfg: RiskConfig, spread_pct: float = 0.0) -> PositionSizing | None:
+    """
+    Size so that a stop-out loses `cfg.risk_usdt`. The stop distance is padded by the
+    fee buffer and by the bid/ask spread, which a market entry and exit both cross: the
+    spread is a fraction of price, so it costs `entry * spread_pct / 100` per unit
+    however tight the stop.
+    """
     if entry <= 0 or stop <= 0 or stop >= entry:
         return None
 
     dist = entry - stop
-    dist_adj = dist * (1.0 + cfg.fee_buffer_pct / 100.0)
+    dist_adj = dist * (1.0 + cfg.fee_buffer_pct / 100.0) + entry * max(spread_pct, 0.0) / 100.0
     if dist_adj <= 0:
         return None
 
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from sentinel.core.filters import quote_volume_usdt_from_ticker
+from sentinel.core.liquidity import Quote
+from sentinel.core.report import SymbolResult
+
+# Columns a screen can name; every other one is numeric (NaN when unknown)
+TEXT_COLUMNS = ("symbol", "regime")
+NUMERIC_COLUMNS = (
+    "rank",  # position in the volume-ranked universe, 0 = most liquid
+    "price",
+    "atr_pct",
+    "trend_strength",
+    "quote_volume",  # 24h, in quote currency
+    "change_pct",  # 24h
+    "spread_pct",  # when the liquidity stage ran
+    "top_depth",
+    "setup",  # 1 for A+ setups
+)
+COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
+
+
+class ScreenError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class FeatureTable:
+    """
+    One array per column, one position per symbol, in scan order.
+    """
+
+    symbols: list[str]
+    columns: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+def _float(v) -> float:
+    return np.nan if v is None else float(v)
+
+
+def screen_table(
+    results: Sequence[SymbolResult],
+    prices: Mapping[str, float],
+    tickers: Mapping[str, dict],
+    quotes: Mapping[str, Quote],
+) -> FeatureTable:
+    """
+    The columns of `COLUMNS` for the scanned symbols.
+    """
+    cols: dict[str, list] = {c: [] for c in COLUMNS}
+    for i, r in enumerate(results):
+        ticker = tickers.get(r.symbol) or {}
+        quote = quotes.get(r.symbol)
+        cols["symbol"].append(r.symbol)
+        cols["regime"].append(r.regime)
+        cols["rank"].append(i)
+        cols["price"].append(_float(prices.get(r.symbol)))
+        cols["atr_pct"].append(r.atr_pct)
+        cols["trend_strength"].append(r.trend_strength)
+        cols["quote_volume"].append(_float(quote_volume_usdt_from_ticker(ticker)))
+        cols["change_pct"].append(_float(ticker.get("percentage")))
+        cols["spread_pct"].append(_float(r.spread_pct))
+        cols["top_depth"].append(_float(quote.top_depth if quote is not None else None))
+        cols["setup"].append(1.0 if r.is_setup else 0.0)
+    arrays = {c: np.asarray(cols[c], dtype=str if c in TEXT_COLUMNS else np.float64) for c in COLUMNS}
+    return FeatureTable([r.symbol for r in results], arrays)
+
+
+# -- parsing --------------------------------------------------------------------------
+#
+#   screen  := [or] ["order" "by" key ("," key)*]
+#   or      := and ("or" and)*
+#   and     := not ("and" not)*
+#   not     := "not" not | cmp
+#   cmp     := sum [op sum | "between" sum "and" sum | ["not"] "in" "(" sum ("," sum)* ")"]
+#   sum     := product (("+" | "-") product)*
+#   product := unary (("*" | "/") unary)*
+#   unary   := "-" unary | number | 'text' | column | "abs" "(" sum ")" | "(" or ")"
+#   key     := sum ["asc" | "desc"]
+#
+# Each node compiles to a function of the table returning an array, tagged with its
+# kind ("num", "text" or "bool") so type errors surface when the screen is compiled.
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<str>'[^']*'|\"[^\"]*\")"
+    r"|(?P<op><=|>=|!=|<>|==|[<>=()+\-*/,])"
+    r"|(?P<name>[A-Za-z_][A-Za-z_0-9]*))"
+)
+_KEYWORDS = {"and", "or", "not", "between", "in", "order", "by", "asc", "desc", "abs"}
+_COMPARE = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<>": np.not_equal,
+}
+_ARITH = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+
+Column = Callable[[FeatureTable], np.ndarray]
+
+
+@dataclass(frozen=True)
+class _Node:
+    fn: Column
+    kind: str  # "num", "text" or "bool"
+
+
+def _tokenize(text: str) -> list[tuple[str, str, int]]:
+    tokens: list[tuple[str, str, int]] = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ScreenError(f"unexpected {text[pos:].strip()[:12]!r} at {pos}")
+        kind = m.lastgroup or ""
+        value, start = m.group(kind), m.start(kind)
+        if kind == "name" and value.lower() in _KEYWORDS:
+            kind, value = "kw", value.lower()
+        tokens.append((kind, value, start))
+        pos = m.end()
+    return tokens
+
+
+def _const(value, kind: str) -> _Node:
+    return _Node(lambda t: np.full(len(t), value), kind)
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def peek(self, *values: str) -> bool:
+        return self.i < len(self.tokens) and self.tokens[self.i][1] in values and self.tokens[self.i][0] in ("kw", "op")
+
+    def take(self, *values: str) -> str | None:
+        if self.peek(*values):
+            self.i += 1
+            return self.tokens[self.i - 1][1]
+        return None
+
+    def expect(self, value: str) -> None:
+        if self.take(value) is None:
+            raise self.error(f"expected {value!r}")
+
+    def error(self, msg: str) -> ScreenError:
+        if self.i < len(self.tokens):
+            _kind, value, pos = self.tokens[self.i]
+            return ScreenError(f"{msg} at {pos} (near {value!r})")
+        return ScreenError(f"{msg} at end of expression")
+
+    def done(self) -> bool:
+        return self.i >= len(self.tokens)
+
+    # -- boolean layer --
+
+    def parse_or(self) -> _Node:
+        node = self.parse_and()
+        while self.take("or"):
+            node = _logical(np.logical_or, node, self.parse_and(), "or")
+        return node
+
+    def parse_and(self) -> _Node:
+        node = self.parse_not()
+        while self.take("and"):
+            node = _logical(np.logical_and, node, self.parse_not(), "and")
+        return node
+
+    def parse_not(self) -> _Node:
+        if self.take("not"):
+            inner = self.parse_not()
+            if inner.kind != "bool":
+                raise ScreenError("'not' needs a condition")
+            return _Node(lambda t: np.logical_not(inner.fn(t)), "bool")
+        return self.parse_cmp()
+
+    def parse_cmp(self) -> _Node:
+        left = self.parse_sum()
+        op = self.take(*_COMPARE)
+        if op is not None:
+            right = self.parse_sum()
+            return _compare(_COMPARE[op], left, right, op)
+        if self.take("between"):
+            lo = self.parse_sum()
+            self.expect("and")
+            hi = self.parse_sum()
+            ge, le = _compare(np.greater_equal, left, lo, "between"), _compare(np.less_equal, left, hi, "between")
+            return _Node(lambda t: ge.fn(t) & le.fn(t), "bool")
+        negate = self.take("not") is not None
+        if negate or self.peek("in"):
+            self.expect("in")
+            self.expect("(")
+            items = [self.parse_sum()]
+            while self.take(","):
+                items.append(self.parse_sum())
+            self.expect(")")
+            tests = [_compare(np.equal, left, item, "in") for item in items]
+
+            def member(t: FeatureTable) -> np.ndarray:
+                hit = np.zeros(len(t), dtype=bool)
+                for test in tests:
+                    hit |= test.fn(t)
+                return ~hit if negate else hit
+
+            return _Node(member, "bool")
+        return left
+
+    # -- value layer --
+
+    def parse_sum(self) -> _Node:
+        node = self.parse_product()
+        while (op := self.take("+", "-")) is not None:
+            node = _arith(_ARITH[op], node, self.parse_product(), op)
+        return node
+
+    def parse_product(self) -> _Node:
+        node = self.parse_unary()
+        while (op := self.take("*", "/")) is not None:
+            node = _arith(_ARITH[op], node, self.parse_unary(), op)
+        return node
+
+    def parse_unary(self) -> _Node:
+        if self.take("-"):
+            inner = self.parse_unary()
+            if inner.kind != "num":
+                raise ScreenError("'-' needs a number")
+            return _Node(lambda t: np.negative(inner.fn(t)), "num")
+        if self.take("("):
+            node = self.parse_or()
+            self.expect(")")
+            return node
+        if self.take("abs"):
+            self.expect("(")
+            inner = self.parse_sum()
+            self.expect(")")
+            if inner.kind != "num":
+                raise ScreenError("abs() needs a number")
+            return _Node(lambda t: np.abs(inner.fn(t)), "num")
+        if self.done():
+            raise self.error("expected a value")
+        kind, value, _pos = self.tokens[self.i]
+        if kind == "num":
+            self.i += 1
+            return _const(float(value), "num")
+        if kind == "str":
+            self.i += 1
+            return _const(value[1:-1], "text")
+        if kind == "name":
+            name = value.lower()
+            if name not in COLUMNS:
+                raise self.error(f"unknown column {value!r} (have: {', '.join(COLUMNS)})")
+            self.i += 1
+            return _Node(lambda t: t.columns[name], "text" if name in TEXT_COLUMNS else "num")
+        raise self.error("expected a value")
+
+    # -- order by --
+
+    def parse_keys(self) -> tuple[tuple[_Node, bool], ...]:
+        keys = []
+        while True:
+            node = self.parse_sum()
+            if node.kind == "bool":
+                raise ScreenError("cannot order by a condition")
+            desc = self.take("asc", "desc") == "desc"
+            keys.append((node, desc))
+            if not self.take(","):
+                return tuple(keys)
+
+
+def _logical(op, a: _Node, b: _Node, name: str) -> _Node:
+    if a.kind != "bool" or b.kind != "bool":
+        raise ScreenError(f"'{name}' joins conditions, not values")
+    return _Node(lambda t: op(a.fn(t), b.fn(t)), "bool")
+
+
+def _compare(op, a: _Node, b: _Node, name: str) -> _Node:
+    if a.kind == "bool" or b.kind == "bool" or a.kind != b.kind:
+        raise ScreenError(f"'{name}' compares two numbers or two texts")
+    if a.kind == "text" and op not in (np.equal, np.not_equal):
+        raise ScreenError(f"'{name}' on text: use =, != or in")
+    if a.kind == "text":
+        # case-insensitive, as symbols and regimes are typed by hand
+        return _Node(lambda t: op(np.char.lower(a.fn(t)), np.char.lower(b.fn(t))), "bool")
+    return _Node(lambda t: op(a.fn(t), b.fn(t)), "bool")
+
+
+def _arith(op, a: _Node, b: _Node, name: str) -> _Node:
+    if a.kind != "num" or b.kind != "num":
+        raise ScreenError(f"'{name}' needs numbers")
+    return _Node(lambda t: op(a.fn(t), b.fn(t)), "num")
+
+
+# -- compiled screens -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Screen:
+    """
+    A compiled `--where` / `--sort`. Applying it is a handful of numpy operations over
+    whole columns, whatever the number of symbols.
+    """
+
+    where: str
+    sort: str
+    condition: _Node | None
+    keys: tuple[tuple[_Node, bool], ...]
+
+    def mask(self, table: FeatureTable) -> np.ndarray:
+        if self.condition is None:
+            return np.ones(len(table), dtype=bool)
+        with np.errstate(all="ignore"):
+            return np.asarray(self.condition.fn(table), dtype=bool)
+
+    def order(self, table: FeatureTable) -> np.ndarray:
+        """
+        Row indices sorted by the keys; ties and unknown (NaN) values keep scan order,
+        unknowns last.
+        """
+        if not self.keys:
+            return np.arange(len(table))
+        significance: list[np.ndarray] = []
+        with np.errstate(all="ignore"):
+            for node, desc in self.keys:
+                v = node.fn(table)
+                if node.kind == "text":
+                    v = np.unique(np.char.lower(v), return_inverse=True)[1]
+                v = np.asarray(v, dtype=np.float64)
+                missing = np.isnan(v)
+                significance += [missing, np.where(missing, 0.0, -v if desc else v)]
+        return np.lexsort(tuple(reversed(significance)))
+
+    def apply(self, table: FeatureTable) -> np.ndarray:
+        """
+        Indices of the rows that pass, in output order.
+        """
+        idx = self.order(table)
+        return idx[self.mask(table)[idx]]
+
+
+@lru_cache(maxsize=256)
+def compile_screen(where: str | None = None, sort: str | None = None) -> Screen:
+    """
+    Parse once: e.g. `compile_screen("atr_pct between 1 and 4 and trend_strength > 0.01
+    order by quote_volume desc")`. `sort` is the same "key [asc|desc], …" list as the
+    `order by` clause, for when it's given separately. Raises ScreenError.
+    """
+    condition: _Node | None = None
+    keys: tuple[tuple[_Node, bool], ...] = ()
+    p = _Parser(where or "")
+    if not p.done() and not p.peek("order"):
+        condition = p.parse_or()
+        if condition.kind != "bool":
+            raise ScreenError("the filter must be a condition, e.g. atr_pct > 1")
+    if p.take("order"):
+        p.expect("by")
+        keys = p.parse_keys()
+    if not p.done():
+        raise p.error("unexpected input")
+
+    if sort and sort.strip():
+        if keys:
+            raise ScreenError("order given twice (in the filter and as a sort)")
+        s = _Parser(sort)
+        if s.take("order"):
+            s.expect("by")
+        keys = s.parse_keys()
+        if not s.done():
+            raise s.error("unexpected input")
+    return Screen(where or "", sort or "", condition, keys)
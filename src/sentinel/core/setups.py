@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
-from sentinel.core.mathutils import ema
-from sentinel.core.structure import near_level, recent_swing_low
+from sentinel.core.features import Features
+from sentinel.core.structure import near_level
 
 
 @dataclass(frozen=True)
@@ -66,13 +68,14 @@ def _had_pullback_touch(closes: list[float], lows: list[float], e20: float, e50:
     return False
 
 
-def detect_pullback_long(closes: list[float], lows: list[float], symbol: str, cfg: PullbackConfig) -> TradePlan | None:
+def pullback_long(f: Features, cfg: PullbackConfig) -> TradePlan | None:
+    closes, lows = f.closes, f.lows
     if len(closes) < max(cfg.ema_fast, cfg.ema_slow) + 30:
         return None
 
-    price = closes[-1]
-    e20 = ema(closes, cfg.ema_fast)
-    e50 = ema(closes, cfg.ema_slow)
+    price = f.price
+    e20 = f.ema(cfg.ema_fast)
+    e50 = f.ema(cfg.ema_slow)
 
     if not (price > e50 and e20 > e50):
         return None
@@ -82,7 +85,7 @@ def detect_pullback_long(closes: list[float], lows: list[float], symbol: str, cf
 
     status = "READY" if price > e20 else "WATCH"
 
-    sl = recent_swing_low(lows, lookback=cfg.swing_lookback)
+    sl = f.swing_low(cfg.swing_lookback)
     if sl <= 0 or sl >= price:
         return None
 
@@ -97,7 +100,7 @@ def detect_pullback_long(closes: list[float], lows: list[float], symbol: str, cf
     )
 
     return TradePlan(
-        symbol=symbol,
+        symbol=f.symbol,
         direction="long",
         setup="PULLBACK",
         status=status,
@@ -110,19 +113,13 @@ def detect_pullback_long(closes: list[float], lows: list[float], symbol: str, cf
     )
 
 
-def _recent_swing_high(closes: list[float], lookback: int) -> float:
-    if not closes:
-        return 0.0
-    window = closes[-lookback:] if len(closes) >= lookback else closes
-    return max(window)
-
-
-def detect_breakout_retest_long(closes: list[float], lows: list[float], symbol: str, cfg: BreakoutRetestConfig) -> TradePlan | None:
+def breakout_retest_long(f: Features, cfg: BreakoutRetestConfig) -> TradePlan | None:
+    closes, lows = f.closes, f.lows
     if len(closes) < cfg.breakout_lookback + 10:
         return None
 
-    price = closes[-1]
-    level = _recent_swing_high(closes[:-1], cfg.breakout_lookback)
+    price = f.price
+    level = f.prior_high_close(cfg.breakout_lookback)
     if level <= 0:
         return None
 
@@ -137,7 +134,7 @@ def detect_breakout_retest_long(closes: list[float], lows: list[float], symbol:
 
     status = "READY" if price > level else "WATCH"
 
-    sl = recent_swing_low(lows, lookback=cfg.swing_lookback)
+    sl = f.swing_low(cfg.swing_lookback)
     if sl <= 0 or sl >= price:
         return None
 
@@ -152,7 +149,7 @@ def detect_breakout_retest_long(closes: list[float], lows: list[float], symbol:
     )
 
     return TradePlan(
-        symbol=symbol,
+        symbol=f.symbol,
         direction="long",
         setup="BREAKOUT_RETEST",
         status=status,
@@ -163,3 +160,57 @@ def detect_breakout_retest_long(closes: list[float], lows: list[float], symbol:
         tp2=tp2,
         notes=f"Breakout+retest: level≈{level:.6f}, retest in last {cfg.retest_lookback} candles.",
     )
+
+
+def detect_pullback_long(closes: list[float], lows: list[float], symbol: str, cfg: PullbackConfig) -> TradePlan | None:
+    return pullback_long(Features(symbol, [], lows, closes), cfg)
+
+
+def detect_breakout_retest_long(closes: list[float], lows: list[float], symbol: str, cfg: BreakoutRetestConfig) -> TradePlan | None:
+    return breakout_retest_long(Features(symbol, [], lows, closes), cfg)
+
+
+Detector = Callable[[Features, object], TradePlan | None]
+
+
+@dataclass
+class DetectorRegistry:
+    """
+    Ordered setup detectors sharing one `Features` per symbol. The first detector
+    that returns a plan wins; time spent in each one is accumulated per name.
+    """
+
+    detectors: dict[str, tuple[Detector, object]] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+    seconds: dict[str, float] = field(default_factory=dict)
+
+    def register(self, name: str, detector: Detector, cfg: object) -> None:
+        self.detectors[name] = (detector, cfg)
+
+    def detect(self, f: Features) -> TradePlan | None:
+        for name, (fn, cfg) in self.detectors.items():
+            t0 = time.perf_counter()
+            try:
+                plan = fn(f, cfg)
+            finally:
+                self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+                self.calls[name] = self.calls.get(name, 0) + 1
+            if plan is not None:
+                return plan
+        return None
+
+    def timings(self) -> dict[str, dict]:
+        return {
+            name: {"calls": self.calls.get(name, 0), "ms": round(self.seconds.get(name, 0.0) * 1000.0, 3)}
+            for name in self.detectors
+        }
+
+
+def default_detectors(pb: PullbackConfig | None = None, br: BreakoutRetestConfig | None = None) -> DetectorRegistry:
+    """
+    The built-in long setups; pullback is checked before breakout-retest.
+    """
+    reg = DetectorRegistry()
+    reg.register("pullback", pullback_long, pb or PullbackConfig())
+    reg.register("breakout_retest", breakout_retest_long, br or BreakoutRetestConfig())
+    return reg
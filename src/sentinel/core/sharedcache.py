@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Environment variable naming the cache file; `web.py --workers N` sets it for its workers
+SHARED_CACHE_ENV = "SENTINEL_SHARED_CACHE"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL        -- epoch seconds
+);
+CREATE INDEX IF NOT EXISTS kv_expires ON kv(expires_at);
+
+-- One holder per key at a time; an expired lease may be taken over.
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    until REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class SharedCacheStats:
+    hits: int
+    misses: int
+    computes: int  # misses this process filled itself
+    waits: int  # misses filled by another process while this one waited
+
+
+class SharedCache:
+    """
+    Key → value store with TTLs shared by every process on the host (SQLite, WAL),
+    plus leases so that on a miss only one process does the work while the others
+    wait for its result. Values are pickled: keep the file private to this service.
+    """
+
+    def __init__(self, path: str | Path, poll_s: float = 0.05, busy_timeout_ms: int = 5000) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.poll_s = poll_s
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=busy_timeout_ms / 1000.0)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._hits = self._misses = self._computes = self._waits = 0
+        self._writes = 0
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def _owner() -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    # -- values -------------------------------------------------------------------
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_s: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO kv(key, value, expires_at) VALUES (?, ?, ?)", (key, blob, now + ttl_s))
+            self._writes += 1
+            if self._writes % 256 == 0:
+                self._conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    # -- leases -------------------------------------------------------------------
+
+    def try_lease(self, key: str, ttl_s: float) -> bool:
+        """
+        Take (or renew) the lease on `key` for `ttl_s` seconds. False while another
+        thread or process holds an unexpired one.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO leases(key, owner, until) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, until = excluded.until "
+                "WHERE leases.until <= ? OR leases.owner = excluded.owner",
+                (key, self._owner(), now + ttl_s, now),
+            )
+            return cur.rowcount == 1
+
+    def release(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner()))
+
+    @contextmanager
+    def lease(self, key: str, ttl_s: float = 30.0, wait_s: float = 30.0) -> Iterator[bool]:
+        """
+        Hold the lease on `key` for the block (a cross-process lock). Yields False if it
+        couldn't be had within `wait_s`; the block then runs unprotected.
+        """
+        deadline = time.monotonic() + wait_s
+        got = self.try_lease(key, ttl_s)
+        while not got and time.monotonic() < deadline:
+            time.sleep(self.poll_s)
+            got = self.try_lease(key, ttl_s)
+        try:
+            yield got
+        finally:
+            if got:
+                self.release(key)
+
+    def get_or_compute(self, key: str, ttl_s: float, compute: Callable[[], Any], lease_s: float = 30.0) -> Any:
+        """
+        Cached value of `key`, else `compute()` stored for `ttl_s`. Concurrent misses
+        across processes compute once: the lease holder fetches, the rest poll for its
+        result (falling back to computing themselves if it takes longer than `lease_s`).
+        A None result is not stored.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        deadline = time.monotonic() + lease_s
+        while True:
+            if self.try_lease(f"fill:{key}", lease_s):
+                try:
+                    value = self.get(key)  # filled while we were waiting for the lease
+                    if value is None:
+                        with self._lock:
+                            self._computes += 1
+                        value = compute()
+                        if value is not None:
+                            self.set(key, value, ttl_s)
+                    return value
+                finally:
+                    self.release(f"fill:{key}")
+            time.sleep(self.poll_s)
+            value = self.get(key)
+            if value is not None:
+                with self._lock:
+                    self._waits += 1
+                return value
+            if time.monotonic() > deadline:
+                return compute()
+
+    def stats(self) -> SharedCacheStats:
+        with self._lock:
+            return SharedCacheStats(self._hits, self._misses, self._computes, self._waits)
+
+
+_SHARED: tuple[int, SharedCache] | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_cache() -> SharedCache | None:
+    """
+    This process's handle on the cache named by $SENTINEL_SHARED_CACHE, or None when
+    unset (single process: nothing to share). Opened lazily, once per process.
+    """
+    global _SHARED
+    path = os.environ.get(SHARED_CACHE_ENV)
+    if not path:
+        return None
+    with _SHARED_LOCK:
+        if _SHARED is None or _SHARED[0] != os.getpid():
+            _SHARED = (os.getpid(), SharedCache(path))
+        return _SHARED[1]
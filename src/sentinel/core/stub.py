@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+
+import ccxt
+import numpy as np
+
+from sentinel.core.history import timeframe_ms
+
+
+@dataclass(frozen=True)
+class StubConfig:
+    symbols: int = 80
+    quote: str = "USDT"
+
+    # per request: latency ~ N(latency_ms, jitter_ms), clipped at 0
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    # fraction of requests failing with a network error / a 429
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    # ms per request unit, as ccxt's `rateLimit`; our scheduler derives its budget from it
+    rate_limit_ms: float = 1.0
+    seed: int = 7
+
+
+# JSON of StubConfig fields, read on import: how a server started in a child
+# process (the load test's) gets the same stub as its parent
+STUB_CONFIG_ENV = "SENTINEL_STUB_CONFIG"
+
+
+def stub_config_env(cfg: StubConfig) -> str:
+    return json.dumps(asdict(cfg))
+
+
+def _config_from_env() -> StubConfig:
+    raw = os.environ.get(STUB_CONFIG_ENV)
+    return StubConfig(**json.loads(raw)) if raw else StubConfig()
+
+
+_CONFIG = _config_from_env()
+_CONFIG_LOCK = threading.Lock()
+
+
+def configure_stub(cfg: StubConfig) -> None:
+    """
+    Settings for every stub exchange created from now on (`exchange_id="stub"`).
+    """
+    global _CONFIG
+    with _CONFIG_LOCK:
+        _CONFIG = cfg
+
+
+def stub_config() -> StubConfig:
+    return _CONFIG
+
+
+def _unit(symbol: str, salt: str) -> float:
+    # stable per-symbol value in [0, 1)
+    return (zlib.crc32(f"{symbol}|{salt}".encode()) & 0xFFFFFFFF) / 2**32
+
+
+class StubExchange:
+    """
+    Offline stand-in for a ccxt exchange: the public-data methods SENTINEL uses, with
+    injected latency and failures. Prices are a deterministic function of symbol and
+    candle time, so every instance (and every worker process) agrees on the data.
+    """
+
+    id = "stub"
+    has = {"fetchBidsAsks": True, "fetchTickers": True, "fetchOHLCV": True, "fetchOrderBook": True}
+
+    def __init__(self, cfg: StubConfig | None = None) -> None:
+        self.cfg = cfg or stub_config()
+        self.rateLimit = self.cfg.rate_limit_ms
+        self.last_response_headers: dict[str, str] = {}
+        self._rng = random.Random(self.cfg.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.markets = {
+            f"STUB{i:03d}/{self.cfg.quote}": {
+                "symbol": f"STUB{i:03d}/{self.cfg.quote}",
+                "base": f"STUB{i:03d}",
+                "quote": self.cfg.quote,
+                "type": "spot",
+                "spot": True,
+                "active": True,
+            }
+            for i in range(self.cfg.symbols)
+        }
+
+    # -- fault injection ------------------------------------------------------------
+
+    def _request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self._rng.gauss(self.cfg.latency_ms, self.cfg.jitter_ms)) / 1000.0
+            roll = self._rng.random()
+        time.sleep(delay)
+        if roll < self.cfg.rate_limit_rate:
+            self.last_response_headers = {"Retry-After": "1"}
+            raise ccxt.RateLimitExceeded("stub: 429 Too Many Requests")
+        if roll < self.cfg.rate_limit_rate + self.cfg.error_rate:
+            raise ccxt.NetworkError("stub: injected network error")
+
+    # -- data ---------------------------------------------------------------------------
+
+    def _close(self, symbol: str, idx: np.ndarray) -> np.ndarray:
+        base = 10 ** (4 * _unit(symbol, "price"))  # 1 … 10k
+        # a slow swing (trends lasting hundreds of bars) plus a faster oscillation (pullbacks)
+        slow = 200 + 800 * _unit(symbol, "slow")
+        fast = 10 + 60 * _unit(symbol, "fast")
+        amp = 0.02 + 0.1 * _unit(symbol, "amp")
+        phase = 2 * math.pi * _unit(symbol, "phase")
+        return base * np.exp(0.8 * np.sin(idx / slow + phase) + amp * np.sin(idx / fast + 3 * phase))
+
+    def _last_price(self, symbol: str) -> float:
+        idx = np.array([int(time.time() * 1000) // 60_000])
+        return float(self._close(symbol, idx)[0])
+
+    def load_markets(self, reload: bool = False) -> dict:
+        self._request()
+        return self.markets
+
+    def set_markets(self, markets: dict, currencies: dict | None = None) -> dict:
+        self.markets = markets
+        return markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: int | None = None, limit: int | None = None) -> list:
+        self._request()
+        if symbol not in self.markets:
+            raise ccxt.BadSymbol(f"stub does not have market symbol {symbol}")
+        tf = timeframe_ms(timeframe)
+        n = limit or 500
+        last = int(time.time() * 1000) // tf * tf  # the forming candle is included, as on a real venue
+        first = since // tf * tf if since is not None else last - (n - 1) * tf
+        ts = np.arange(first, min(first + n * tf, last + tf), tf, dtype=np.int64)
+        if len(ts) == 0:
+            return []
+        close = self._close(symbol, ts // tf)
+        opens = np.concatenate([[close[0]], close[:-1]])
+        wick = 1.0 + 0.004 * (1.0 + np.sin(ts // tf * 1.7))
+        high = np.maximum(opens, close) * wick
+        low = np.minimum(opens, close) / wick
+        vol = 1000.0 * (1.0 + np.cos(ts // tf * 0.3) ** 2)
+        return np.column_stack([ts, opens, high, low, close, vol]).tolist()
+
+    def _book_top(self, symbol: str) -> dict:
+        mid = self._last_price(symbol)
+        half = mid * (0.0001 + 0.002 * _unit(symbol, "spread") ** 3)
+        qty = 50_000.0 * (1.0 - _unit(symbol, "depth")) / mid
+        return {"bid": mid - half, "ask": mid + half, "bidVolume": qty, "askVolume": qty}
+
+    def fetch_tickers(self, symbols: list[str] | None = None) -> dict:
+        self._request()
+        out = {}
+        for i, sym in enumerate(symbols or self.markets):
+            top = self._book_top(sym)
+            last = (top["bid"] + top["ask"]) / 2
+            out[sym] = {"symbol": sym, "last": last, "close": last, "quoteVolume": 5e8 / (1 + i) ** 1.2, **top}
+        return out
+
+    def fetch_bids_asks(self, symbols: list[str] | None = None) -> dict:
+        self._request()
+        return {sym: {"symbol": sym, **self._book_top(sym)} for sym in symbols or self.markets}
+
+    def fetch_order_book(self, symbol: str, limit: int | None = None) -> dict:
+        self._request()
+        top = self._book_top(symbol)
+        levels = range(limit or 5)
+        return {
+            "symbol": symbol,
+            "bids": [[top["bid"] * (1 - 0.0005 * k), top["bidVolume"]] for k in levels],
+            "asks": [[top["ask"] * (1 + 0.0005 * k), top["askVolume"]] for k in levels],
+        }
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import heapq
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from sentinel.core.history import timeframe_ms
+from sentinel.core.setups import TradePlan
+
+# Plan lifecycle: pending (WATCH, waiting for the entry) → open → one of the final states.
+PENDING, OPEN = "pending", "open"
+STOPPED, TP1, TP2, EXPIRED = "stopped", "tp1", "tp2", "expired"
+FINAL = (STOPPED, TP1, TP2, EXPIRED)
+
+# Level kinds. "Up" levels fire when a candle's high reaches them, "down" levels when its low does.
+_TRIGGER, _TP1, _TP2, _STOP = "trigger", "tp1", "tp2", "stop"
+
+
+@dataclass
+class TrackedPlan:
+    id: int
+    symbol: str
+    timeframe: str
+    setup: str
+    direction: str
+    entry: float
+    stop: float
+    tp1: float
+    tp2: float
+    emitted_at: int  # open time of the candle the plan was built on; later candles count
+    expires_at: int
+    state: str = OPEN
+    tp1_hit: bool = False
+    closed_at: int | None = None
+
+    @property
+    def key(self) -> tuple:
+        # entry/targets drift with price between refreshes; the swing-low stop doesn't
+        return (self.symbol, self.timeframe, self.setup, round(self.stop, 12))
+
+
+class LevelIndex:
+    """
+    Heap of (level, plan id, kind) entries, fired as price crosses them: upward ones
+    when a candle's high reaches the level, downward ones when its low does. A price
+    move pops just the crossed entries, so the cost scales with the plans hit, not
+    the plans open. Removal is lazy; the heap is rebuilt once stale entries dominate.
+    """
+
+    def __init__(self, upward: bool = True) -> None:
+        self._sign = 1 if upward else -1
+        self._heap: list[tuple[float, int, str]] = []
+        self._live: dict[tuple[float, int, str], int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, level: float, plan_id: int, kind: str) -> None:
+        entry = (level, plan_id, kind)
+        self._live[entry] = self._live.get(entry, 0) + 1
+        self._size += 1
+        heapq.heappush(self._heap, (self._sign * level, plan_id, kind))
+
+    def remove(self, level: float, plan_id: int, kind: str) -> None:
+        if self._take((level, plan_id, kind)) and len(self._heap) > 2 * self._size + 16:
+            self._heap = [(self._sign * lvl, pid, k) for (lvl, pid, k), n in self._live.items() for _ in range(n)]
+            heapq.heapify(self._heap)
+
+    def pop_crossed(self, price: float) -> list[tuple[float, int, str]]:
+        """
+        Entries at or below `price` (upward) / at or above it (downward), nearest first.
+        """
+        hit = []
+        bound = self._sign * price
+        while self._heap and self._heap[0][0] <= bound:
+            key, plan_id, kind = heapq.heappop(self._heap)
+            entry = (self._sign * key, plan_id, kind)
+            if self._take(entry):
+                hit.append(entry)
+        return hit
+
+    def _take(self, entry: tuple[float, int, str]) -> bool:
+        n = self._live.get(entry, 0)
+        if not n:
+            return False  # already popped or removed; its heap copy is stale
+        if n == 1:
+            del self._live[entry]
+        else:
+            self._live[entry] = n - 1
+        self._size -= 1
+        return True
+
+
+@dataclass(frozen=True)
+class SetupHitRate:
+    setup: str
+    emitted: int
+    pending: int
+    open: int
+    stopped: int
+    tp1: int  # reached TP1, then stopped or expired before TP2
+    tp2: int
+    expired: int  # never triggered / never resolved in time
+
+    @property
+    def resolved(self) -> int:
+        return self.stopped + self.tp1 + self.tp2
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.tp1 + self.tp2) / self.resolved if self.resolved else 0.0
+
+
+@dataclass
+class _Book:
+    up: LevelIndex = field(default_factory=LevelIndex)  # triggers and targets (long)
+    down: LevelIndex = field(default_factory=lambda: LevelIndex(upward=False))  # stops (long)
+    last_ts: int = -1
+
+
+class PlanTracker:
+    """
+    Forward-tests emitted plans on the candles that follow them (long plans).
+    WATCH plans are pending until a high reaches the entry; a candle that touches
+    both stop and target counts as stopped (conservative).
+    """
+
+    def __init__(self, expire_bars: int = 30) -> None:
+        self.expire_bars = expire_bars
+        self.plans: dict[int, TrackedPlan] = {}
+        self._books: dict[tuple[str, str], _Book] = {}
+        self._by_key: dict[tuple, int] = {}
+        self._expiry: list[tuple[int, int]] = []
+        self._next_id = 1
+
+    # -- building -----------------------------------------------------------------
+
+    def _index(self, p: TrackedPlan) -> None:
+        book = self._books.setdefault((p.symbol, p.timeframe), _Book())
+        if p.state == PENDING:
+            book.up.add(p.entry, p.id, _TRIGGER)
+        elif p.state == OPEN:
+            book.down.add(p.stop, p.id, _STOP)
+            if p.tp1_hit:
+                book.up.add(p.tp2, p.id, _TP2)
+            else:
+                book.up.add(p.tp1, p.id, _TP1)
+
+    def _track(self, p: TrackedPlan) -> None:
+        # once per plan (on add or load); re-indexing on state changes doesn't touch these
+        if p.state not in FINAL:
+            self._by_key[p.key] = p.id
+            heapq.heappush(self._expiry, (p.expires_at, p.id))
+
+    def _unindex(self, p: TrackedPlan) -> None:
+        book = self._books[(p.symbol, p.timeframe)]
+        book.up.remove(p.entry, p.id, _TRIGGER)
+        book.up.remove(p.tp1, p.id, _TP1)
+        book.up.remove(p.tp2, p.id, _TP2)
+        book.down.remove(p.stop, p.id, _STOP)
+
+    def add(self, plan: TradePlan, timeframe: str, emitted_at: int) -> TrackedPlan | None:
+        """
+        Start tracking `plan`. The same plan re-emitted by a later refresh is ignored.
+        """
+        if plan.direction != "long" or not (plan.stop < plan.entry_ref < plan.tp1 <= plan.tp2):
+            return None
+        p = TrackedPlan(
+            id=self._next_id,
+            symbol=plan.symbol,
+            timeframe=timeframe,
+            setup=plan.setup,
+            direction=plan.direction,
+            entry=plan.entry_ref,
+            stop=plan.stop,
+            tp1=plan.tp1,
+            tp2=plan.tp2,
+            emitted_at=emitted_at,
+            expires_at=emitted_at + self.expire_bars * timeframe_ms(timeframe),
+            state=OPEN if plan.status == "READY" else PENDING,
+        )
+        if p.key in self._by_key:
+            return None
+        self._next_id += 1
+        self.plans[p.id] = p
+        self._index(p)
+        self._track(p)
+        return p
+
+    # -- updating -----------------------------------------------------------------
+
+    def _close(self, p: TrackedPlan, state: str, ts: int) -> None:
+        self._unindex(p)
+        p.state, p.closed_at = state, ts
+        self._by_key.pop(p.key, None)
+
+    def update(self, symbol: str, timeframe: str, candles: Iterable[tuple[int, float, float]]) -> int:
+        """
+        Feed closed (open time, high, low) candles in time order; candles already seen
+        are skipped. Returns how many plans changed state.
+        """
+        book = self._books.get((symbol, timeframe))
+        if book is None:
+            return 0
+        changed = 0
+        for ts, high, low in candles:
+            if ts <= book.last_ts:
+                continue
+            book.last_ts = ts
+            fired = book.up.pop_crossed(high) + book.down.pop_crossed(low)
+            by_plan: dict[int, set[str]] = {}
+            for _level, pid, kind in fired:
+                by_plan.setdefault(pid, set()).add(kind)
+
+            for pid, kinds in by_plan.items():
+                p = self.plans[pid]
+                if ts <= p.emitted_at:
+                    self._index_back(p, kinds)  # built on this candle; only later ones count
+                    continue
+                changed += 1
+                if _TRIGGER in kinds:
+                    p.state = OPEN
+                    self._unindex(p)
+                    if low <= p.stop:
+                        self._close(p, STOPPED, ts)
+                    else:
+                        self._index(p)  # stop / target checks start on the next candle
+                elif _STOP in kinds:
+                    self._close(p, TP1 if p.tp1_hit else STOPPED, ts)
+                elif _TP2 in kinds or (_TP1 in kinds and high >= p.tp2):
+                    p.tp1_hit = True
+                    self._close(p, TP2, ts)
+                else:
+                    p.tp1_hit = True
+                    self._unindex(p)
+                    self._index(p)  # now waiting for TP2 or the stop
+        return changed
+
+    def _index_back(self, p: TrackedPlan, kinds: set[str]) -> None:
+        book = self._books[(p.symbol, p.timeframe)]
+        for kind in kinds:
+            level = {_TRIGGER: p.entry, _TP1: p.tp1, _TP2: p.tp2, _STOP: p.stop}[kind]
+            (book.down if kind == _STOP else book.up).add(level, p.id, kind)
+
+    def expire(self, now_ms: int) -> int:
+        n = 0
+        while self._expiry and self._expiry[0][0] <= now_ms:
+            _exp, pid = heapq.heappop(self._expiry)
+            p = self.plans.get(pid)
+            if p is None or p.state in FINAL or p.expires_at > now_ms:
+                continue
+            self._close(p, TP1 if p.tp1_hit else EXPIRED, now_ms)
+            n += 1
+        return n
+
+    # -- reporting / persistence ----------------------------------------------------
+
+    def open_books(self) -> list[tuple[str, str]]:
+        """
+        (symbol, timeframe) pairs that still have pending or open plans.
+        """
+        return sorted({(p.symbol, p.timeframe) for p in self.plans.values() if p.state not in FINAL})
+
+    def hit_rates(self) -> list[SetupHitRate]:
+        counts: dict[str, dict[str, int]] = {}
+        for p in self.plans.values():
+            c = counts.setdefault(p.setup, dict.fromkeys((PENDING, OPEN, *FINAL), 0))
+            c[p.state] += 1
+        return [
+            SetupHitRate(setup, sum(c.values()), c[PENDING], c[OPEN], c[STOPPED], c[TP1], c[TP2], c[EXPIRED])
+            for setup, c in sorted(counts.items())
+        ]
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "expire_bars": self.expire_bars,
+            "next_id": self._next_id,
+            "last_ts": {f"{s}|{tf}": b.last_ts for (s, tf), b in self._books.items()},
+            "plans": [asdict(p) for p in self.plans.values()],
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path, expire_bars: int = 30) -> PlanTracker:
+        path = Path(path)
+        t = cls(expire_bars)
+        if not path.exists():
+            return t
+        data = json.loads(path.read_text(encoding="utf-8"))
+        t._next_id = int(data.get("next_id", 1))
+        for raw in data.get("plans", []):
+            p = TrackedPlan(**raw)
+            t.plans[p.id] = p
+            t._index(p)
+            t._track(p)
+        for key, last_ts in data.get("last_ts", {}).items():
+            sym, _, tf = key.rpartition("|")
+            t._books.setdefault((sym, tf), _Book()).last_ts = int(last_ts)
+        return t
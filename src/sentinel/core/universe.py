@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from sentinel.core.filters import is_leveraged_base, is_stable_base
+
+
+@dataclass(frozen=True)
+class UniverseEntry:
+    symbol: str
+    base: str
+    quote: str
+    type: str  # ccxt market type: spot / swap / future / option / margin
+    active: bool
+    stable: bool  # base is a stablecoin or fiat
+    leveraged: bool  # UP/DOWN/BULL/BEAR token
+    price_precision: float | None = None
+    amount_precision: float | None = None
+    min_amount: float | None = None
+    min_cost: float | None = None
+
+
+def _num(v) -> float | None:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def entry_from_market(symbol: str, market: dict) -> UniverseEntry:
+    base = str(market.get("base") or symbol.split("/", 1)[0]).upper()
+    quote = str(market.get("quote") or symbol.split("/", 1)[-1].split(":", 1)[0]).upper()
+    active = market.get("active", None)
+    precision = market.get("precision") or {}
+    limits = market.get("limits") or {}
+    return UniverseEntry(
+        symbol=symbol,
+        base=base,
+        quote=quote,
+        type=str(market.get("type") or "spot"),
+        # CCXT market often has "active": True/False/None; unknown counts as active
+        active=bool(active) if active is not None else True,
+        stable=is_stable_base(base),
+        leveraged=is_leveraged_base(base),
+        price_precision=_num(precision.get("price")),
+        amount_precision=_num(precision.get("amount")),
+        min_amount=_num((limits.get("amount") or {}).get("min")),
+        min_cost=_num((limits.get("cost") or {}).get("min")),
+    )
+
+
+def markets_fingerprint(exchange_id: str, markets: dict) -> str:
+    """
+    Hash of every field the index stores, so a new tick size or limit on the exchange
+    invalidates the persisted copy too.
+    """
+    h = hashlib.sha1(exchange_id.encode("utf-8"))
+    for sym in sorted(s for s in markets if isinstance(s, str)):
+        e = entry_from_market(sym, markets[sym] or {})
+        h.update(json.dumps(asdict(e), separators=(",", ":")).encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+@dataclass
+class UniverseIndex:
+    """
+    Classified markets of one exchange with set indexes by quote, type and flags.
+    """
+
+    exchange_id: str
+    fingerprint: str
+    entries: dict[str, UniverseEntry]
+    by_quote: dict[str, set[str]] = field(default_factory=dict)
+    by_type: dict[str, set[str]] = field(default_factory=dict)
+    stable: set[str] = field(default_factory=set)
+    leveraged: set[str] = field(default_factory=set)
+    inactive: set[str] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        for sym, e in self.entries.items():
+            self.by_quote.setdefault(e.quote, set()).add(sym)
+            self.by_type.setdefault(e.type, set()).add(sym)
+            if e.stable:
+                self.stable.add(sym)
+            if e.leveraged:
+                self.leveraged.add(sym)
+            if not e.active:
+                self.inactive.add(sym)
+
+    @property
+    def quotes(self) -> list[str]:
+        return sorted(self.by_quote)
+
+    def select(
+        self,
+        quote: str | None = "USDT",
+        market_type: str | None = "spot",
+        exclude_stables: bool = False,
+        exclude_leveraged: bool = True,
+        active_only: bool = True,
+    ) -> list[str]:
+        """
+        Symbols matching every filter, sorted (stable across runs).
+        None for quote / market_type means "any".
+        """
+        syms = set(self.entries) if quote is None else set(self.by_quote.get(quote.upper(), ()))
+        if market_type is not None:
+            syms &= self.by_type.get(market_type, set())
+        if exclude_stables:
+            syms -= self.stable
+        if exclude_leveraged:
+            syms -= self.leveraged
+        if active_only:
+            syms -= self.inactive
+        return sorted(syms)
+
+
+def build_universe(exchange_id: str, markets: dict) -> UniverseIndex:
+    entries = {sym: entry_from_market(sym, m or {}) for sym, m in markets.items() if isinstance(sym, str)}
+    return UniverseIndex(exchange_id, markets_fingerprint(exchange_id, markets), entries)
+
+
+def save_universe(index: UniverseIndex, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "exchange_id": index.exchange_id,
+        "fingerprint": index.fingerprint,
+        "entries": [asdict(e) for e in index.entries.values()],
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def read_universe(path: Path) -> UniverseIndex | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        entries = {e["symbol"]: UniverseEntry(**e) for e in data["entries"]}
+        return UniverseIndex(data["exchange_id"], data["fingerprint"], entries)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+_LOADED: dict[str, UniverseIndex] = {}
+
+# Where indexes persist when the caller doesn't say; "" keeps them in memory only
+UNIVERSE_CACHE_ENV = "SENTINEL_UNIVERSE_CACHE"
+DEFAULT_CACHE_DIR = ".sentinel_cache/universe"
+
+
+def load_universe(exchange_id: str, markets: dict, cache_dir: str | None = None) -> UniverseIndex:
+    """
+    Universe for this markets load: in-process copy, else the on-disk index when its
+    fingerprint still matches, else a fresh build (persisted for the next run).
+    `cache_dir` defaults to $SENTINEL_UNIVERSE_CACHE, else DEFAULT_CACHE_DIR; "" = off.
+    """
+    fp = markets_fingerprint(exchange_id, markets)
+    cached = _LOADED.get(exchange_id)
+    if cached is not None and cached.fingerprint == fp:
+        return cached
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(UNIVERSE_CACHE_ENV, DEFAULT_CACHE_DIR)
+    path = Path(cache_dir) / f"{exchange_id}.json" if cache_dir else None
+    index = read_universe(path) if path is not None and path.exists() else None
+    if index is None or index.fingerprint != fp:
+        index = build_universe(exchange_id, markets)
+        if path is not None:
+            try:
+                save_universe(index, path)
+            except OSError:
+                pass  # a read-only cache dir only costs the rebuild
+    _LOADED[exchange_id] = index
+    return index
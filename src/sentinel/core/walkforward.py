@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+
+from sentinel.core.backtest import (
+    BacktestResult,
+    BacktestStats,
+    Signal,
+    detect_signals,
+    simulate_r_series,
+    summarize,
+)
+from sentinel.core.setups import BreakoutRetestConfig, PullbackConfig
+
+# Parameters searched on each train window. Keys are PullbackConfig / BreakoutRetestConfig fields.
+DEFAULT_GRID: dict[str, list[float]] = {
+    "pullback_tolerance_pct": [1.5, 2.2, 3.0],
+    "retest_tolerance_pct": [0.5, 1.0, 1.5],
+    "breakout_lookback": [30, 40, 60],
+}
+
+_PB_FIELDS = {f.name for f in fields(PullbackConfig)}
+_BR_FIELDS = {f.name for f in fields(BreakoutRetestConfig)}
+
+
+@dataclass(frozen=True)
+class WalkForwardConfig:
+    train_bars: int = 1000
+    test_bars: int = 250
+    step_bars: int | None = None  # None = test_bars (back-to-back test windows)
+    anchored: bool = False  # expanding train window starting at bar 0
+    first_signal_bar: int = 100  # warm-up, as in `detect_signals`
+    min_train_trades: int = 5  # a grid point needs this many train trades to be eligible
+
+
+@dataclass(frozen=True)
+class Fold:
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+@dataclass(frozen=True)
+class FoldResult:
+    fold: Fold
+    params: dict
+    train: BacktestResult
+    test: BacktestResult
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    symbol: str
+    timeframe: str
+    folds: list[FoldResult]
+    aggregate: BacktestResult  # all out-of-sample (test) trades
+    stats: BacktestStats  # mergeable form of `aggregate`
+
+
+def make_folds(n_bars: int, cfg: WalkForwardConfig) -> list[Fold]:
+    step = cfg.step_bars or cfg.test_bars
+    out: list[Fold] = []
+    train_start = 0
+    while True:
+        train_end = train_start + cfg.train_bars
+        test_end = train_end + cfg.test_bars
+        if test_end > n_bars:
+            break
+        out.append(Fold(len(out), 0 if cfg.anchored else train_start, train_end, train_end, test_end))
+        train_start += step
+    return out
+
+
+def split_grid(grid: dict[str, list]) -> tuple[list[dict], list[dict]]:
+    """
+    Expand a grid into (pullback variants, breakout variants).
+    Each side is detected independently, so 3×3×3 combos cost 3 + 9 detection passes.
+    """
+    unknown = set(grid) - _PB_FIELDS - _BR_FIELDS
+    if unknown:
+        raise ValueError(f"unknown grid parameter(s): {', '.join(sorted(unknown))}")
+
+    def expand(keys: list[str]) -> list[dict]:
+        values = [grid[k] for k in keys]
+        return [dict(zip(keys, combo, strict=True)) for combo in itertools.product(*values)]
+
+    # fields both configs share (swing_lookback) are varied on the breakout side only
+    pb_keys = [k for k in grid if k in _PB_FIELDS and k not in _BR_FIELDS]
+    br_keys = [k for k in grid if k in _BR_FIELDS]
+    return expand(pb_keys), expand(br_keys)
+
+
+def parse_grid(text: str) -> dict[str, list]:
+    """
+    "pullback_tolerance_pct=1.5,2.2;breakout_lookback=30,40" → grid dict.
+    Values take the type of the config field's default.
+    """
+    defaults = {**vars(PullbackConfig()), **vars(BreakoutRetestConfig())}
+    grid: dict[str, list] = {}
+    for part in text.split(";"):
+        if not part.strip():
+            continue
+        key, _, values = part.partition("=")
+        key = key.strip()
+        if key not in defaults:
+            raise ValueError(f"unknown grid parameter: {key}")
+        cast = type(defaults[key])
+        grid[key] = [cast(float(v)) for v in values.split(",") if v.strip()]
+    return grid
+
+
+def _detect_variant(task: tuple) -> dict[int, Signal]:
+    """
+    Run one detector with one parameter set over a whole series.
+    Setups at bar i only look at bars <= i, so one pass serves every fold.
+    Returns {bar index: signal}.
+    """
+    symbol, closes, lows, kind, params, start = task
+    if kind == "pb":
+        signals = detect_signals(symbol, closes, lows, pb=replace(PullbackConfig(), **params), start=start, setups=("pullback",))
+    else:
+        signals = detect_signals(symbol, closes, lows, br=replace(BreakoutRetestConfig(), **params), start=start, setups=("breakout_retest",))
+    return {s.index: s for s in signals}
+
+
+def _fold_slice(signal_map: dict[int, Signal], fold: Fold) -> dict[int, Signal]:
+    # a fold task only needs its own bars, not the whole series' signals
+    return {i: s for i, s in signal_map.items() if fold.train_start <= i < fold.test_end}
+
+
+def _window_outcomes(pb_map: dict, br_map: dict, start: int, end: int) -> list[float]:
+    entries: list[float] = []
+    stops: list[float] = []
+    tp1s: list[float] = []
+    for i in range(start, end):
+        sig = pb_map.get(i) or br_map.get(i)  # pullback wins, as in `detect_signals`
+        if sig is None:
+            continue
+        entries.append(sig.entry)
+        stops.append(sig.stop)
+        tp1s.append(sig.tp1)
+    return simulate_r_series(entries, stops, tp1s)
+
+
+def _run_fold(task: tuple) -> tuple[FoldResult, BacktestStats]:
+    symbol, timeframe, fold, pb_variants, br_variants, pb_maps, br_maps, min_trades = task
+
+    best: tuple[float, int, int] | None = None  # (expectancy, pb idx, br idx)
+    for (pi, pb_map), (bi, br_map) in itertools.product(enumerate(pb_maps), enumerate(br_maps)):
+        r = _window_outcomes(pb_map, br_map, fold.train_start, fold.train_end)
+        if len(r) < min_trades:
+            continue
+        score = sum(r) / len(r)
+        if best is None or score > best[0]:
+            best = (score, pi, bi)
+
+    pi, bi = (best[1], best[2]) if best is not None else (0, 0)
+    train_r = _window_outcomes(pb_maps[pi], br_maps[bi], fold.train_start, fold.train_end)
+    test = BacktestStats.from_outcomes(_window_outcomes(pb_maps[pi], br_maps[bi], fold.test_start, fold.test_end))
+    res = FoldResult(
+        fold=fold,
+        params={**pb_variants[pi], **br_variants[bi]},
+        train=summarize(symbol, timeframe, train_r),
+        test=test.result(symbol, timeframe),
+    )
+    # ship the O(1) accumulator back, not the trade list
+    return res, test
+
+
+def walk_forward(
+    series: list[tuple[str, str, list[float], list[float]]],
+    cfg: WalkForwardConfig,
+    grid: dict[str, list] | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[WalkForwardResult]:
+    """
+    Walk-forward over many (symbol, timeframe, closes, lows) series.
+    Detection passes and folds are both fanned out over a process pool.
+    """
+    pb_variants, br_variants = split_grid(DEFAULT_GRID if grid is None else grid)
+    pb_variants = pb_variants or [{}]
+    br_variants = br_variants or [{}]
+
+    own_pool = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        detect_tasks = []
+        for symbol, _tf, closes, lows in series:
+            detect_tasks += [(symbol, closes, lows, "pb", p, cfg.first_signal_bar) for p in pb_variants]
+            detect_tasks += [(symbol, closes, lows, "br", p, cfg.first_signal_bar) for p in br_variants]
+        maps = list(pool.map(_detect_variant, detect_tasks))
+
+        fold_tasks = []
+        per_series = len(pb_variants) + len(br_variants)
+        for k, (symbol, tf, closes, _lows) in enumerate(series):
+            pb_maps = maps[k * per_series : k * per_series + len(pb_variants)]
+            br_maps = maps[k * per_series + len(pb_variants) : (k + 1) * per_series]
+            for fold in make_folds(len(closes), cfg):
+                pb_fold = [_fold_slice(m, fold) for m in pb_maps]
+                br_fold = [_fold_slice(m, fold) for m in br_maps]
+                fold_tasks.append((symbol, tf, fold, pb_variants, br_variants, pb_fold, br_fold, cfg.min_train_trades))
+        fold_out = list(pool.map(_run_fold, fold_tasks))
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    results: list[WalkForwardResult] = []
+    i = 0
+    for symbol, tf, closes, _lows in series:
+        n = len(make_folds(len(closes), cfg))
+        chunk = fold_out[i : i + n]
+        i += n
+        oos = BacktestStats()
+        for _res, st in chunk:
+            oos = oos.merge(st)
+        results.append(WalkForwardResult(symbol, tf, [res for res, _st in chunk], oos.result(symbol, tf), oos))
+    return results
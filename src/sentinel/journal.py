@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sentinel.core.history import parse_date_ms
+from sentinel.core.io import write_json
+from sentinel.core.journal import Journal, JournalError
+from sentinel.core.risk import PositionSizing
+from sentinel.core.setups import TradePlan
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="SENTINEL: trade journal (local, append-only).")
+    p.add_argument("--db", default=".sentinel_cache/journal.sqlite3")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    take = sub.add_parser("take", help="record a plan you entered")
+    take.add_argument("--from-scan", default=None, help="scan JSON (--format json) holding the plan")
+    take.add_argument("--symbol", required=True)
+    take.add_argument("--fill", type=float, default=None, help="actual fill (default: plan entry)")
+    take.add_argument("--note", default="")
+    # manual plan, when not taken from a scan file
+    take.add_argument("--setup", default=None)
+    take.add_argument("--entry", type=float, default=None)
+    take.add_argument("--stop", type=float, default=None)
+    take.add_argument("--tp1", type=float, default=None)
+    take.add_argument("--tp2", type=float, default=None)
+    take.add_argument("--regime", default="")
+    take.add_argument("--timeframe", default="")
+
+    close = sub.add_parser("close", help="record the exit of an entry")
+    close.add_argument("id", type=int)
+    close.add_argument("--exit", type=float, required=True)
+    close.add_argument("--note", default="")
+
+    ls = sub.add_parser("list", help="recent entries")
+    ls.add_argument("--symbol", default=None)
+    ls.add_argument("--setup", default=None)
+    ls.add_argument("--since", default=None, help="ISO date (UTC)")
+    ls.add_argument("--open", action="store_true", help="only entries without a result")
+    ls.add_argument("--limit", type=int, default=30)
+
+    stats = sub.add_parser("stats", help="expectancy and drawdown by setup")
+    stats.add_argument("--format", choices=["text", "json"], default="text")
+    stats.add_argument("--out", default=None)
+    return p.parse_args()
+
+
+def _plan_from_scan(path: str, symbol: str) -> tuple[TradePlan, PositionSizing | None, str, str, str]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    for row in payload.get("rows", []):
+        if row.get("symbol") == symbol:
+            if not row.get("plan"):
+                raise JournalError(f"{symbol} has no A+ plan in {path}")
+            sizing = PositionSizing(**row["sizing"]) if row.get("sizing") else None
+            return TradePlan(**row["plan"]), sizing, row.get("regime", ""), payload.get("exchange", ""), payload.get("timeframe", "")
+    raise JournalError(f"{symbol} not found in {path}")
+
+
+def _manual_plan(args: argparse.Namespace) -> TradePlan:
+    if args.entry is None or args.stop is None:
+        raise JournalError("--entry and --stop are required without --from-scan")
+    risk = args.entry - args.stop
+    return TradePlan(
+        symbol=args.symbol,
+        direction="long",
+        setup=(args.setup or "MANUAL").upper(),
+        status="READY",
+        entry_ref=args.entry,
+        entry_trigger="manual",
+        stop=args.stop,
+        tp1=args.tp1 if args.tp1 is not None else args.entry + risk,
+        tp2=args.tp2 if args.tp2 is not None else args.entry + 2 * risk,
+        notes="",
+    )
+
+
+def _fmt_ms(ms: int | None) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=UTC).strftime("%Y-%m-%d %H:%M") if ms else "-"
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        with Journal(args.db) as j:
+            if args.command == "take":
+                if args.from_scan:
+                    plan, sizing, regime, exchange, tf = _plan_from_scan(args.from_scan, args.symbol)
+                else:
+                    plan, sizing, regime, exchange, tf = _manual_plan(args), None, args.regime, "", args.timeframe
+                entry_id = j.record_entry(plan, sizing, regime, args.fill, exchange, tf, note=args.note)
+                print(f"#{entry_id} {plan.symbol} {plan.setup} fill={args.fill or plan.entry_ref:.6f} stop={plan.stop:.6f}")
+
+            elif args.command == "close":
+                r = j.record_result(args.id, args.exit, note=args.note)
+                print(f"#{args.id} closed at {args.exit:.6f}: {r:+.2f}R")
+
+            elif args.command == "list":
+                since = parse_date_ms(args.since) if args.since else None
+                rows = j.entries(symbol=args.symbol, setup=args.setup, since_ms=since, open_only=args.open, limit=args.limit)
+                for e in rows:
+                    res = f"{e.r:+.2f}R @ {e.exit_price:.6f}" if e.r is not None else "open"
+                    print(f"#{e.id:<5} {_fmt_ms(e.opened_at)}  {e.symbol.ljust(14)} {e.setup.ljust(16)} {e.regime.ljust(6)} {res}")
+
+            else:
+                stats = j.setup_stats()
+                if args.format == "json":
+                    if args.out:
+                        write_json(args.out, {"setups": stats})
+                    else:
+                        print({"setups": stats})
+                    return 0
+                print("SETUP".ljust(18) + "TRADES".rjust(8) + "WIN%".rjust(8) + "EXP_R".rjust(9) + "PF".rjust(8) + "MDD_R".rjust(9))
+                for s in stats:
+                    win = s.wins / s.trades * 100 if s.trades else 0.0
+                    print(f"{s.setup.ljust(18)}{s.trades:8d}{win:8.1f}{s.expectancy_r:9.3f}{s.profit_factor:8.2f}{s.max_drawdown_r:9.2f}")
+    except JournalError as e:
+        print(f"journal: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
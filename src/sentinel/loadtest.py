@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+import sentinel
+from sentinel.core.io import write_json, write_text
+from sentinel.core.stub import STUB_CONFIG_ENV, StubConfig, stub_config_env
+from sentinel.ui.presets import PRESETS
+from sentinel.ui.service import COLD_CACHE_ENV
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="SENTINEL: load-test the web server against an offline stub exchange.")
+    p.add_argument("--clients", type=int, default=20, help="concurrent auto-refreshing dashboards")
+    p.add_argument("--duration", type=float, default=30.0, help="seconds")
+    p.add_argument("--presets", default=",".join(PRESETS), help="comma-separated, assigned round-robin")
+    p.add_argument("--refresh", type=float, default=2.0, help="seconds between one client's polls (±20%%)")
+    p.add_argument("--cold", action="store_true", help="drop the analysis cache before every scan")
+
+    p.add_argument("--symbols", type=int, default=80, help="markets on the stub exchange")
+    p.add_argument("--latency-ms", type=float, default=50.0, help="stub latency per exchange request")
+    p.add_argument("--jitter-ms", type=float, default=20.0)
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub requests failing")
+    p.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of stub requests answered 429")
+
+    p.add_argument("--port", type=int, default=0, help="0 = any free port")
+    p.add_argument("--format", choices=["text", "json"], default="text")
+    p.add_argument("--out", default=None)
+    return p.parse_args()
+
+
+@dataclass
+class Sample:
+    preset: str
+    started: float  # seconds since the run began
+    latency_s: float
+    status: int  # HTTP status; 0 = no response
+    skipped: int = 0  # symbols the scan dropped (exchange errors absorbed server-side)
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    name: str
+    requests: int
+    errors: int
+    error_rate: float
+    throughput_rps: float  # successful responses per second
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    skipped_per_scan: float
+
+
+def summarize(name: str, samples: list[Sample], elapsed_s: float) -> LatencySummary:
+    ok = [s for s in samples if s.status in (200, 304)]
+    lat = np.array([s.latency_s * 1000.0 for s in samples]) if samples else np.zeros(1)
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    return LatencySummary(
+        name=name,
+        requests=len(samples),
+        errors=len(samples) - len(ok),
+        error_rate=(len(samples) - len(ok)) / len(samples) if samples else 0.0,
+        throughput_rps=len(ok) / elapsed_s if elapsed_s > 0 else 0.0,
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        max_ms=float(lat.max()),
+        skipped_per_scan=sum(s.skipped for s in ok) / len(ok) if ok else 0.0,
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(stub: StubConfig, port: int = 0, cold: bool = False) -> tuple[subprocess.Popen, str]:
+    """
+    Run `sentinel.webapp` under uvicorn in a child process, so the server doesn't share
+    a GIL with the client threads measuring it; returns once it answers. The stub
+    settings and `cold` (drop the analysis cache before every scan) reach it through
+    the environment. Stop it with `stop_server`.
+    """
+    port = port or _free_port()
+    env = {**os.environ, STUB_CONFIG_ENV: stub_config_env(stub)}
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(Path(sentinel.__file__).parents[1]), env.get("PYTHONPATH")) if p)
+    if cold:
+        env[COLD_CACHE_ENV] = "1"
+    else:
+        env.pop(COLD_CACHE_ENV, None)
+    cmd = [sys.executable, "-m", "uvicorn", "sentinel.webapp:app", "--host", "127.0.0.1", "--port", str(port)]
+    proc = subprocess.Popen([*cmd, "--log-level", "warning", "--no-access-log"], env=env)
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30.0
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"web server exited with status {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/api/presets", timeout=1.0).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            stop_server(proc)
+            raise RuntimeError("web server failed to start")
+        time.sleep(0.05)
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10.0)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def run_client(
+    base_url: str,
+    preset: str,
+    stop_at: float,
+    t0: float,
+    refresh_s: float,
+    out: list[Sample],
+    lock: threading.Lock,
+) -> None:
+    """
+    One dashboard: the first scan is interactive, later ones are background refreshes
+    that ask for a delta against the version already held, like `app.js` does.
+    """
+    version: int | None = None
+    etag: str | None = None
+    rng = random.Random()
+    with httpx.Client(base_url=base_url, timeout=120.0) as client:
+        while time.monotonic() < stop_at:
+            body: dict = {"preset": preset, "exchange": "stub", "background": version is not None}
+            if version is not None:
+                body["since_version"] = version
+            started = time.monotonic()
+            sample = Sample(preset, started - t0, 0.0, 0)
+            try:
+                resp = client.post("/api/scan", json=body, headers={"if-none-match": etag} if etag else {})
+                sample.status = resp.status_code
+                if resp.status_code == 200:
+                    data = resp.json()
+                    version, etag = data.get("version"), resp.headers.get("etag")
+                    sample.skipped = len(data.get("skipped") or [])
+                elif resp.status_code != 304:
+                    sample.error = f"HTTP {resp.status_code}"
+            except httpx.HTTPError as e:
+                sample.error = type(e).__name__
+            sample.latency_s = time.monotonic() - started
+            with lock:
+                out.append(sample)
+            time.sleep(max(0.0, min(refresh_s * rng.uniform(0.8, 1.2), stop_at - time.monotonic())))
+
+
+def run_load(
+    base_url: str,
+    clients: int,
+    presets: list[str],
+    duration_s: float,
+    refresh_s: float,
+) -> tuple[list[Sample], float]:
+    samples: list[Sample] = []
+    lock = threading.Lock()
+    t0 = time.monotonic()
+    stop_at = t0 + duration_s
+    threads = []
+    for i in range(clients):
+        preset = presets[i % len(presets)]
+        th = threading.Thread(
+            target=run_client,
+            args=(base_url, preset, stop_at, t0, refresh_s, samples, lock),
+            name=f"loadtest-client-{i}",
+            daemon=True,
+        )
+        threads.append(th)
+        th.start()
+        time.sleep(min(refresh_s / max(clients, 1), 0.2))  # stagger, as dashboards opened at different times
+    for th in threads:
+        th.join()
+    return samples, time.monotonic() - t0
+
+
+def format_summary(rows: list[LatencySummary]) -> list[str]:
+    lines = [
+        f"{'PRESET':<12}{'REQS':>7}{'ERR%':>7}{'RPS':>8}{'P50 ms':>9}{'P95 ms':>9}{'P99 ms':>9}{'MAX ms':>9}{'SKIP':>6}",
+        "-" * 76,
+    ]
+    for r in rows:
+        lines.append(
+            f"{r.name:<12}{r.requests:>7}{r.error_rate * 100:>7.1f}{r.throughput_rps:>8.2f}"
+            f"{r.p50_ms:>9.0f}{r.p95_ms:>9.0f}{r.p99_ms:>9.0f}{r.max_ms:>9.0f}{r.skipped_per_scan:>6.1f}"
+        )
+    return lines
+
+
+def main() -> int:
+    args = parse_args()
+    presets = [p.strip() for p in args.presets.split(",") if p.strip()]
+    unknown = [p for p in presets if p not in PRESETS]
+    if unknown or not presets:
+        print(f"Unknown preset(s): {', '.join(unknown) or '(none given)'}; choose from {', '.join(PRESETS)}")
+        return 2
+
+    stub = StubConfig(
+        symbols=args.symbols,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    server, url = start_server(stub, args.port, cold=args.cold)
+    try:
+        samples, elapsed = run_load(url, args.clients, presets, args.duration, args.refresh)
+    finally:
+        stop_server(server)
+
+    rows = [summarize(p, [s for s in samples if s.preset == p], elapsed) for p in presets]
+    rows.append(summarize("ALL", samples, elapsed))
+    errors: dict[str, int] = {}
+    for s in samples:
+        if s.error:
+            errors[s.error] = errors.get(s.error, 0) + 1
+
+    if args.format == "json":
+        payload = {
+            "clients": args.clients,
+            "duration_s": elapsed,
+            "cold": args.cold,
+            "stub": asdict(stub),
+            "summary": [asdict(r) for r in rows],
+            "errors": errors,
+        }
+        if args.out:
+            write_json(args.out, payload)
+        else:
+            print(payload)
+        return 0
+
+    lines = [
+        f"Load test: {args.clients} clients × {elapsed:.0f}s against {url} "
+        f"(stub: {args.symbols} symbols, {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+        f"errors {args.error_rate * 100:.1f}%, 429s {args.rate_limit_rate * 100:.1f}%{', cold cache' if args.cold else ''})",
+        "",
+        *format_summary(rows),
+    ]
+    if errors:
+        lines += ["", "ERRORS:"] + [f"  {k}: {v}" for k, v in sorted(errors.items(), key=lambda kv: -kv[1])]
+    text = "\n".join(lines) + "\n"
+    if args.out:
+        write_text(args.out, text)
+    else:
+        print(text, end="")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,6 +10,19 @@ def main() -> int:
     print("  python -m sentinel.scan --exclude-stables --quality --regime --setups --brief --timeframe 4h")
     print("  python -m sentinel.scan --format json --out reports/scan.json --exclude-stables --quality --regime --setups")
     print("  python -m sentinel.backtest --pairs BTC/USDT,ETH/USDT --timeframes 1h,4h --bars 800")
+    print("  python -m sentinel.backtest --pairs BTC/USDT --timeframes 1h --since 2022-01-01")
+    print("  python -m sentinel.backtest --universe top:200 --timeframes 4h --workers 8")
+    print("  python -m sentinel.archive import --symbol BTC/USDT --timeframe 1m BTCUSDT-1m-2024-*.zip")
+    print("  python -m sentinel.backtest --pairs BTC/USDT --timeframes 4h --since 2020-01-01 --archive-dir .sentinel_cache/archive")
+    print("  python -m sentinel.backtest --pairs BTC/USDT --timeframes 4h --archive-dir .sentinel_cache/archive --result-cache-mb 256")
+    print("  python -m sentinel.journal take --from-scan reports/scan.json --symbol SOL/USDT --fill 142.3")
+    print("  python -m sentinel.scan --quality --regime --setups --track --timeframe 4h")
+    print("  python -m sentinel.scan --quality --regime --setups --max-spread 0.1 --min-depth 5000")
+    print("  python -m sentinel.scan --quality --regime --setups --where \"atr_pct between 1 and 4 and trend_strength > 0.01\" --sort \"quote_volume desc\"")
+    print("  python -m sentinel.scan --quality --regime --setups --profile reports/scan.folded")
+    print("  curl -s -H \"x-debug-token: $SENTINEL_DEBUG_TOKEN\" 'http://127.0.0.1:8787/debug/profile?seconds=30' > web.folded")
+    print("  python -m sentinel.web --workers 4")
+    print("  python -m sentinel.loadtest --clients 50 --duration 60 --latency-ms 80 --error-rate 0.02")
     return 0
 
 
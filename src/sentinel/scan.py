@@ -1,62 +1,58 @@
 from __future__ import annotations
 
 import argparse
+import time
+from dataclasses import asdict, replace
 
+from sentinel.core import filters
 from sentinel.core.config import load_config
+from sentinel.core.correlation import (
+    ClusterMark,
+    aligned_log_returns,
+    cluster_note,
+    correlation_matrix,
+    mark_correlated,
+)
 from sentinel.core.exchange import (
     ExchangeConfig,
     ExchangeError,
     create_exchange,
-    iter_usdt_symbols,
+    fetch_tickers_safe,
     load_markets_safe,
 )
-from sentinel.core.filters import (
-    PairFilterConfig,
-    passes_market_filters,
-    quote_volume_usdt_from_ticker,
-)
-from sentinel.core.indicators import atr_pct, trend_strength
+from sentinel.core.features import Features, features_from_ohlcv
+from sentinel.core.filters import rank_by_quote_volume
+from sentinel.core.history import timeframe_ms
 from sentinel.core.io import write_json, write_text
-from sentinel.core.mathutils import ema
-from sentinel.core.ohlcv import OHLCVConfig, fetch_ohlcv_safe, split_ohlcv
+from sentinel.core.liquidity import LiquidityConfig, Quote, select_liquid
+from sentinel.core.ohlcv import FetchPolicy, OHLCVConfig, fetch_ohlcv_safe
+from sentinel.core.profiler import profile_to
 from sentinel.core.regime import MarketRegime, classify_regime
-from sentinel.core.report import ReportRow, build_briefing_text
+from sentinel.core.report import SymbolResult, build_briefing_text
 from sentinel.core.risk import RiskConfig, compute_position_sizing
+from sentinel.core.screen import ScreenError, compile_screen, screen_table
 from sentinel.core.setups import (
     BreakoutRetestConfig,
+    DetectorRegistry,
     PullbackConfig,
     TradePlan,
-    detect_breakout_retest_long,
-    detect_pullback_long,
+    default_detectors,
 )
-
-_STABLE_BASES = {
-    "USDT",
-    "USDC",
-    "FDUSD",
-    "TUSD",
-    "USDP",
-    "BUSD",
-    "DAI",
-    "USD1",
-    "USDE",
-    "EUR",
-    "EURC",
-}
-
-
-def is_stablecoin_pair(symbol: str) -> bool:
-    base = symbol.split("/", 1)[0].upper().strip()
-    return base in _STABLE_BASES
+from sentinel.core.tracker import PlanTracker, SetupHitRate
+from sentinel.core.universe import load_universe
 
 
 def parse_args() -> argparse.Namespace:
-    p = argparse.ArgumentParser(description="SENTINEL: scan USDT pairs (read-only).")
+    p = argparse.ArgumentParser(description="SENTINEL: scan pairs (USDT by default; read-only).")
     p.add_argument("--exchange", default="binance")
+    p.add_argument("--quote", default="USDT", help="quote asset: USDT, USDC, FDUSD, BTC…")
+    p.add_argument("--market-type", default="spot", help="spot, swap, future… or 'any'")
     p.add_argument("--limit", type=int, default=30)
 
     p.add_argument("--quality", action="store_true")
     p.add_argument("--min-qv", type=float, default=None)
+    p.add_argument("--max-spread", type=float, default=None, help="drop pairs with a wider bid/ask spread (%%)")
+    p.add_argument("--min-depth", type=float, default=None, help="drop pairs with less top-of-book depth (quote units)")
 
     p.add_argument("--regime", action="store_true")
     p.add_argument("--timeframe", default="4h")
@@ -65,83 +61,199 @@ def parse_args() -> argparse.Namespace:
 
     p.add_argument("--setups", action="store_true")
     p.add_argument("--exclude-stables", action="store_true")
+    p.add_argument(
+        "--where",
+        default=None,
+        help="screen on the scanned features, e.g. \"atr_pct between 1 and 4 and trend_strength > 0.01 order by quote_volume desc\"",
+    )
+    p.add_argument("--sort", default=None, help='e.g. "quote_volume desc, atr_pct" (same as an `order by` in --where)')
     p.add_argument("--brief", action="store_true")
 
+    p.add_argument("--retries", type=int, default=2, help="retries per symbol on network errors")
+    p.add_argument("--hedge", action="store_true", help="duplicate slow candle requests past the observed p95")
+
+    p.add_argument("--corr-window", type=int, default=100, help="bars of returns for setup correlation")
+    p.add_argument("--corr-threshold", type=float, default=0.85, help="ρ at which two setups count as one bet")
+    p.add_argument("--max-per-cluster", type=int, default=None, help="keep only the N best A+ setups per cluster")
+
+    p.add_argument("--track", action="store_true", help="forward-track emitted plans and report hit rates")
+    p.add_argument("--track-file", default=".sentinel_cache/tracker.json")
+    p.add_argument("--track-expire-bars", type=int, default=30, help="drop unresolved plans after this many bars")
+
     p.add_argument("--format", choices=["text", "json"], default="text")
     p.add_argument("--out", default=None, help="write output to file (txt or json based on --format)")
     p.add_argument("--config", default="sentinel.toml")
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="sample stacks into FILE (collapsed, flamegraph-ready; default reports/profile-*.folded)",
+    )
 
     return p.parse_args()
 
 
-def rank_quality_pairs(ex, markets: dict, pairs: list[str], min_qv: float) -> list[str]:
-    cfg = PairFilterConfig(min_quote_volume_usdt=min_qv)
-
-    try:
-        tickers = ex.fetch_tickers()
-    except Exception:
-        tickers = {}
+def rank_quality_pairs(ex, markets: dict, pairs: list[str], min_qv: float, tickers: dict | None = None) -> list[str]:
+    if tickers is None:
+        tickers = fetch_tickers_safe(ex)
+    return filters.rank_quality_pairs(markets, pairs, min_qv, tickers)
 
-    scored: list[tuple[str, float]] = []
-    for sym in pairs:
-        market = markets.get(sym, {})
-        if not passes_market_filters(sym, market, cfg):
-            continue
-        qv = quote_volume_usdt_from_ticker(tickers.get(sym, {})) or 0.0
-        scored.append((sym, qv))
 
-    scored.sort(key=lambda x: x[1], reverse=True)
-    above = [s for (s, qv) in scored if qv >= min_qv]
-    return above if above else [s for (s, _qv) in scored]
+def compute_features_for_symbol(
+    ex, symbol: str, timeframe: str, bars: int, rank: int = 0, policy: FetchPolicy | None = None
+) -> Features:
+    ohlcv = fetch_ohlcv_safe(ex, symbol, OHLCVConfig(timeframe=timeframe, limit=bars), rank=rank, policy=policy)
+    return features_from_ohlcv(symbol, ohlcv)
 
 
-def compute_regime_for_symbol(ex, symbol: str, timeframe: str, bars: int) -> tuple[MarketRegime, float, float]:
-    ohlcv = fetch_ohlcv_safe(ex, symbol, OHLCVConfig(timeframe=timeframe, limit=bars))
-    highs, lows, closes = split_ohlcv(ohlcv)
-    if not closes:
+def regime_from_features(f: Features) -> tuple[MarketRegime, float, float]:
+    if not f.closes:
         return MarketRegime.RANGE, 0.0, 0.0
-
-    a = atr_pct(highs, lows, closes)
-    price = closes[-1]
-    ema_fast = ema(closes, 20)
-    ema_slow = ema(closes, 50)
-
-    ts = trend_strength(ema_fast, ema_slow, price)
-    if ts < 0.0005:
-        ts = 0.0
-
+    a = f.atr_pct()
+    ts = f.trend_strength()
     return classify_regime(a, ts), a, ts
 
 
-def compute_setup_for_symbol(ex, symbol: str, timeframe: str, bars: int, cfg_pb: PullbackConfig, cfg_br: BreakoutRetestConfig) -> TradePlan | None:
-    ohlcv = fetch_ohlcv_safe(ex, symbol, OHLCVConfig(timeframe=timeframe, limit=bars))
-    highs, lows, closes = split_ohlcv(ohlcv)
-    if not closes:
+def compute_regime_for_symbol(
+    ex, symbol: str, timeframe: str, bars: int, rank: int = 0, policy: FetchPolicy | None = None
+) -> tuple[MarketRegime, float, float]:
+    return regime_from_features(compute_features_for_symbol(ex, symbol, timeframe, bars, rank=rank, policy=policy))
+
+
+def compute_setup_for_symbol(
+    ex,
+    symbol: str,
+    timeframe: str,
+    bars: int,
+    cfg_pb: PullbackConfig,
+    cfg_br: BreakoutRetestConfig,
+    rank: int = 0,
+    policy: FetchPolicy | None = None,
+    detectors: DetectorRegistry | None = None,
+) -> TradePlan | None:
+    f = compute_features_for_symbol(ex, symbol, timeframe, bars, rank=rank, policy=policy)
+    if not f.closes:
         return None
-
-    plan = detect_pullback_long(closes, lows, symbol, cfg_pb)
-    if plan is not None:
-        return plan
-    return detect_breakout_retest_long(closes, lows, symbol, cfg_br)
+    return (detectors or default_detectors(cfg_pb, cfg_br)).detect(f)
+
+
+def _closed_candles(f: Features, tf_ms: int, now_ms: int) -> list[tuple[int, float, float]]:
+    return [(t, h, lo) for t, h, lo in zip(f.ts, f.highs, f.lows, strict=True) if t + tf_ms <= now_ms]
+
+
+def update_tracker(
+    ex,
+    tracker: PlanTracker,
+    timeframe: str,
+    bars: int,
+    emitted: list[tuple[TradePlan, int]],
+    seen: dict[str, Features],
+    policy: FetchPolicy | None = None,
+) -> int:
+    """
+    Add this run's plans, then advance every open plan on its closed candles.
+    Symbols scanned this run reuse their candles; other open books are fetched.
+    Returns how many plans changed state.
+    """
+    for plan, emitted_at in emitted:
+        tracker.add(plan, timeframe, emitted_at)
+
+    now_ms = int(time.time() * 1000)
+    changed = 0
+    for sym, tf in tracker.open_books():
+        f = seen.get(sym) if tf == timeframe else None
+        if f is None:
+            try:
+                f = compute_features_for_symbol(ex, sym, tf, bars, rank=len(seen), policy=policy)
+            except ExchangeError:
+                continue  # try again next run
+        changed += tracker.update(sym, tf, _closed_candles(f, timeframe_ms(tf), now_ms))
+    tracker.expire(now_ms)
+    return changed
+
+
+def apply_correlation(
+    seen: dict[str, Features],
+    results: list[SymbolResult],
+    window: int,
+    threshold: float,
+    max_per_cluster: int | None,
+) -> dict[str, ClusterMark]:
+    """
+    Cluster the scanned symbols by return correlation and mark A+ setups that are the
+    same bet as a better-ranked one; past `max_per_cluster` they are demoted.
+    `results` is updated in place.
+    """
+    candidates = [r.symbol for r in results if r.plan is not None]
+    if len(candidates) < 2:
+        return {}
+    symbols, _axis, rets = aligned_log_returns({s: (f.ts, f.closes) for s, f in seen.items()}, window + 1)
+    marks = mark_correlated(symbols, correlation_matrix(rets), candidates, threshold)
+
+    for i, r in enumerate(results):
+        m = marks.get(r.symbol)
+        if m is None:
+            continue
+        if m.rank == 0:
+            results[i] = replace(r, cluster=m.cluster)
+            continue
+        limited = max_per_cluster is not None and m.rank >= max_per_cluster
+        action = "trade-allowed" if limited else r.action
+        note = cluster_note(m, True) if limited else f"{r.note} | {cluster_note(m, False)}"
+        results[i] = replace(r, action=action, note=note, cluster=m.cluster, correlated_with=m.leader)
+    return marks
+
+
+def format_hit_rates(rates: list[SetupHitRate]) -> list[str]:
+    lines = ["TRACKER (forward results of emitted plans)"]
+    for h in rates:
+        lines.append(
+            f"  {h.setup.ljust(16)} emitted={h.emitted} open={h.open + h.pending} "
+            f"stop={h.stopped} tp1={h.tp1} tp2={h.tp2} expired={h.expired} | hit rate {h.hit_rate * 100:.0f}%"
+        )
+    return lines
 
 
-def main() -> int:
-    args = parse_args()
+def run(args: argparse.Namespace) -> int:
     cfg = load_config(args.config)
+    screen = None
+    if args.where or args.sort:
+        if not args.regime:
+            print("--where/--sort screen the regime features: add --regime")
+            return 2
+        try:
+            screen = compile_screen(args.where, args.sort)
+        except ScreenError as e:
+            print(f"bad --where/--sort: {e}")
+            return 2
 
     ex = create_exchange(ExchangeConfig(exchange_id=args.exchange))
     markets = load_markets_safe(ex)
-    pairs = list(iter_usdt_symbols(markets))
-
-    if args.exclude_stables:
-        pairs = [p for p in pairs if not is_stablecoin_pair(p)]
+    universe = load_universe(ex.id, markets)
+    pairs = universe.select(
+        quote=args.quote,
+        market_type=None if args.market_type == "any" else args.market_type,
+        exclude_stables=args.exclude_stables,
+        # the quality filter's market checks, as set lookups
+        exclude_leveraged=args.quality,
+        active_only=args.quality,
+    )
 
+    tickers: dict = {}
     if args.quality:
+        tickers = fetch_tickers_safe(ex)
         min_qv = cfg.min_quote_volume_usdt if args.min_qv is None else args.min_qv
-        pairs = rank_quality_pairs(ex, markets, pairs, float(min_qv))
+        pairs = rank_quality_pairs(ex, markets, pairs, float(min_qv), tickers)
+    elif args.regime and (len(pairs) > args.max_pairs or screen is not None):
+        # the bulk tickers call weighs ~40 requests: only worth it when ranking decides
+        # which pairs make the --max-pairs cut, or the screen needs volume/change columns
+        tickers = fetch_tickers_safe(ex)
+        pairs = rank_by_quote_volume(pairs, tickers)
 
     if not args.regime:
-        out_lines = [f"Exchange: {ex.id}", f"USDT pairs found: {len(pairs)}", "-" * 40]
+        out_lines = [f"Exchange: {ex.id}", f"{args.quote.upper()} pairs found: {len(pairs)}", "-" * 40]
         out_lines += sorted(pairs)[: max(args.limit, 0)]
         text = "\n".join(out_lines) + "\n"
         if args.format == "json":
@@ -166,86 +278,140 @@ def main() -> int:
         retest_lookback=cfg.retest_lookback,
         retest_tolerance_pct=cfg.retest_tolerance_pct,
     )
+    detectors = default_detectors(pb, br)
     risk_cfg = RiskConfig(risk_usdt=cfg.risk_usdt, fee_buffer_pct=cfg.fee_buffer_pct)
+    policy = FetchPolicy(retries=max(args.retries, 0), hedge=args.hedge)
 
+    liq = LiquidityConfig(
+        max_spread_pct=cfg.max_spread_pct if args.max_spread is None else args.max_spread,
+        min_top_depth=cfg.min_top_depth_usdt if args.min_depth is None else args.min_depth,
+    )
+    quotes: dict[str, Quote] = {}
+    illiquid: list[dict] = []
+    if liq.enabled:
+        # spreads for the whole universe in one bulk call, before any candle is fetched
+        pairs, quotes, illiquid = select_liquid(ex, pairs, liq, limit=max(args.max_pairs, 0), tickers=tickers)
     pairs = pairs[: max(args.max_pairs, 0)]
 
-    rows: list[ReportRow] = []
-    table: list[dict] = []
-
-    lines: list[str] = []
-    lines.append(f"Exchange: {ex.id}")
-    lines.append(f"USDT pairs found: {len(pairs)}")
-    lines.append(f"Regime analysis on: {len(pairs)} pairs | tf={args.timeframe} bars={args.bars}")
-    lines.append("-" * 70)
-    lines.append("SYMBOL".ljust(16) + " " + "REGIME".ljust(8) + " " + "ATR%".rjust(7) + " " + "TREND".rjust(7) + "  ACTION")
-    lines.append("-" * 70)
+    results: list[SymbolResult] = []
+    skipped: list[dict] = []
+    seen: dict[str, Features] = {}
 
     shown = 0
-    for sym in pairs:
+    for rank, sym in enumerate(pairs):
+        # one fetch per symbol; regime and every detector share the same features
         try:
-            r, a, ts = compute_regime_for_symbol(ex, sym, args.timeframe, args.bars)
-        except ExchangeError:
+            f = compute_features_for_symbol(ex, sym, args.timeframe, args.bars, rank=rank, policy=policy)
+        except ExchangeError as e:
+            skipped.append({"symbol": sym, "reason": str(e)})
             continue
+        r, a, ts = regime_from_features(f)
+        seen[sym] = f
 
         plan: TradePlan | None = None
-        if args.setups and r == MarketRegime.TREND:
-            plan = compute_setup_for_symbol(ex, sym, args.timeframe, args.bars, pb, br)
+        if args.setups and r == MarketRegime.TREND and f.closes:
+            try:
+                plan = detectors.detect(f)
+            except (ValueError, IndexError, ArithmeticError) as e:  # degenerate candles; bugs still raise
+                skipped.append({"symbol": sym, "reason": f"setup check: {e}"})
 
         if plan is not None:
             action = f"A+ {plan.setup} {plan.status}"
         else:
             action = "trade-allowed" if r == MarketRegime.TREND else ("limited" if r == MarketRegime.RANGE else "NO TRADE")
 
-        lines.append(f"{sym.ljust(16)} {r.value.ljust(8)} {a:7.2f} {ts:7.3f}  {action}")
-
-        note = ""
-        size_payload = None
+        spread = quotes[sym].spread_pct if sym in quotes else None
+        sizing = None
         if plan is not None:
-            sizing = compute_position_sizing(entry=plan.entry_ref, stop=plan.stop, cfg=risk_cfg)
+            sizing = compute_position_sizing(entry=plan.entry_ref, stop=plan.stop, cfg=risk_cfg, spread_pct=spread or 0.0)
             if sizing is not None:
                 note = f"{plan.status}: risk {sizing.risk_usdt:.2f}, notional≈{sizing.notional_usdt:.0f}"
-                size_payload = sizing
-                lines.append(f"  ↳ ENTRY≈{plan.entry_ref:.6f} SL={plan.stop:.6f} TP1={plan.tp1:.6f} TP2={plan.tp2:.6f}")
-                lines.append(f"     SIZE≈{sizing.size_units:.6f} units | NOTIONAL≈{sizing.notional_usdt:.2f} | STOP={sizing.stop_distance_pct:.2f}%")
-                lines.append(f"     TRIGGER: {plan.entry_trigger}")
             else:
                 note = f"{plan.status}: sizing unavailable"
         else:
             note = "Wait A+ (trend only)" if r == MarketRegime.TREND else ("Avoid chop" if r == MarketRegime.RANGE else "Protect capital")
 
-        rows.append(ReportRow(symbol=sym, regime=r.value, action=action, note=note))
-        table.append(
-            {
-                "symbol": sym,
-                "regime": r.value,
-                "atr_pct": a,
-                "trend_strength": ts,
-                "action": action,
-                "plan": plan,
-                "sizing": size_payload,
-            }
-        )
+        results.append(SymbolResult(sym, r.value, a, ts, action, note, plan, sizing, spread))
 
         shown += 1
-        if shown >= max(args.limit, 0):
+        if screen is None and shown >= max(args.limit, 0):
             break
 
-    briefing_text = build_briefing_text(rows) if args.brief else ""
+    screened = matched = len(results)
+    if screen is not None:
+        # every fetched symbol is a candidate; the limit applies to what passes
+        keep = screen.apply(screen_table(results, {s: f.price for s, f in seen.items()}, tickers, quotes))
+        matched = len(keep)
+        results = [results[i] for i in keep][: max(args.limit, 0)]
+
+    emitted = [(r.plan, seen[r.symbol].ts[-1]) for r in results if r.plan is not None and seen[r.symbol].ts]
+
+    marks: dict[str, ClusterMark] = {}
+    if args.setups:
+        marks = apply_correlation(seen, results, args.corr_window, args.corr_threshold, args.max_per_cluster)
+
+    briefing_text = build_briefing_text(results) if args.brief else ""
+
+    rates: list[SetupHitRate] = []
+    if args.track:
+        tracker = PlanTracker.load(args.track_file, expire_bars=args.track_expire_bars)
+        update_tracker(ex, tracker, args.timeframe, args.bars, emitted, seen, policy)
+        tracker.save(args.track_file)
+        rates = tracker.hit_rates()
 
     if args.format == "json":
         payload = {
             "exchange": ex.id,
             "timeframe": args.timeframe,
             "bars": args.bars,
-            "rows": table,
+            "rows": [r.to_json() for r in results],
+            "skipped": skipped,
+            "illiquid": illiquid,
+            "screen": {"where": screen.where, "sort": screen.sort, "matched": matched, "of": screened} if screen else None,
+            "detector_timings": detectors.timings() if args.setups else {},
             "briefing": briefing_text,
         }
+        if args.track:
+            payload["tracking"] = [{**asdict(h), "hit_rate": h.hit_rate} for h in rates]
         if args.out:
             write_json(args.out, payload)
         else:
             print(payload)
     else:
+        lines = [
+            f"Exchange: {ex.id}",
+            f"{args.quote.upper()} pairs found: {len(pairs)}",
+            f"Regime analysis on: {len(pairs)} pairs | tf={args.timeframe} bars={args.bars}",
+            "-" * 70,
+            "SYMBOL".ljust(16) + " " + "REGIME".ljust(8) + " " + "ATR%".rjust(7) + " " + "TREND".rjust(7) + "  ACTION",
+            "-" * 70,
+        ]
+        if screen is not None:
+            spec = (screen.where + (f" order by {screen.sort}" if screen.sort else "")).strip()
+            lines.insert(3, f"Screen: {spec} → {matched} of {screened} pairs")
+        for res in results:
+            lines += res.text_lines()
+        if skipped:
+            lines.append("-" * 70)
+            lines.append(f"SKIPPED ({len(skipped)}):")
+            lines += [f"  {s['symbol']}: {s['reason']}" for s in skipped]
+        if illiquid:
+            lines.append("-" * 70)
+            lines.append(f"ILLIQUID ({len(illiquid)}):")
+            lines += [f"  {s['symbol']}: {s['reason']}" for s in illiquid]
+        dupes = [m for m in marks.values() if m.rank > 0]
+        if dupes:
+            lines.append("-" * 70)
+            lines.append(f"CORRELATED A+ SETUPS (ρ ≥ {args.corr_threshold:.2f}):")
+            for m in dupes:
+                limited = args.max_per_cluster is not None and m.rank >= args.max_per_cluster
+                lines.append(f"  {m.symbol}: {cluster_note(m, limited)}")
+        if args.setups:
+            timing = ", ".join(f"{n} {t['calls']}× {t['ms']:.1f}ms" for n, t in detectors.timings().items())
+            lines.append(f"DETECTORS: {timing}")
+        if args.track:
+            lines.append("-" * 70)
+            lines += format_hit_rates(rates) if rates else ["TRACKER: no plans tracked yet"]
         full_text = "\n".join(lines) + ("\n\n" + briefing_text if args.brief else "\n")
         if args.out:
             write_text(args.out, full_text)
@@ -255,5 +421,11 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    args = parse_args()
+    with profile_to(args.profile, "scan"):
+        return run(args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass
+from pathlib import Path
+
+# Fingerprinted URLs never change content, so browsers may keep them for a year.
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_COMPRESSIBLE = {".css", ".js", ".html", ".svg", ".json", ".txt"}
+
+
+@dataclass(frozen=True)
+class Asset:
+    name: str
+    fingerprinted: str  # e.g. "app.3f2a9c1b7e.js"
+    media_type: str
+    etag: str
+    body: bytes
+    gzip_body: bytes | None  # precompressed; None when it wouldn't help
+
+    def etag_for(self, gzipped: bool) -> str:
+        # gzip and identity bodies are different representations: strong ETags must differ
+        return f'{self.etag[:-1]}-gz"' if gzipped else self.etag
+
+
+def _fingerprinted_name(name: str, digest: str) -> str:
+    stem, dot, ext = name.rpartition(".")
+    return f"{stem}.{digest}.{ext}" if dot else f"{name}.{digest}"
+
+
+def make_asset(name: str, body: bytes, media_type: str | None = None) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()[:10]
+    if media_type is None:
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+    gz = None
+    if Path(name).suffix in _COMPRESSIBLE:
+        packed = gzip.compress(body, compresslevel=9, mtime=0)
+        gz = packed if len(packed) < len(body) else None
+    return Asset(name, _fingerprinted_name(name, digest), media_type, f'"{digest}"', body, gz)
+
+
+class StaticAssets:
+    """
+    Static files read, hashed and gzipped once, served from memory.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._by_name: dict[str, Asset] = {}
+        self._by_url: dict[str, tuple[Asset, bool]] = {}  # url name → (asset, immutable?)
+        for p in sorted(directory.iterdir()):
+            if p.is_file():
+                self.add(make_asset(p.name, p.read_bytes()))
+
+    def add(self, asset: Asset) -> None:
+        self._by_name[asset.name] = asset
+        self._by_url[asset.name] = (asset, False)
+        self._by_url[asset.fingerprinted] = (asset, True)
+
+    def url(self, name: str) -> str:
+        asset = self._by_name.get(name)
+        return f"/static/{asset.fingerprinted}" if asset else f"/static/{name}"
+
+    def lookup(self, url_name: str) -> tuple[Asset, bool] | None:
+        return self._by_url.get(url_name)
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    return "gzip" in (accept_encoding or "").lower()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from sentinel.core.report import SymbolResult
 
 
 @dataclass(frozen=True)
 class ScanRequest:
     exchange: str = "binance"
     preset: str = "swing"
+    quote: str = "USDT"
+    market_type: str = "spot"  # or "swap", "future", "any"
 
     # optional overrides (if user changes from preset)
     timeframe: str | None = None
@@ -18,24 +22,30 @@ class ScanRequest:
 
     quality: bool = True
     min_qv: float = 5_000_000.0
+    # liquidity stage before any candle fetch (None = off); the spread also pads sizing
+    max_spread_pct: float | None = None
+    min_depth_usdt: float | None = None
 
     regime: bool = True
     setups: bool = True
     brief: bool = True
     exclude_stables: bool = True
 
+    # auto-refresh polls yield the exchange budget to scans a user just asked for
+    background: bool = False
+
     risk_usdt: float = 1.0
     fee_buffer_pct: float = 0.10
 
+    # A+ setups whose returns correlate at least this much are one bet;
+    # beyond `max_per_cluster` per cluster they are demoted (None = mark only)
+    corr_threshold: float = 0.85
+    max_per_cluster: int | None = None
 
-@dataclass(frozen=True)
-class ScanRow:
-    symbol: str
-    regime: str
-    atr_pct: float
-    trend_strength: float
-    action: str
-    note: str = ""
+    # screen over the scanned features (see core/screen.py), e.g.
+    # where="atr_pct between 1 and 4 and trend_strength > 0.01", sort="quote_volume desc"
+    where: str | None = None
+    sort: str | None = None
 
 
 @dataclass(frozen=True)
@@ -44,5 +54,11 @@ class ScanResponse:
     timeframe: str
     bars: int
     refresh_seconds: int
-    rows: list[ScanRow]
+    rows: list[SymbolResult]
     briefing: str
+    # symbols dropped after retries / circuit breaker: {"symbol", "reason"}
+    skipped: list[dict] = field(default_factory=list)
+    # symbols dropped by the spread / depth checks: {"symbol", "reason"}
+    illiquid: list[dict] = field(default_factory=list)
+    # per setup detector: {"calls", "ms"}; not part of the published snapshot
+    detector_timings: dict[str, dict] = field(default_factory=dict)
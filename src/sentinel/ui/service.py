@@ -1,119 +1,187 @@
 from __future__ import annotations
 
+import os
+import threading
+from dataclasses import replace
+
+from sentinel.core.correlation import (
+    RollingCorrelation,
+    aligned_log_returns,
+    cluster_note,
+    mark_correlated,
+    update_rolling,
+)
 from sentinel.core.exchange import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
     ExchangeConfig,
     ExchangeError,
+    RateLimitConfig,
     create_exchange,
-    iter_usdt_symbols,
+    fetch_tickers_safe,
     load_markets_safe,
 )
-from sentinel.core.filters import (
-    PairFilterConfig,
-    passes_market_filters,
-    quote_volume_usdt_from_ticker,
-)
-from sentinel.core.indicators import atr_pct, trend_strength
-from sentinel.core.mathutils import ema
-from sentinel.core.ohlcv import OHLCVConfig, fetch_ohlcv_safe, split_ohlcv
+from sentinel.core.features import Features, features_from_ohlcv
+from sentinel.core.filters import rank_by_quote_volume, rank_quality_pairs
+from sentinel.core.history import timeframe_ms
+from sentinel.core.liquidity import LiquidityConfig, Quote, select_liquid
+from sentinel.core.memo import AnalysisCache, config_hash, drop_forming, last_closed_open_ms
+from sentinel.core.ohlcv import OHLCVConfig, fetch_ohlcv_safe
 from sentinel.core.regime import MarketRegime, classify_regime
-from sentinel.core.report import ReportRow, build_briefing_text
+from sentinel.core.report import SymbolResult, build_briefing_text
 from sentinel.core.risk import RiskConfig, compute_position_sizing
+from sentinel.core.screen import compile_screen, screen_table
 from sentinel.core.setups import (
     BreakoutRetestConfig,
     PullbackConfig,
-    detect_breakout_retest_long,
-    detect_pullback_long,
+    default_detectors,
 )
+from sentinel.core.sharedcache import shared_cache
+from sentinel.core.universe import load_universe
 from sentinel.ui.presets import get_preset
-from sentinel.ui.schemas import ScanRequest, ScanResponse, ScanRow
-
-_STABLE_BASES = {
-    "USDT",
-    "USDC",
-    "FDUSD",
-    "TUSD",
-    "USDP",
-    "BUSD",
-    "DAI",
-    "USD1",
-    "USDE",
-    "EUR",
-    "EURC",
-}
-
-
-def _is_stablecoin_pair(symbol: str) -> bool:
-    base = symbol.split("/", 1)[0].upper().strip()
-    return base in _STABLE_BASES
-
-
-def _rank_quality_pairs(ex, markets: dict, pairs: list[str], min_qv: float) -> list[str]:
-    cfg = PairFilterConfig(min_quote_volume_usdt=min_qv)
-    try:
-        tickers = ex.fetch_tickers()
-    except Exception:
-        tickers = {}
-
-    scored: list[tuple[str, float]] = []
-    for sym in pairs:
-        market = markets.get(sym, {})
-        if not passes_market_filters(sym, market, cfg):
-            continue
-        qv = quote_volume_usdt_from_ticker(tickers.get(sym, {})) or 0.0
-        scored.append((sym, qv))
+from sentinel.ui.schemas import ScanRequest, ScanResponse
 
-    scored.sort(key=lambda x: x[1], reverse=True)
-    above = [s for (s, qv) in scored if qv >= min_qv]
-    return above if above else [s for (s, _qv) in scored]
+# Per-symbol results keyed by the last closed candle; shared by every scan in this process
+ANALYSIS_CACHE = AnalysisCache(max_entries=4096)
 
+# Return correlation per (exchange, timeframe), advanced candle by candle across refreshes
+CORR_WINDOW = 100
+_CORR_STATE: dict[tuple[str, str], RollingCorrelation] = {}
+_CORR_LOCK = threading.Lock()
 
-def _compute_regime(ex, symbol: str, timeframe: str, bars: int) -> tuple[MarketRegime, float, float]:
-    ohlcv = fetch_ohlcv_safe(ex, symbol, OHLCVConfig(timeframe=timeframe, limit=bars))
-    highs, lows, closes = split_ohlcv(ohlcv)
+# With several web workers each gets this fraction of the exchange's request budget
+RATE_SHARE_ENV = "SENTINEL_RATE_SHARE"
+
+# Set (to anything) to drop the analysis cache before every scan: cold-cache load tests
+COLD_CACHE_ENV = "SENTINEL_COLD_CACHE"
+
+# How long exchange data is shared between workers (candles: until the next close)
+MARKETS_TTL_S = 3600.0
+TICKERS_TTL_S = 60.0
+LIQUIDITY_TTL_S = 30.0
+
+
+def _shared(key: str, ttl_s: float, compute):
+    """
+    `compute()` through the cross-worker cache when one is configured, so N workers
+    send one request instead of N.
+    """
+    cache = shared_cache()
+    return compute() if cache is None else cache.get_or_compute(key, ttl_s, compute)
 
-    if not closes:
-        return MarketRegime.RANGE, 0.0, 0.0
 
-    a = atr_pct(highs, lows, closes)
-    price = closes[-1]
-    ema_fast = ema(closes, 20)
-    ema_slow = ema(closes, 50)
-    ts = trend_strength(ema_fast, ema_slow, price)
-    if ts < 0.0005:
-        ts = 0.0
+def _load_markets(ex) -> dict:
+    cache = shared_cache()
+    if cache is None:
+        return load_markets_safe(ex)
+    markets = cache.get_or_compute(f"markets:{ex.id}", MARKETS_TTL_S, lambda: load_markets_safe(ex))
+    if ex.markets is not markets:
+        ex.set_markets(markets)  # ccxt calls load_markets() internally; don't let it refetch
+    return markets
+
+
+def _fetch_tickers(ex, priority: int) -> dict:
+    # an empty answer (exchange refused) isn't shared
+    return _shared(f"tickers:{ex.id}", TICKERS_TTL_S, lambda: fetch_tickers_safe(ex, priority=priority) or None) or {}
+
+
+def _compute_features(ex, symbol: str, timeframe: str, bars: int, priority: int, rank: int, closed_ms: int) -> Features:
+    # one extra bar for the forming one, which is dropped: results are keyed on the last close
+    ohlcv = _shared(
+        f"ohlcv:{ex.id}:{symbol}:{timeframe}:{bars}:{closed_ms}",
+        timeframe_ms(timeframe) / 1000.0,
+        lambda: drop_forming(
+            fetch_ohlcv_safe(ex, symbol, OHLCVConfig(timeframe=timeframe, limit=bars + 1), priority=priority, rank=rank),
+            closed_ms,
+        )[-bars:],
+    )
+    return features_from_ohlcv(symbol, ohlcv)
+
+
+def _compute_regime(f: Features) -> tuple[MarketRegime, float, float]:
+    if not f.closes:
+        return MarketRegime.RANGE, 0.0, 0.0
+    a = f.atr_pct()
+    ts = f.trend_strength()
     return classify_regime(a, ts), a, ts
 
 
-def _compute_setup(ex, symbol: str, timeframe: str, bars: int, pb: PullbackConfig, br: BreakoutRetestConfig):
-    ohlcv = fetch_ohlcv_safe(ex, symbol, OHLCVConfig(timeframe=timeframe, limit=bars))
-    highs, lows, closes = split_ohlcv(ohlcv)
-    if not closes:
-        return None
+def _mark_correlated_setups(
+    exchange_id: str,
+    timeframe: str,
+    tails: dict[str, tuple[list[int], list[float]]],
+    rows: list[SymbolResult],
+    threshold: float,
+    max_per_cluster: int | None,
+    closed_ms: int,
+) -> None:
+    candidates = [r.symbol for r in rows if r.is_setup]
+    if len(candidates) < 2:
+        return
+    # sorted, so the symbol set (and thus the rolling state) survives volume re-ranking
+    symbols, axis, rets = aligned_log_returns(dict(sorted(tails.items())), CORR_WINDOW + 1)
+    with _CORR_LOCK:
+        state = update_rolling(_CORR_STATE.get((exchange_id, timeframe)), symbols, axis, rets, CORR_WINDOW, closed_ms)
+        _CORR_STATE[(exchange_id, timeframe)] = state
+        corr = state.matrix()
+    marks = mark_correlated(symbols, corr, candidates, threshold)
 
-    plan = detect_pullback_long(closes, lows, symbol, pb)
-    if plan is not None:
-        return plan
-    return detect_breakout_retest_long(closes, lows, symbol, br)
+    for i, row in enumerate(rows):
+        m = marks.get(row.symbol)
+        if m is None:
+            continue
+        if m.rank == 0:
+            rows[i] = replace(row, cluster=m.cluster)
+            continue
+        limited = max_per_cluster is not None and m.rank >= max_per_cluster
+        action = "trade-allowed" if limited else row.action
+        note = cluster_note(m, True) if limited else f"{row.note} | {cluster_note(m, False)}"
+        rows[i] = replace(row, action=action, note=note, cluster=m.cluster, correlated_with=m.leader)
 
 
 def run_scan(req: ScanRequest) -> ScanResponse:
+    if os.environ.get(COLD_CACHE_ENV):
+        ANALYSIS_CACHE.clear()
     preset = get_preset(req.preset)
+    # compiled (and rejected, with ScreenError) before any exchange request
+    screen = compile_screen(req.where, req.sort) if req.where or req.sort else None
 
     timeframe = req.timeframe or preset.timeframe
     bars = req.bars or preset.bars
     refresh_seconds = req.refresh_seconds or preset.refresh_seconds
     max_pairs = req.max_pairs or preset.max_pairs
+    priority = PRIORITY_BACKGROUND if req.background else PRIORITY_INTERACTIVE
 
-    ex = create_exchange(ExchangeConfig(exchange_id=req.exchange))
-    markets = load_markets_safe(ex)
-    pairs = list(iter_usdt_symbols(markets))
-
-    if req.exclude_stables:
-        pairs = [p for p in pairs if not _is_stablecoin_pair(p)]
+    share = float(os.environ.get(RATE_SHARE_ENV, "1"))
+    ex = create_exchange(ExchangeConfig(exchange_id=req.exchange, rate_limit=RateLimitConfig(share=share)))
+    markets = _load_markets(ex)
+    pairs = load_universe(ex.id, markets).select(
+        quote=req.quote,
+        market_type=None if req.market_type == "any" else req.market_type,
+        exclude_stables=req.exclude_stables,
+        exclude_leveraged=req.quality,
+        active_only=req.quality,
+    )
 
+    tickers: dict = {}
     if req.quality:
-        pairs = _rank_quality_pairs(ex, markets, pairs, req.min_qv)
+        tickers = _fetch_tickers(ex, priority)
+        pairs = rank_quality_pairs(markets, pairs, req.min_qv, tickers)
+    elif len(pairs) > max_pairs or screen is not None:
+        # the bulk tickers call weighs ~40 requests: only worth it when ranking decides
+        # which pairs make the max_pairs cut, or the screen needs volume/change columns
+        tickers = _fetch_tickers(ex, priority)
+        pairs = rank_by_quote_volume(pairs, tickers)
 
+    liq = LiquidityConfig(max_spread_pct=req.max_spread_pct or 0.0, min_top_depth=req.min_depth_usdt or 0.0)
+    quotes: dict[str, Quote] = {}
+    illiquid: list[dict] = []
+    if liq.enabled:
+        pairs, quotes, illiquid = _shared(
+            f"liquidity:{ex.id}:{config_hash(liq, pairs, max_pairs)}",
+            LIQUIDITY_TTL_S,
+            lambda: select_liquid(ex, pairs, liq, limit=max(max_pairs, 0), tickers=tickers, priority=priority),
+        )
     pairs = pairs[: max(max_pairs, 0)]
 
     pb = PullbackConfig(
@@ -126,28 +194,33 @@ def run_scan(req: ScanRequest) -> ScanResponse:
         retest_tolerance_pct=1.0,
     )
 
+    detectors = default_detectors(pb, br)
     risk_cfg = RiskConfig(risk_usdt=req.risk_usdt, fee_buffer_pct=req.fee_buffer_pct)
 
-    rows: list[ScanRow] = []
-    briefing_rows: list[ReportRow] = []
+    rows: list[SymbolResult] = []
+    skipped: list[dict] = []
 
-    shown = 0
-    for sym in pairs:
-        try:
-            r, a, ts = _compute_regime(ex, sym, timeframe, bars)
-        except ExchangeError:
-            continue
+    # Between candle closes the inputs are unchanged, so a symbol's rows are reused as-is
+    closed_ms = last_closed_open_ms(timeframe)
+    cfg_key = config_hash(pb, br, risk_cfg, req.setups)
 
-        plan = None
-        if req.setups and r == MarketRegime.TREND:
+    def analyze(
+        sym: str, rank: int, spread: float | None
+    ) -> tuple[SymbolResult, tuple[list[int], list[float]], str | None]:
+        f = _compute_features(ex, sym, timeframe, bars, priority, rank, closed_ms)
+        r, a, ts = _compute_regime(f)
+
+        plan = sizing = failed = None
+        if req.setups and r == MarketRegime.TREND and f.closes:
             try:
-                plan = _compute_setup(ex, sym, timeframe, bars, pb, br)
-            except Exception:
-                plan = None
+                plan = detectors.detect(f)
+            except (ValueError, IndexError, ArithmeticError) as e:
+                # the regime row still stands; the failure is reported, not read as "no setup"
+                failed = f"detector: {e}"
 
         if plan is not None:
             action = f"A+ {plan.setup} {plan.status}"
-            sizing = compute_position_sizing(entry=plan.entry_ref, stop=plan.stop, cfg=risk_cfg)
+            sizing = compute_position_sizing(entry=plan.entry_ref, stop=plan.stop, cfg=risk_cfg, spread_pct=spread or 0.0)
             if sizing is not None:
                 note = f"risk {sizing.risk_usdt:.2f} | notional≈{sizing.notional_usdt:.0f} | SL {sizing.stop_distance_pct:.2f}%"
             else:
@@ -164,14 +237,44 @@ def run_scan(req: ScanRequest) -> ScanResponse:
                 else ("Range → avoid chop" if r == MarketRegime.RANGE else "Chaos → protect capital")
             )
 
-        rows.append(ScanRow(symbol=sym, regime=r.value, atr_pct=float(a), trend_strength=float(ts), action=action, note=note))
-        briefing_rows.append(ReportRow(symbol=sym, regime=r.value, action=action, note=note))
+        return (
+            SymbolResult(sym, r.value, float(a), float(ts), action, note, plan, sizing, spread),
+            (f.ts[-(CORR_WINDOW + 1) :], f.closes[-(CORR_WINDOW + 1) :]),
+            failed,
+        )
+
+    tails: dict[str, tuple[list[int], list[float]]] = {}
+
+    shown = 0
+    for rank, sym in enumerate(pairs):
+        # the spread pads sizing; rounded so quote jitter doesn't defeat the cache
+        spread = round(quotes[sym].spread_pct, 2) if sym in quotes else None
+        key = (ex.id, sym, timeframe, bars, closed_ms, cfg_key, spread)
+        try:
+            row, tails[sym], failed = ANALYSIS_CACHE.get_or_compute(
+                key, lambda sym=sym, rank=rank, spread=spread: analyze(sym, rank, spread)
+            )
+        except ExchangeError as e:
+            skipped.append({"symbol": sym, "reason": str(e)})
+            continue
+
+        if failed:
+            skipped.append({"symbol": sym, "reason": failed})
+        rows.append(row)
 
         shown += 1
-        if shown >= max(req.limit, 0):
+        if screen is None and shown >= max(req.limit, 0):
             break
 
-    briefing = build_briefing_text(briefing_rows) if req.brief else ""
+    if screen is not None:
+        prices = {sym: closes[-1] for sym, (_ts, closes) in tails.items() if closes}
+        rows = [rows[i] for i in screen.apply(screen_table(rows, prices, tickers, quotes))][: max(req.limit, 0)]
+        tails = {r.symbol: tails[r.symbol] for r in rows}
+
+    if req.setups:
+        _mark_correlated_setups(ex.id, timeframe, tails, rows, req.corr_threshold, req.max_per_cluster, closed_ms)
+
+    briefing = build_briefing_text(rows) if req.brief else ""
     return ScanResponse(
         exchange=ex.id,
         timeframe=timeframe,
@@ -179,4 +282,7 @@ def run_scan(req: ScanRequest) -> ScanResponse:
         refresh_seconds=refresh_seconds,
         rows=rows,
         briefing=briefing,
+        skipped=skipped,
+        illiquid=illiquid,
+        detector_timings=detectors.timings() if req.setups else {},
     )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+
+from sentinel.core.sharedcache import SharedCache
+from sentinel.ui.schemas import ScanRequest
+
+# Row fields are stored at display precision: sub-pixel wiggle of the live candle
+# shouldn't count as a change and force a re-send.
+_ROUND = {"atr_pct": 2, "trend_strength": 3}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    etag: str
+    meta: dict  # everything in the response except rows
+    rows: dict[str, dict]  # symbol → row
+    order: list[str]  # display order of symbols
+    published_at: float = 0.0  # epoch seconds this content was last produced by a scan
+
+
+def scan_key(req: ScanRequest) -> str:
+    """
+    Identify a scan by its parameters; whether it ran in the background doesn't matter.
+    """
+    params = asdict(req)
+    params.pop("background", None)
+    raw = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _normalize_row(row: dict) -> dict:
+    return {k: (round(v, _ROUND[k]) if k in _ROUND and isinstance(v, float) else v) for k, v in row.items()}
+
+
+def content_etag(meta: dict, rows: dict[str, dict], order: list[str]) -> str:
+    """
+    Strong ETag from the content itself, so it means the same thing in every process
+    and across restarts (version numbers don't).
+    """
+    raw = json.dumps({"meta": meta, "rows": [rows[s] for s in order]}, sort_keys=True, default=str)
+    return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+class SnapshotStore:
+    """
+    Versioned scan results per scan key. A new version is minted only when the
+    content actually changes; the last `keep` versions are retained for deltas.
+
+    With `shared`, histories live in the cross-worker cache instead, so every web
+    worker hands out the same versions and ETags for the same scan.
+    """
+
+    def __init__(
+        self,
+        keep: int = 8,
+        max_keys: int = 64,
+        shared: SharedCache | None = None,
+        ttl_s: float = 86400.0,
+        lease_wait_s: float = 10.0,
+    ) -> None:
+        self.keep = keep
+        self.max_keys = max_keys
+        self.shared = shared
+        self.ttl_s = ttl_s
+        self.lease_wait_s = lease_wait_s
+        self._by_key: OrderedDict[str, OrderedDict[int, Snapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _append(self, history: OrderedDict[int, Snapshot], key: str, meta: dict, by_sym: dict, order: list[str]) -> Snapshot:
+        latest = next(reversed(history.values()), None)
+        now = time.time()
+        if latest is not None and latest.rows == by_sym and latest.order == order and latest.meta == meta:
+            latest = history[latest.version] = replace(latest, published_at=now)
+            return latest
+
+        version = (latest.version + 1) if latest is not None else 1
+        snap = Snapshot(version, content_etag(meta, by_sym, order), meta, by_sym, order, now)
+        history[version] = snap
+        while len(history) > self.keep:
+            history.popitem(last=False)
+        return snap
+
+    def publish(self, key: str, payload: dict) -> Snapshot:
+        rows = [_normalize_row(r) for r in payload.get("rows", [])]
+        meta = {k: v for k, v in payload.items() if k != "rows"}
+        by_sym = {r["symbol"]: r for r in rows}
+        order = [r["symbol"] for r in rows]
+
+        if self.shared is not None:
+            # the lease makes read-append-write atomic across workers
+            with self.shared.lease(f"snapshots:{key}", ttl_s=10.0, wait_s=self.lease_wait_s) as held:
+                history = self.shared.get(f"snapshots:{key}") or OrderedDict()
+                if not held:
+                    # writing unprotected could mint one version twice; serve the last one
+                    latest = next(reversed(history.values()), None)
+                    if latest is None:
+                        raise TimeoutError(f"snapshot history {key} is locked by another worker")
+                    return latest
+                snap = self._append(history, key, meta, by_sym, order)
+                self.shared.set(f"snapshots:{key}", history, self.ttl_s)
+                return snap
+
+        with self._lock:
+            history = self._by_key.pop(key, None) or OrderedDict()
+            self._by_key[key] = history  # most recently used last
+            while len(self._by_key) > self.max_keys:
+                self._by_key.popitem(last=False)
+            return self._append(history, key, meta, by_sym, order)
+
+    def latest(self, key: str) -> Snapshot | None:
+        if self.shared is not None:
+            history = self.shared.get(f"snapshots:{key}") or {}
+            return next(reversed(history.values()), None)
+        with self._lock:
+            return next(reversed(self._by_key.get(key, {}).values()), None)
+
+    def get(self, key: str, version: int) -> Snapshot | None:
+        if self.shared is not None:
+            return (self.shared.get(f"snapshots:{key}") or {}).get(version)
+        with self._lock:
+            return self._by_key.get(key, {}).get(version)
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> dict:
+    """
+    Rows added, changed and removed between two versions (plus the new order if it moved).
+    """
+    added = [new.rows[s] for s in new.order if s not in old.rows]
+    changed = [new.rows[s] for s in new.order if s in old.rows and old.rows[s] != new.rows[s]]
+    removed = [s for s in old.order if s not in new.rows]
+    out: dict = {"added": added, "changed": changed, "removed": removed}
+    if new.order != old.order:
+        out["order"] = new.order
+    return out
@@ -19,7 +19,7 @@ function badgeClass(action, regime) {
   return "muted";
 }
 
-function buildPayload() {
+function buildPayload(background) {
   return {
     exchange: el("exchange").value.trim() || "binance",
     preset: el("preset").value,
@@ -36,21 +36,95 @@ function buildPayload() {
     exclude_stables: el("exclude_stables").checked,
 
     risk_usdt: parseFloat(el("risk_usdt").value || "1") || 1.0,
-    fee_buffer_pct: parseFloat(el("fee_buffer_pct").value || "0.1") || 0.10
+    fee_buffer_pct: parseFloat(el("fee_buffer_pct").value || "0.1") || 0.10,
+
+    // auto-refresh yields the exchange budget to manual runs
+    background: !!background
   };
 }
 
-async function runScan() {
+// last snapshot this page holds: lets the server answer 304 or send a delta
+let snapshot = { key: null, version: null, etag: null, order: [] };
+const rowEls = new Map();
+
+function fillRow(tr, r) {
+  const cls = badgeClass(r.action, r.regime);
+  tr.innerHTML = `
+      <td><span class="badge ${cls}">${r.symbol}</span></td>
+      <td class="${cls}">${r.regime}</td>
+      <td>${r.atr_pct.toFixed(2)}</td>
+      <td>${r.trend_strength.toFixed(3)}</td>
+      <td class="${cls}">${r.action}</td>
+      <td class="muted">${r.note || ""}</td>
+    `;
+}
+
+function upsertRow(r) {
+  let tr = rowEls.get(r.symbol);
+  if (!tr) {
+    tr = document.createElement("tr");
+    rowEls.set(r.symbol, tr);
+  }
+  fillRow(tr, r);
+}
+
+function placeRows(order) {
+  const tbody = el("tbody");
+  order.forEach((sym, i) => {
+    const tr = rowEls.get(sym);
+    if (tr && tbody.children[i] !== tr) tbody.insertBefore(tr, tbody.children[i] || null);
+  });
+}
+
+function renderFull(rows) {
+  el("tbody").innerHTML = "";
+  rowEls.clear();
+  for (const r of rows) upsertRow(r);
+  snapshot.order = rows.map((r) => r.symbol);
+  placeRows(snapshot.order);
+}
+
+function applyDelta(delta) {
+  for (const sym of delta.removed) {
+    const tr = rowEls.get(sym);
+    if (tr) tr.remove();
+    rowEls.delete(sym);
+  }
+  for (const r of delta.added) upsertRow(r);
+  for (const r of delta.changed) upsertRow(r);
+
+  if (delta.order) snapshot.order = delta.order;
+  else if (delta.removed.length || delta.added.length) {
+    const gone = new Set(delta.removed);
+    snapshot.order = snapshot.order.filter((s) => !gone.has(s)).concat(delta.added.map((r) => r.symbol));
+  }
+  placeRows(snapshot.order);
+}
+
+async function runScan(background = false) {
   setStatus("Scanning…");
   const t0 = performance.now();
 
-  const payload = buildPayload();
+  const payload = buildPayload(background);
+  const { background: _bg, ...params } = payload;
+  const key = JSON.stringify(params);
+  if (key !== snapshot.key) snapshot = { key, version: null, etag: null, order: [] };
+
+  const headers = { "content-type": "application/json" };
+  if (snapshot.etag) headers["if-none-match"] = snapshot.etag;
+  if (snapshot.version !== null) payload.since_version = snapshot.version;
+
   const res = await fetch("/api/scan", {
     method: "POST",
-    headers: { "content-type": "application/json" },
+    headers,
     body: JSON.stringify(payload)
   });
 
+  if (res.status === 304) {
+    setStatus(`Unchanged (${(performance.now() - t0).toFixed(0)}ms)`);
+    return;
+  }
+
   if (!res.ok) {
     setStatus("Error");
     el("meta").textContent = `Request failed: ${res.status}`;
@@ -60,29 +134,20 @@ async function runScan() {
   const data = await res.json();
   const t1 = performance.now();
 
+  snapshot.version = data.version;
+  snapshot.etag = res.headers.get("etag");
+
   refreshSeconds = data.refresh_seconds || refreshSeconds;
 
+  const skipped = (data.skipped || []).length;
   el("meta").textContent =
-    `Exchange: ${data.exchange} • TF: ${data.timeframe} • Bars: ${data.bars} • Refresh: ${refreshSeconds}s • ${(t1 - t0).toFixed(0)}ms`;
+    `Exchange: ${data.exchange} • TF: ${data.timeframe} • Bars: ${data.bars} • Refresh: ${refreshSeconds}s • ${(t1 - t0).toFixed(0)}ms` +
+    (skipped ? ` • Skipped: ${skipped}` : "");
+  el("meta").title = (data.skipped || []).map((s) => `${s.symbol}: ${s.reason}`).join("\n");
 
-  // table
-  const tbody = el("tbody");
-  tbody.innerHTML = "";
-  for (const r of data.rows) {
-    const tr = document.createElement("tr");
-
-    const cls = badgeClass(r.action, r.regime);
-
-    tr.innerHTML = `
-      <td><span class="badge ${cls}">${r.symbol}</span></td>
-      <td class="${cls}">${r.regime}</td>
-      <td>${r.atr_pct.toFixed(2)}</td>
-      <td>${r.trend_strength.toFixed(3)}</td>
-      <td class="${cls}">${r.action}</td>
-      <td class="muted">${r.note || ""}</td>
-    `;
-    tbody.appendChild(tr);
-  }
+  // table: full render on first load, otherwise touch only rows that changed
+  if (data.delta) applyDelta(data.delta);
+  else renderFull(data.rows);
 
   // briefing
   const briefOn = el("brief").checked;
@@ -109,7 +174,7 @@ function applyPreset(p) {
 function startAuto() {
   if (timer) return;
   setStatus(`Auto (${refreshSeconds}s)`);
-  timer = setInterval(runScan, refreshSeconds * 1000);
+  timer = setInterval(() => runScan(true), refreshSeconds * 1000);
   el("toggle").textContent = "Stop Auto";
 }
 
@@ -136,7 +201,7 @@ async function init() {
     if (timer) { stopAuto(); startAuto(); }
   });
 
-  el("run").addEventListener("click", runScan);
+  el("run").addEventListener("click", () => runScan(false));
 
   el("toggle").addEventListener("click", () => {
     if (timer) stopAuto();
@@ -1,10 +1,36 @@
 from __future__ import annotations
 
+import argparse
+import os
+
 import uvicorn
 
+from sentinel.core.sharedcache import SHARED_CACHE_ENV
+from sentinel.ui.service import RATE_SHARE_ENV
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="SENTINEL: web dashboard.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8787)
+    p.add_argument("--workers", type=int, default=1, help="worker processes; more than one share a cache")
+    p.add_argument(
+        "--shared-cache",
+        default=".sentinel_cache/shared.sqlite3",
+        help="cross-worker cache of markets, tickers, candles and snapshots (used with --workers > 1)",
+    )
+    return p.parse_args()
+
 
 def main() -> int:
-    uvicorn.run("sentinel.webapp:app", host="127.0.0.1", port=8787, reload=False)
+    args = parse_args()
+    workers = max(args.workers, 1)
+    if workers > 1:
+        # read by each worker on import: one exchange fetch serves all of them,
+        # and together they stay within a single exchange request budget
+        os.environ[SHARED_CACHE_ENV] = args.shared_cache
+        os.environ[RATE_SHARE_ENV] = str(1.0 / workers)
+    uvicorn.run("sentinel.webapp:app", host=args.host, port=args.port, reload=False, workers=workers)
     return 0
 
 
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import hmac
+import os
+import threading
+import time
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 
+from sentinel.core.profiler import SamplingProfiler
+from sentinel.core.screen import ScreenError
+from sentinel.core.sharedcache import shared_cache
+from sentinel.ui.assets import IMMUTABLE, REVALIDATE, Asset, StaticAssets, accepts_gzip, make_asset
 from sentinel.ui.presets import PRESETS
 from sentinel.ui.schemas import ScanRequest
-from sentinel.ui.service import run_scan
+from sentinel.ui.service import ANALYSIS_CACHE, run_scan
+from sentinel.ui.snapshots import SnapshotStore, diff_snapshots, scan_key
 
 BASE_DIR = Path(__file__).resolve().parent
 UI_DIR = BASE_DIR / "ui"
@@ -16,19 +25,83 @@ TEMPLATES_DIR = UI_DIR / "templates"
 STATIC_DIR = UI_DIR / "static"
 
 app = FastAPI(title="SENTINEL Web", version="1.0")
+# JSON responses (scan results); pre-encoded assets below pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# shared with the other workers when web.py runs several
+SNAPSHOTS = SnapshotStore(shared=shared_cache())
+# A snapshot younger than this fraction of its refresh interval is served to a client
+# already holding it (304) without rescanning: dashboards on the same scan share one run
+SNAPSHOT_FRESH_FRACTION = 0.5
+
+# Read once at startup and served from memory
+ASSETS = StaticAssets(STATIC_DIR)
+INDEX_TEMPLATE = (TEMPLATES_DIR / "index.html").read_text(encoding="utf-8")
+_index_cache: tuple[tuple, Asset] | None = None
+
+# /debug/profile answers loopback clients only; with SENTINEL_DEBUG_TOKEN set they must also send it
+_LOOPBACK = {"127.0.0.1", "::1"}
+_PROFILE_LOCK = threading.Lock()
+
+
+def _render_index() -> Asset:
+    """
+    Render the page once per distinct presets list, with fingerprinted asset URLs.
+    """
+    global _index_cache
+    signature = tuple((p.key, p.label) for p in PRESETS.values())
+    if _index_cache is None or _index_cache[0] != signature:
+        # simple server-side injection of presets list
+        preset_options = "\n".join(f'<option value="{key}">{label}</option>' for key, label in signature)
+        html = INDEX_TEMPLATE.replace("{{PRESET_OPTIONS}}", preset_options)
+        for name in ("styles.css", "app.js"):
+            html = html.replace(f"/static/{name}", ASSETS.url(name))
+        _index_cache = (signature, make_asset("index.html", html.encode("utf-8")))
+    return _index_cache[1]
+
+
+def _weak_etag(etag: str) -> str:
+    """
+    Scan bodies go out as full rows, deltas, gzip or identity under one content
+    version, so their ETag is weak (RFC 9110 8.8.1): same data, not same bytes.
+    """
+    return f"W/{etag}"
+
+
+def _etag_held(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison against an If-None-Match list, as the RFC asks for that header.
+    """
+    if not if_none_match:
+        return False
+    held = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in held or etag.removeprefix("W/") in held
+
+
+def _asset_response(asset: Asset, request: Request, cache_control: str) -> Response:
+    gzipped = asset.gzip_body is not None and accepts_gzip(request.headers.get("accept-encoding"))
+    etag = asset.etag_for(gzipped)
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if not gzipped:
+        return Response(content=asset.body, media_type=asset.media_type, headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    return Response(content=asset.gzip_body, media_type=asset.media_type, headers=headers)
 
 
 @app.get("/", response_class=HTMLResponse)
-def index() -> HTMLResponse:
-    html = (TEMPLATES_DIR / "index.html").read_text(encoding="utf-8")
-    # simple server-side injection of presets list
-    preset_options = "\n".join(
-        f'<option value="{p.key}">{p.label}</option>' for p in PRESETS.values()
-    )
-    html = html.replace("{{PRESET_OPTIONS}}", preset_options)
-    return HTMLResponse(content=html)
+def index(request: Request) -> Response:
+    return _asset_response(_render_index(), request, REVALIDATE)
+
+
+@app.get("/static/{name}")
+def static(name: str, request: Request) -> Response:
+    found = ASSETS.lookup(name)
+    if found is None:
+        raise HTTPException(status_code=404)
+    asset, immutable = found
+    return _asset_response(asset, request, IMMUTABLE if immutable else REVALIDATE)
 
 
 @app.get("/api/presets")
@@ -48,16 +121,99 @@ def presets():
     }
 
 
+@app.get("/api/cache")
+def cache_stats():
+    st = ANALYSIS_CACHE.stats()
+    shared = shared_cache()
+    return {
+        **st.__dict__,
+        "hit_rate": round(st.hit_rate, 4),
+        "pid": os.getpid(),
+        "shared": shared.stats().__dict__ if shared is not None else None,
+    }
+
+
+@app.get("/debug/profile")
+def debug_profile(request: Request, seconds: float = 10.0, interval_ms: float = 10.0) -> Response:
+    """
+    Sample this process for `seconds` (max 120) while it serves real traffic and return
+    collapsed stacks (flamegraph.pl / speedscope input). One capture at a time.
+    Disabled unless $SENTINEL_DEBUG_TOKEN is set; callers must be local and send it
+    as `x-debug-token` (loopback alone proves nothing behind a local reverse proxy).
+    """
+    token = os.environ.get("SENTINEL_DEBUG_TOKEN", "")
+    if not token:
+        raise HTTPException(status_code=404)
+    host = request.client.host if request.client else ""
+    if host not in _LOOPBACK or not hmac.compare_digest(request.headers.get("x-debug-token", ""), token):
+        raise HTTPException(status_code=403)
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="a profile is already being captured")
+    try:
+        prof = SamplingProfiler(interval_s=min(max(interval_ms, 1.0), 1000.0) / 1000.0).start()
+        time.sleep(min(max(seconds, 0.1), 120.0))
+        prof.stop()
+    finally:
+        _PROFILE_LOCK.release()
+    return PlainTextResponse(
+        prof.collapsed(),
+        headers={
+            "X-Profile-Samples": str(prof.samples),
+            "Content-Disposition": 'attachment; filename="sentinel-web.folded"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
 @app.post("/api/scan")
-def api_scan(payload: dict):
+def api_scan(payload: dict, request: Request):
+    # `since_version` asks for a delta against a version this client already holds
+    since_version = payload.pop("since_version", None)
+    try:
+        since = int(since_version) if since_version is not None else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="since_version must be an integer") from None
+
     # Safe parsing with defaults
     req = ScanRequest(**payload)
-    res = run_scan(req)
-    return {
+    key = scan_key(req)
+    held = request.headers.get("if-none-match")
+
+    # a poll matching a snapshot some client got moments ago is answered without rescanning
+    latest = SNAPSHOTS.latest(key) if held else None
+    if latest is not None and _etag_held(held, latest.etag):
+        fresh_s = latest.meta.get("refresh_seconds", 0) * SNAPSHOT_FRESH_FRACTION
+        if time.time() - latest.published_at < fresh_s:
+            return Response(status_code=304, headers={"ETag": _weak_etag(latest.etag), "Vary": "Accept-Encoding"})
+
+    try:
+        res = run_scan(req)
+    except ScreenError as e:
+        raise HTTPException(status_code=400, detail=f"bad screen: {e}") from None
+    body = {
         "exchange": res.exchange,
         "timeframe": res.timeframe,
         "bars": res.bars,
         "refresh_seconds": res.refresh_seconds,
-        "rows": [r.__dict__ for r in res.rows],
+        "rows": [r.summary() for r in res.rows],
+        "skipped": res.skipped,
+        "illiquid": res.illiquid,
         "briefing": res.briefing,
     }
+    try:
+        snap = SNAPSHOTS.publish(key, body)
+    except TimeoutError:
+        # another worker holds this scan's history and there is nothing to serve yet
+        raise HTTPException(status_code=503, headers={"Retry-After": "1"}) from None
+    headers = {"ETag": _weak_etag(snap.etag), "Vary": "Accept-Encoding"}
+
+    if _etag_held(held, snap.etag):
+        return Response(status_code=304, headers=headers)
+
+    # the ETag names content, so it confirms the client's version is the one we diff against
+    base = SNAPSHOTS.get(key, since) if since is not None else None
+    if base is not None and _etag_held(held, base.etag):
+        return JSONResponse({**snap.meta, "version": snap.version, "delta": diff_snapshots(base, snap)}, headers=headers)
+
+    rows = [snap.rows[s] for s in snap.order]
+    return JSONResponse({**snap.meta, "version": snap.version, "rows": rows}, headers=headers)
@@ -0,0 +1,9 @@
+import pytest
+
+from sentinel.core.universe import UNIVERSE_CACHE_ENV
+
+
+@pytest.fixture(autouse=True)
+def _no_universe_files(monkeypatch):
+    # scans against the stub would otherwise persist its index under the working tree
+    monkeypatch.setenv(UNIVERSE_CACHE_ENV, "")
@@ -0,0 +1,76 @@
+import zipfile
+
+import numpy as np
+
+from sentinel.core.archive import ArchiveSeries, import_klines, load_archive, symbol_dir
+
+MIN = 60_000
+T0 = 1_700_000_100_000 - 1_700_000_100_000 % (5 * MIN)  # 5m-aligned, realistic epoch ms
+
+
+def _csv(start_min: int, n: int, header: bool = False, micro: bool = False) -> str:
+    lines = ["open_time,open,high,low,close,volume,close_time"] if header else []
+    for i in range(start_min, start_min + n):
+        ts = (T0 + i * MIN) * (1000 if micro else 1)
+        lines.append(f"{ts},{i},{i + 0.5},{i - 0.5},{i + 0.25},1,{ts + 1}")
+    return "\n".join(lines) + "\n"
+
+
+def test_import_merges_dumps_into_mmapped_columns(tmp_path) -> None:
+    z = tmp_path / "BTCUSDT-1m.zip"
+    with zipfile.ZipFile(z, "w") as zf:
+        zf.writestr("BTCUSDT-1m.csv", _csv(0, 30, header=True))
+    csv = tmp_path / "later.csv"
+    csv.write_text(_csv(20, 20, micro=True), encoding="utf-8")  # overlaps 20..29
+
+    root = tmp_path / "archive"
+    assert import_klines(root, "binance", "BTC/USDT", "1m", [z, csv]) == 40
+
+    s = ArchiveSeries.load(symbol_dir(root, "binance", "BTC/USDT") / "1m")
+    assert isinstance(s.close, np.memmap)
+    assert s.ts.tolist() == [T0 + i * MIN for i in range(40)]
+    assert isinstance(s.window(T0 + 10 * MIN, T0 + 20 * MIN).close, np.memmap)  # still a view
+
+
+def test_resample_matches_manual_aggregation_and_drops_partial_bucket(tmp_path) -> None:
+    csv = tmp_path / "k.csv"
+    csv.write_text(_csv(0, 23), encoding="utf-8")  # 4 full 5m buckets + 3 minutes
+    import_klines(tmp_path, "binance", "X/USDT", "1m", [csv])
+
+    s = load_archive(tmp_path, "binance", "X/USDT", "5m")
+    assert (s.ts - T0).tolist() == [0, 5 * MIN, 10 * MIN, 15 * MIN]
+    assert s.to_ohlcv()[1] == [T0 + 5 * MIN, 5.0, 9.5, 4.5, 9.25, 5.0]
+
+    assert load_archive(tmp_path, "binance", "X/USDT", "5m", bars=2).ts.tolist() == [T0 + 10 * MIN, T0 + 15 * MIN]
+    assert load_archive(tmp_path, "binance", "X/USDT", "5m", since_ms=T0 + 7 * MIN).ts.tolist() == [T0 + 10 * MIN, T0 + 15 * MIN]
+    assert load_archive(tmp_path, "binance", "X/USDT", "30s") is None
+
+
+def test_later_files_win_on_overlap(tmp_path) -> None:
+    first, second, third = (tmp_path / f"{n}.csv" for n in ("a", "b", "c"))
+    first.write_text(_csv(0, 10), encoding="utf-8")
+    second.write_text(_csv(5, 10).replace(",1,", ",2,"), encoding="utf-8")  # volume 2 on 5..14
+    third.write_text(_csv(8, 4).replace(",1,", ",3,"), encoding="utf-8")  # volume 3 on 8..11
+
+    assert import_klines(tmp_path, "binance", "X/USDT", "1m", [first, second]) == 15
+    s = ArchiveSeries.load(symbol_dir(tmp_path, "binance", "X/USDT") / "1m")
+    assert s.volume.tolist() == [1.0] * 5 + [2.0] * 10
+
+    import_klines(tmp_path, "binance", "X/USDT", "1m", [third])  # a new import beats stored rows
+    s = ArchiveSeries.load(symbol_dir(tmp_path, "binance", "X/USDT") / "1m")
+    assert s.volume.tolist() == [1.0] * 5 + [2.0] * 3 + [3.0] * 4 + [2.0] * 3
+
+
+def test_resample_opens_weeks_on_monday_and_months_on_the_first(tmp_path) -> None:
+    day = 86_400_000
+    start = 1_704_067_200_000  # 2024-01-01, a Monday
+    rows = [[start + i * day, i, i + 0.5, i - 0.5, i + 0.25, 1] for i in range(66)]  # to 2024-03-06
+    s = ArchiveSeries("1d", *(np.array(col) for col in zip(*rows, strict=True)))
+
+    weekly = s.resample("1w")
+    assert ((weekly.ts - start) // day).tolist() == [0, 7, 14, 21, 28, 35, 42, 49, 56]  # 10th week is partial
+    assert weekly.to_ohlcv()[1] == [start + 7 * day, 7.0, 13.5, 6.5, 13.25, 7.0]
+
+    monthly = s.resample("1M")
+    assert ((monthly.ts - start) // day).tolist() == [0, 31]  # Jan, Feb; March is partial
+    assert monthly.volume.tolist() == [31, 29]
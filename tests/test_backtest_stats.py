@@ -0,0 +1,26 @@
+import random
+
+from sentinel.core.backtest import BacktestStats, summarize
+
+
+def test_stats_merge_matches_single_pass():
+    rng = random.Random(7)
+    r = [rng.choice([1.0, -1.0, 0.4, -0.6]) for _ in range(300)]
+    shards = [BacktestStats.from_outcomes(r[i : i + 37]) for i in range(0, len(r), 37)]
+
+    left = BacktestStats()
+    for s in shards:
+        left = left.merge(s)
+    right = shards[-1]
+    for s in reversed(shards[:-1]):
+        right = s.merge(right)
+
+    expected = summarize("X/USDT", "1h", r)
+    for merged in (left, right):
+        got = merged.result("X/USDT", "1h")
+        assert got.trades == expected.trades and got.wins == expected.wins
+        assert abs(got.avg_r - expected.avg_r) < 1e-12
+        assert abs(got.profit_factor - expected.profit_factor) < 1e-12
+        assert abs(got.max_drawdown_r - expected.max_drawdown_r) < 1e-12
+    mean = sum(r) / len(r)
+    assert abs(left.variance - sum((x - mean) ** 2 for x in r) / (len(r) - 1)) < 1e-9
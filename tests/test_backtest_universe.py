@@ -0,0 +1,66 @@
+import math
+import multiprocessing
+
+import pytest
+
+import sentinel.backtest as bt
+from sentinel.core.exchange import ExchangeError
+
+OPTS = {k: None for k in bt._PAIR_OPTIONS} | {"bars": 400, "bootstrap": 0, "walk_forward": False, "portfolio": True}
+
+
+class FakeExchange:
+    id = "fake-universe"
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        if symbol == "BAD/USDT" or (symbol == "NEW/USDT" and timeframe == "1d"):
+            raise ExchangeError("delisted" if symbol == "BAD/USDT" else "too new")
+        rows = []
+        for i in range(limit):
+            c = 100 + 10 * math.sin(i / 15) + i * 0.05
+            rows.append([i * 3_600_000, c, c * 1.01, c * 0.99, c, 1.0])
+        return rows
+
+
+def test_parse_universe() -> None:
+    assert bt.parse_universe("top:200") == 200
+    with pytest.raises(ValueError):
+        bt.parse_universe("all")
+
+
+def test_bad_regime_filter_exits_2_with_choices(monkeypatch, capsys) -> None:
+    assert bt.parse_regime_filter(" Trend,chaos ") == {0, 2}
+    monkeypatch.setattr("sys.argv", ["backtest", "--regime-filter", "trend,sideways"])
+    monkeypatch.setattr(bt, "create_exchange", lambda cfg: pytest.fail("exchange created"))
+    assert bt.main() == 2
+    assert "trend, range, chaos" in capsys.readouterr().err
+
+
+def test_run_pairs_inline_keeps_order_and_reports_errors() -> None:
+    pairs = ["ETH/USDT", "BAD/USDT", "BTC/USDT"]
+    outcomes = bt.run_pairs(FakeExchange(), pairs, ["1h"], OPTS, None, None, 0, workers=1)
+
+    assert [o.symbol for o in outcomes] == pairs
+    assert len(outcomes[1].errors) == 1 and outcomes[1].errors[0].startswith("1h:") and "delisted" in outcomes[1].errors[0]
+    assert outcomes[0].results[0].trades == outcomes[2].results[0].trades > 0
+    assert [tf for tf, _s in outcomes[0].streams] == ["1h"]
+
+
+def test_failing_timeframe_keeps_the_others() -> None:
+    (o,) = bt.run_pairs(FakeExchange(), ["NEW/USDT"], ["1h", "1d"], OPTS, None, None, 0, workers=8)
+    assert len(o.errors) == 1 and o.errors[0].startswith("1d:") and "too new" in o.errors[0]
+    assert [r.timeframe for r in o.results] == ["1h"] and o.results[0].trades > 0
+
+
+def fake_factory(exchange_id: str, share: float) -> FakeExchange:
+    return FakeExchange()
+
+
+def test_run_pairs_process_pool_matches_inline() -> None:
+    # spawned workers share no state with the test process: the factory is the only way in
+    pairs = ["A/USDT", "B/USDT", "C/USDT"]
+    inline = bt.run_pairs(FakeExchange(), pairs, ["1h"], OPTS, None, None, 0, workers=1)
+    spawn = multiprocessing.get_context("spawn")
+    pooled = bt.run_pairs(FakeExchange(), pairs, ["1h"], OPTS, None, None, 0, workers=2, exchange_factory=fake_factory, mp_context=spawn)
+
+    assert [o.results for o in pooled] == [o.results for o in inline]
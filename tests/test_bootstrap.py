@@ -0,0 +1,28 @@
+import numpy as np
+
+from sentinel.core.bootstrap import (
+    bootstrap_outcomes,
+    longest_losing_streaks,
+    max_drawdowns,
+    resample_indices,
+)
+
+
+def test_drawdown_and_streak_per_row() -> None:
+    paths = np.array([[1.0, -1.0, -1.0, 1.0, -1.0], [-1.0, -1.0, -1.0, 1.0, 1.0]])
+    assert max_drawdowns(paths).tolist() == [2.0, 3.0]
+    assert longest_losing_streaks(paths).tolist() == [2, 3]
+
+
+def test_block_indices_are_consecutive_runs() -> None:
+    idx = resample_indices(np.random.default_rng(0), n_trades=10, samples=3, block_size=4)
+    assert idx.shape == (3, 10)
+    assert all((np.diff(row[:4]) % 10 == 1).all() for row in idx)
+
+
+def test_bootstrap_interval_brackets_expectancy() -> None:
+    r = [1.0, -1.0, 1.0, 1.0, -1.0] * 40
+    b = bootstrap_outcomes("X/USDT", "1h", r, samples=2000, seed=1)
+    assert b is not None
+    assert b.expectancy_lo < 0.2 < b.expectancy_hi
+    assert b.max_drawdown_r["p50"] <= b.max_drawdown_r["p95"]
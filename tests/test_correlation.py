@@ -0,0 +1,80 @@
+import numpy as np
+
+from sentinel.core.correlation import (
+    RollingCorrelation,
+    aligned_log_returns,
+    correlation_matrix,
+    mark_correlated,
+    update_rolling,
+)
+
+H = 3_600_000
+
+
+def _universe(bars: int = 160, seed: int = 3) -> dict[str, tuple[list[int], list[float]]]:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, bars)
+    out = {}
+    for name, beta, noise in [("BTC", 1.0, 0.001), ("ETH", 1.0, 0.002), ("SOL", 1.0, 0.002), ("GOLD", 0.0, 0.01)]:
+        r = beta * market + rng.normal(0, noise, bars)
+        out[f"{name}/USDT"] = ([i * H for i in range(bars)], (100 * np.exp(np.cumsum(r))).tolist())
+    return out
+
+
+def test_alignment_and_matrix_match_numpy() -> None:
+    u = _universe()
+    ts, closes = u["ETH/USDT"]
+    u["ETH/USDT"] = (ts[:100] + ts[101:], closes[:100] + closes[101:])  # one missing candle
+
+    symbols, axis, rets = aligned_log_returns(u, 120)
+    assert len(axis) == 120 and rets.shape == (4, 119)
+    assert np.isnan(rets[1]).sum() == 2
+
+    corr = correlation_matrix(rets)
+    expected = np.corrcoef(np.nan_to_num(rets, nan=0.0))
+    assert np.allclose(corr, expected)
+
+
+def test_rolling_updates_match_full_recompute() -> None:
+    u = _universe()
+    symbols, axis, rets = aligned_log_returns(u, 160)
+    window = 50
+
+    state = update_rolling(None, symbols, axis[:100], rets[:, :99], window)
+    for end in range(101, 161):
+        state = update_rolling(state, symbols, axis[:end], rets[:, : end - 1], window)
+    assert isinstance(state, RollingCorrelation) and state.last_ts == axis[-1]
+    assert np.allclose(state.matrix(), correlation_matrix(rets[:, -window:], min_obs=1))
+
+
+def test_correlated_setups_share_a_leader() -> None:
+    symbols, _axis, rets = aligned_log_returns(_universe(), 101)
+    marks = mark_correlated(symbols, correlation_matrix(rets), ["ETH/USDT", "SOL/USDT", "GOLD/USDT"], 0.85)
+
+    assert marks["ETH/USDT"].rank == 0
+    assert (marks["SOL/USDT"].leader, marks["SOL/USDT"].rank) == ("ETH/USDT", 1)
+    assert marks["SOL/USDT"].rho > 0.85
+    assert marks["GOLD/USDT"].rank == 0 and marks["GOLD/USDT"].cluster != marks["ETH/USDT"].cluster
+
+
+def test_members_are_judged_against_the_leader_not_a_chain() -> None:
+    # A~B and B~C are above the threshold, A~C is far below it
+    symbols = ["A", "B", "C"]
+    corr = np.array([[1.0, 0.9, 0.4], [0.9, 1.0, 0.9], [0.4, 0.9, 1.0]])
+    marks = mark_correlated(symbols, corr, ["A", "B", "C"], 0.85)
+    assert (marks["B"].leader, marks["B"].rank) == ("A", 1)
+    assert (marks["C"].leader, marks["C"].rank) == ("C", 0)
+
+
+def test_rolling_ignores_forming_candle_and_thin_histories() -> None:
+    u = _universe()
+    ts, closes = u["GOLD/USDT"]
+    u["GOLD/USDT"] = (ts[-10:], closes[-10:])  # newly listed
+    symbols, axis, rets = aligned_log_returns(u, 101)
+
+    state = update_rolling(None, symbols, axis, rets, 50, closed_ts=int(axis[-2]))
+    assert state.last_ts == axis[-2]  # the return into the forming candle isn't pushed
+
+    corr = state.matrix()
+    assert np.isnan(corr[3]).all() and np.isnan(correlation_matrix(rets)[3]).all()
+    assert not np.isnan(corr[0, 1])
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from sentinel.core.features import Features
+from sentinel.core.mathutils import ema
+from sentinel.core.setups import DetectorRegistry, TradePlan, default_detectors
+
+
+def _series(n: int = 160) -> tuple[list[float], list[float], list[float]]:
+    closes = [100 + i * 0.5 + 3 * math.sin(i / 4) for i in range(n)]
+    return [c * 1.01 for c in closes], [c * 0.99 for c in closes], closes
+
+
+def test_features_match_direct_computation_and_cache() -> None:
+    highs, lows, closes = _series()
+    f = Features("X/USDT", highs, lows, closes)
+
+    assert f.ema(20) == ema(closes, 20)
+    assert f.swing_low(30) == min(lows[-30:])
+    assert f.prior_high_close(40) == max(closes[:-1][-40:])
+
+    f.closes = []  # cached values survive; nothing is recomputed
+    assert f.ema(20) == ema(closes, 20)
+
+
+# plans from the pre-registry detect_pullback_long / detect_breakout_retest_long on
+# _wave_series(), frozen so a regression in the shared code paths cannot hide
+FROZEN_PLANS = {
+    100: None,
+    107: ("BREAKOUT_RETEST", "READY", 100.903793, 97.533532, 104.274054, 107.644315),
+    110: ("BREAKOUT_RETEST", "READY", 101.473084, 97.533532, 105.412636, 109.352188),
+    120: ("PULLBACK", "READY", 104.63272, 98.036778, 111.228663, 117.824605),
+    150: ("PULLBACK", "READY", 127.946821, 104.037775, 151.855866, 175.764911),
+    175: ("PULLBACK", "WATCH", 132.019014, 123.278619, 140.759408, 149.499803),
+    200: None,
+    219: None,
+}
+
+
+def _wave_series(n: int = 220) -> tuple[list[float], list[float], list[float]]:
+    closes = [100 + 0.1 * i + 5 * math.sin(i / 12) + 15 * math.sin(i / 20) for i in range(n)]
+    return [c * 1.01 for c in closes], [c * 0.99 for c in closes], closes
+
+
+def test_registry_matches_frozen_baseline_plans_and_records_timings() -> None:
+    highs, lows, closes = _wave_series()
+    reg = default_detectors()
+    for end, expected in FROZEN_PLANS.items():
+        plan = reg.detect(Features("X/USDT", highs[:end], lows[:end], closes[:end]))
+        if expected is None:
+            assert plan is None, end
+            continue
+        assert plan is not None, end
+        assert (plan.setup, plan.status) == expected[:2], end
+        assert (plan.entry_ref, plan.stop, plan.tp1, plan.tp2) == pytest.approx(expected[2:], abs=1e-6), end
+
+    t = reg.timings()
+    assert list(t) == ["pullback", "breakout_retest"]
+    assert t["pullback"]["calls"] == len(FROZEN_PLANS)
+
+
+def test_custom_detector_plugs_in() -> None:
+    highs, lows, closes = _series()
+    reg = DetectorRegistry()
+
+    def always_short(f: Features, cfg: float) -> TradePlan:
+        p = f.price
+        return TradePlan(f.symbol, "short", "FADE", "WATCH", p, "", p * (1 + cfg), p * 0.99, p * 0.98, "")
+
+    reg.register("fade", always_short, 0.01)
+    plan = reg.detect(Features("X/USDT", highs, lows, closes))
+    assert plan is not None and plan.direction == "short" and plan.setup == "FADE"
+    assert reg.timings()["fade"]["calls"] == 1
@@ -0,0 +1,71 @@
+import time
+
+import ccxt
+import pytest
+
+from sentinel.core.exchange import (
+    CircuitOpenError,
+    ExchangeError,
+    RateLimitConfig,
+    _register_scheduler,
+)
+from sentinel.core.ohlcv import FetchPolicy, OHLCVConfig, fetch_ohlcv_safe, latency_tracker
+
+
+class FlakyExchange:
+    def __init__(self, ex_id: str, failures: int, error: type[Exception] = ccxt.RequestTimeout) -> None:
+        self.id = ex_id
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+        self.last_response_headers: dict[str, str] = {}
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("failed")
+        return [[0, 1.0, 1.0, 1.0, 1.0, 1.0]]
+
+
+def test_retries_recover_from_transient_errors() -> None:
+    ex = FlakyExchange("flaky-retry", failures=2)
+    policy = FetchPolicy(retries=2, backoff_base_s=0.0)
+    out = fetch_ohlcv_safe(ex, "X/USDT", OHLCVConfig(), policy=policy)
+    assert out and ex.calls == 3
+
+
+def test_breaker_fails_fast_when_exchange_is_down() -> None:
+    ex = FlakyExchange("flaky-down", failures=10**6)
+    policy = FetchPolicy(retries=0, breaker_failures=3, breaker_cooldown_s=60.0)
+    for _ in range(3):
+        with pytest.raises(ExchangeError):
+            fetch_ohlcv_safe(ex, "X/USDT", OHLCVConfig(), policy=policy)
+    with pytest.raises(CircuitOpenError):
+        fetch_ohlcv_safe(ex, "Y/USDT", OHLCVConfig(), policy=policy)
+    assert ex.calls == 3
+
+
+def test_rate_limits_back_off_without_tripping_the_breaker() -> None:
+    ex = FlakyExchange("flaky-429", failures=4, error=ccxt.RateLimitExceeded)
+    ex.last_response_headers = {"Retry-After": "0.01"}
+    policy = FetchPolicy(retries=0, backoff_base_s=0.0, breaker_failures=2, breaker_cooldown_s=60.0)
+    for _ in range(4):
+        with pytest.raises(ExchangeError):
+            fetch_ohlcv_safe(ex, "X/USDT", OHLCVConfig(), policy=policy)
+    assert fetch_ohlcv_safe(ex, "X/USDT", OHLCVConfig(), policy=policy)  # breaker still closed
+
+    ex = FlakyExchange("flaky-429-retry", failures=2, error=ccxt.RateLimitExceeded)
+    ex.last_response_headers = {"Retry-After": "0.05"}
+    started = time.monotonic()
+    assert fetch_ohlcv_safe(ex, "X/USDT", OHLCVConfig(), policy=FetchPolicy(retries=2, backoff_base_s=0.0))
+    assert time.monotonic() - started >= 0.1  # waited out Retry-After twice
+
+
+def test_latency_excludes_time_queued_in_our_scheduler() -> None:
+    ex = FlakyExchange("flaky-queued", failures=0)
+    _register_scheduler(ex, RateLimitConfig(weight_per_sec=20.0, burst=1.0))
+    started = time.monotonic()
+    for _ in range(3):
+        fetch_ohlcv_safe(ex, "X/USDT", OHLCVConfig(limit=100), policy=FetchPolicy(hedge=True, hedge_min_ms=1.0))
+    assert time.monotonic() - started >= 0.09  # two 50ms waits for tokens
+    assert max(latency_tracker(ex)._samples) < 0.04
@@ -0,0 +1,76 @@
+from sentinel.core.history import HistoryConfig, fetch_ohlcv_range, plan_pages, stitch
+
+HOUR = 3_600_000
+
+
+class PagedExchange:
+    id = "paged"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls += 1
+        # overlap by one candle on each side, like real exchanges sometimes do
+        return [[ts, 1.0, 1.0, 1.0, 1.0, 1.0] for ts in range(since - HOUR, since + (limit + 1) * HOUR, HOUR)]
+
+
+def test_plan_pages_aligned_to_page_span() -> None:
+    assert plan_pages(5 * HOUR, 25 * HOUR, HOUR, 10) == [0, 10 * HOUR, 20 * HOUR]
+
+
+def test_stitch_dedupes_and_clips() -> None:
+    a = [[0, 1], [HOUR, 2]]
+    b = [[HOUR, 2], [2 * HOUR, 3], [3 * HOUR, 4]]
+    assert [r[0] for r in stitch([a, b], HOUR, 3 * HOUR)] == [HOUR, 2 * HOUR]
+
+
+def test_fetch_range_resumes_from_page_store(tmp_path) -> None:
+    cfg = HistoryConfig(timeframe="1h", page_limit=10, workers=3, cache_dir=str(tmp_path))
+    ex = PagedExchange()
+    rows = fetch_ohlcv_range(ex, "X/USDT", 5 * HOUR, 95 * HOUR, cfg)
+    assert [r[0] for r in rows] == list(range(5 * HOUR, 95 * HOUR, HOUR))
+    assert ex.calls == 10
+
+    again = PagedExchange()
+    assert fetch_ohlcv_range(again, "X/USDT", 5 * HOUR, 95 * HOUR, cfg) == rows
+    assert again.calls == 0
+
+
+class CappedExchange:
+    """
+    Answers at most `cap` candles per request and has nothing before `listed`.
+    """
+
+    id = "capped"
+
+    def __init__(self, cap: int, listed: int, last: int) -> None:
+        self.cap, self.listed, self.last = cap, listed, last
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls += 1
+        first = max(since, self.listed)
+        return [[ts, 1.0, 1.0, 1.0, 1.0, 1.0] for ts in range(first, self.last + HOUR, HOUR)][: min(limit, self.cap)]
+
+
+def test_capped_responses_and_listing_date_leave_no_gaps(tmp_path) -> None:
+    cfg = HistoryConfig(timeframe="1h", page_limit=10, workers=2, cache_dir=str(tmp_path))
+    ex = CappedExchange(cap=3, listed=13 * HOUR, last=49 * HOUR)
+    rows = fetch_ohlcv_range(ex, "X/USDT", 0, 50 * HOUR, cfg)
+    assert [r[0] for r in rows] == list(range(13 * HOUR, 50 * HOUR, HOUR))
+
+    # every page was completed (the one before the listing included), so a rerun is offline
+    again = CappedExchange(cap=3, listed=13 * HOUR, last=49 * HOUR)
+    assert fetch_ohlcv_range(again, "X/USDT", 0, 50 * HOUR, cfg) == rows
+    assert again.calls == 0
+
+
+def test_page_cut_short_by_missing_data_is_not_persisted(tmp_path) -> None:
+    cfg = HistoryConfig(timeframe="1h", page_limit=10, workers=1, cache_dir=str(tmp_path))
+    fetch_ohlcv_range(CappedExchange(cap=3, listed=0, last=15 * HOUR), "X/USDT", 0, 20 * HOUR, cfg)
+
+    later = CappedExchange(cap=3, listed=0, last=19 * HOUR)
+    rows = fetch_ohlcv_range(later, "X/USDT", 0, 20 * HOUR, cfg)
+    assert [r[0] for r in rows] == list(range(0, 20 * HOUR, HOUR))
+    assert later.calls > 0
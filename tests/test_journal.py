@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+
+from sentinel.core.journal import Journal, JournalError
+from sentinel.core.risk import RiskConfig, compute_position_sizing
+from sentinel.core.setups import TradePlan
+
+
+def _plan(symbol: str, setup: str = "PULLBACK") -> TradePlan:
+    return TradePlan(symbol, "long", setup, "READY", 100.0, "", 98.0, 102.0, 104.0, "")
+
+
+def test_results_roll_up_into_setup_stats(tmp_path) -> None:
+    with Journal(tmp_path / "j.sqlite3") as j:
+        sizing = compute_position_sizing(100.0, 98.0, RiskConfig())
+        r_values = []
+        for i, exit_price in enumerate([102.0, 98.0, 97.0, 104.0, 99.0]):
+            eid = j.record_entry(_plan(f"S{i}/USDT"), sizing, regime="trend", opened_at=1_700_000_000_000 + i)
+            r_values.append(j.record_result(eid, exit_price, closed_at=1_700_000_100_000 + i))
+        j.record_result(j.record_entry(_plan("X/USDT", "BREAKOUT_RETEST"), fill=101.0), 104.0)
+
+        assert r_values == [1.0, -1.0, -1.5, 2.0, -0.5]
+        by_setup = {s.setup: s for s in j.setup_stats()}
+        pb = by_setup["PULLBACK"]
+        assert (pb.trades, pb.wins, pb.losses) == (5, 2, 3)
+        assert pb.expectancy_r == pytest.approx(0.0)
+        assert pb.max_drawdown_r == pytest.approx(2.5)  # +1 → -1.5
+        assert pb.profit_factor == pytest.approx(1.0)
+        assert by_setup["BREAKOUT_RETEST"].total_r == pytest.approx(1.0)
+
+        assert [e.symbol for e in j.entries(setup="PULLBACK", limit=2)] == ["S4/USDT", "S3/USDT"]
+        assert j.entries(symbol="S1/USDT")[0].r == -1.0
+
+
+def test_journal_is_append_only(tmp_path) -> None:
+    path = tmp_path / "j.sqlite3"
+    with Journal(path) as j:
+        eid = j.record_entry(_plan("A/USDT"))
+        j.record_result(eid, 101.0)
+        with pytest.raises(JournalError):
+            j.record_result(eid, 105.0)  # closes once
+
+    conn = sqlite3.connect(path)
+    for sql in ("UPDATE entries SET fill = 1", "DELETE FROM results"):
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            conn.execute(sql)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
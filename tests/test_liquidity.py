@@ -0,0 +1,66 @@
+from sentinel.core.liquidity import LiquidityConfig, select_liquid
+from sentinel.core.risk import RiskConfig, compute_position_sizing
+
+
+class FakeExchange:
+    id = "fake-liquidity"
+    has = {"fetchBidsAsks": True}
+
+    def __init__(self) -> None:
+        self.books: list[str] = []
+
+    def fetch_bids_asks(self, symbols=None):
+        return {
+            "BTC/USDT": {"bid": 100.0, "ask": 100.01, "bidVolume": 50.0, "askVolume": 40.0},
+            "THIN/USDT": {"bid": 1.0, "ask": 1.05, "bidVolume": 1e6, "askVolume": 1e6},  # ~5% spread
+            "SMALL/USDT": {"bid": 10.0, "ask": 10.001, "bidVolume": 1.0, "askVolume": 1.0},  # $10 on top
+            "NOBID/USDT": {"bid": None, "ask": 2.0},
+        }
+
+    def fetch_order_book(self, symbol, limit=None):
+        self.books.append(symbol)
+        if symbol == "DOWN/USDT":
+            raise RuntimeError("timeout")
+        return {"bids": [[2.0, 500.0]], "asks": [[2.002, 500.0]]}
+
+
+def test_bulk_quotes_filter_and_book_fallback() -> None:
+    ex = FakeExchange()
+    cfg = LiquidityConfig(max_spread_pct=0.5, min_top_depth=100.0, book_workers=2)
+    symbols = ["BTC/USDT", "THIN/USDT", "SMALL/USDT", "NOBID/USDT", "DOWN/USDT", "LATE/USDT"]
+
+    kept, quotes, rejected = select_liquid(ex, symbols, cfg, limit=3)
+
+    # NOBID has no usable bulk quote → its book is fetched; DOWN's book fails and passes unchecked
+    assert kept == ["BTC/USDT", "NOBID/USDT", "DOWN/USDT"]
+    assert [r["symbol"] for r in rejected] == ["THIN/USDT", "SMALL/USDT"]
+    assert sorted(ex.books) == ["DOWN/USDT", "NOBID/USDT"]  # LATE wasn't needed
+    assert quotes["BTC/USDT"].source == "bids_asks" and quotes["NOBID/USDT"].source == "order_book"
+    assert abs(quotes["NOBID/USDT"].spread_pct - 0.0999) < 1e-3
+
+
+def test_depth_filter_fetches_books_for_sizeless_bulk_quotes() -> None:
+    ex = FakeExchange()
+    ex.fetch_bids_asks = lambda symbols=None: {
+        "BARE/USDT": {"bid": 2.0, "ask": 2.002},  # prices, no sizes
+        "DOWN/USDT": {"bid": 2.0, "ask": 2.002},
+    }
+    kept, quotes, rejected = select_liquid(ex, ["BARE/USDT", "DOWN/USDT"], LiquidityConfig(min_top_depth=100.0))
+
+    assert kept == ["BARE/USDT"] and quotes["BARE/USDT"].source == "order_book"
+    assert rejected == [{"symbol": "DOWN/USDT", "reason": "top-of-book depth unknown"}]
+
+    # without a depth filter the bulk prices are enough
+    ex.books.clear()
+    assert select_liquid(ex, ["BARE/USDT"], LiquidityConfig(max_spread_pct=0.5))[0] == ["BARE/USDT"]
+    assert ex.books == []
+
+
+def test_spread_pads_the_fee_buffer() -> None:
+    cfg = RiskConfig(risk_usdt=1.0, fee_buffer_pct=0.1)
+    plain = compute_position_sizing(100.0, 99.0, cfg)
+    wide = compute_position_sizing(100.0, 99.0, cfg, spread_pct=0.4)
+    assert plain is not None and wide is not None
+    # a 0.4% spread on a 1% stop adds 0.40 per unit to the 1.001 risked
+    assert abs(wide.size_units - 1.0 / 1.401) < 1e-12
+    assert wide.size_units < plain.size_units
@@ -0,0 +1,33 @@
+import pytest
+
+from sentinel.core.exchange import ExchangeConfig, create_exchange
+from sentinel.core.stub import StubConfig, configure_stub, stub_config
+from sentinel.loadtest import run_load, start_server, stop_server, summarize
+
+
+@pytest.fixture(autouse=True)
+def _restore_stub():
+    saved = stub_config()
+    yield
+    configure_stub(saved)
+
+
+def test_stub_is_deterministic_and_offline() -> None:
+    configure_stub(StubConfig(symbols=5, latency_ms=0.0, jitter_ms=0.0))
+    a, b = create_exchange(ExchangeConfig(exchange_id="stub")), create_exchange(ExchangeConfig(exchange_id="stub"))
+    assert list(a.load_markets()) == [f"STUB00{i}/USDT" for i in range(5)]
+    assert a.fetch_ohlcv("STUB001/USDT", "1h", limit=50) == b.fetch_ohlcv("STUB001/USDT", "1h", limit=50)
+
+
+def test_load_run_reports_latency_percentiles() -> None:
+    # the server is a child process: it gets the stub through the environment, not configure_stub
+    server, url = start_server(StubConfig(symbols=12, latency_ms=1.0, jitter_ms=0.0))
+    try:
+        samples, elapsed = run_load(url, clients=3, presets=["swing", "scalping"], duration_s=1.0, refresh_s=0.1)
+    finally:
+        stop_server(server)
+
+    assert {s.preset for s in samples} == {"swing", "scalping"}
+    total = summarize("ALL", samples, elapsed)
+    assert total.requests >= 3 and total.errors == 0
+    assert 0 < total.p50_ms <= total.p95_ms <= total.p99_ms <= total.max_ms
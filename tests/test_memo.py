@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+
+from sentinel.core.memo import AnalysisCache, config_hash, drop_forming, last_closed_open_ms
+from sentinel.core.risk import RiskConfig
+
+HOUR = 3_600_000
+
+
+def test_lru_eviction_and_counters() -> None:
+    cache = AnalysisCache(max_entries=2)
+    calls = []
+
+    def compute(v):
+        calls.append(v)
+        return v
+
+    cache.get_or_compute("a", lambda: compute(1))
+    cache.get_or_compute("b", lambda: compute(2))
+    assert cache.get_or_compute("a", lambda: compute(99)) == 1  # hit, "a" now most recent
+    cache.get_or_compute("c", lambda: compute(3))  # evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert calls == [1, 2, 3]
+
+    st = cache.stats()
+    assert (st.hits, st.misses, st.evictions, st.size) == (2, 4, 1, 2)
+
+
+def test_key_parts_follow_candle_close_and_config() -> None:
+    # anywhere inside the 10:00–11:00 candle, the last closed one opened at 09:00
+    assert last_closed_open_ms("1h", 10 * HOUR) == 9 * HOUR
+    assert last_closed_open_ms("1h", 10 * HOUR + HOUR - 1) == 9 * HOUR
+    assert last_closed_open_ms("1h", 11 * HOUR) == 10 * HOUR
+
+    assert config_hash(RiskConfig()) == config_hash(RiskConfig())
+    assert config_hash(RiskConfig()) != config_hash(RiskConfig(risk_usdt=2.0))
+
+
+def _ms(*args) -> int:
+    return int(datetime(*args, tzinfo=UTC).timestamp() * 1000)
+
+
+def test_weekly_and_monthly_candles_follow_exchange_boundaries() -> None:
+    # Wednesday 2024-05-15: the current week opened Monday the 13th, the last closed one the 6th
+    assert last_closed_open_ms("1w", _ms(2024, 5, 15, 12)) == _ms(2024, 5, 6)
+    assert last_closed_open_ms("1w", _ms(2024, 5, 13)) == _ms(2024, 5, 6)
+    assert last_closed_open_ms("1M", _ms(2024, 3, 10)) == _ms(2024, 2, 1)
+    assert last_closed_open_ms("1M", _ms(2024, 1, 1)) == _ms(2023, 12, 1)
+
+
+def test_drop_forming_keeps_closed_candles_only() -> None:
+    rows = [[h * HOUR, 1, 1, 1, float(h), 1] for h in range(8, 11)]
+    assert drop_forming(rows, last_closed_open_ms("1h", 10 * HOUR + 5)) == rows[:2]
+    assert drop_forming(rows, last_closed_open_ms("1h", 11 * HOUR)) == rows
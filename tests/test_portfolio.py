@@ -0,0 +1,35 @@
+from sentinel.core.backtest import Signal
+from sentinel.core.portfolio import PortfolioConfig, run_portfolio, symbol_stream
+from sentinel.core.risk import RiskConfig
+
+
+def _bars(closes: list[float], t0: int = 0) -> list[list[float]]:
+    return [[t0 + i * 60_000, c, c, c, c, 1.0] for i, c in enumerate(closes)]
+
+
+def test_portfolio_merges_symbols_and_caps_open_positions() -> None:
+    a = symbol_stream("A/USDT", _bars([100, 100, 102, 102]), [Signal(0, 100.0, 98.0, 102.0)])
+    # B signals on the same bar A opens: rejected by the cap of 1
+    b = symbol_stream("B/USDT", _bars([50, 50, 48, 48]), [Signal(0, 50.0, 49.0, 51.0)])
+    # C signals after A's exit frees the slot, then stops out
+    c = symbol_stream("C/USDT", _bars([10, 10, 10, 9]), [Signal(2, 10.0, 9.5, 10.5)])
+
+    res = run_portfolio([a, b, c], RiskConfig(risk_usdt=2.0, fee_buffer_pct=0.0), PortfolioConfig(max_open=1))
+
+    assert res.trades == 2
+    assert res.wins == 1 and res.losses == 1
+    assert res.skipped_by_cap == 1
+    assert res.max_concurrent == 1
+    assert res.total_r == 0.0 and res.total_usdt == 0.0
+    assert res.max_drawdown_r == 1.0
+    assert [ts for ts, _eq in res.equity_curve] == [120_000, 180_000]
+
+
+def test_streams_carry_exits_not_candles() -> None:
+    a = symbol_stream("A/USDT", _bars([100, 101, 101, 101, 100.5]), [Signal(0, 100.0, 98.0, 102.0)], PortfolioConfig(horizon_bars=3))
+    (t,) = a.trades
+    assert (t.entry_ts, t.exit_ts, t.r, t.timeout) == (0, 180_000, 0.5, True)
+
+    open_ended = symbol_stream("B/USDT", _bars([50, 50]), [Signal(0, 50.0, 49.0, 51.0), Signal(1, 50.0, 49.0, 51.0)])
+    res = run_portfolio([a, open_ended], RiskConfig(risk_usdt=2.0, fee_buffer_pct=0.0))
+    assert (res.trades, res.timeouts, res.max_concurrent, res.total_usdt) == (1, 1, 2, 1.0)
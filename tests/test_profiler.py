@@ -0,0 +1,49 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from sentinel.core.profiler import SamplingProfiler
+from sentinel.webapp import app
+
+
+def _busy(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def _run_busy_thread(seconds: float = 0.3) -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,))
+    worker.start()
+    time.sleep(seconds)
+    stop.set()
+    worker.join()
+
+
+def test_collapsed_stacks_name_the_hot_function(tmp_path) -> None:
+    prof = SamplingProfiler(interval_s=0.002, package="tests").start()
+    _run_busy_thread()
+    prof.stop().write_collapsed(tmp_path / "p.folded")
+
+    assert prof.samples > 10
+    lines = (tmp_path / "p.folded").read_text(encoding="utf-8").splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+    busy = sum(n for st, n in prof.stacks.items() if "_busy (tests/test_profiler.py:" in st)
+    assert busy > prof.samples / 2
+    assert "tests/test_profiler.py" in prof.top(1)[0][0]
+
+
+def test_debug_profile_is_local_and_token_gated(monkeypatch) -> None:
+    local = TestClient(app, client=("127.0.0.1", 50000))
+    monkeypatch.delenv("SENTINEL_DEBUG_TOKEN", raising=False)
+    assert local.get("/debug/profile?seconds=0.1").status_code == 404  # no token configured: off
+
+    monkeypatch.setenv("SENTINEL_DEBUG_TOKEN", "s3cret")
+    remote = TestClient(app)
+    assert remote.get("/debug/profile?seconds=0.1", headers={"x-debug-token": "s3cret"}).status_code == 403
+    assert local.get("/debug/profile?seconds=0.1").status_code == 403
+    res = local.get("/debug/profile?seconds=0.2&interval_ms=2", headers={"x-debug-token": "s3cret"})
+    assert res.status_code == 200
+    assert int(res.headers["x-profile-samples"]) > 0
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from sentinel.core.exchange import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RateLimitConfig,
+    RequestScheduler,
+)
+from sentinel.core.stub import StubConfig, StubExchange, configure_stub, stub_config
+from sentinel.ui.schemas import ScanRequest
+from sentinel.ui.service import run_scan
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _wait_until(cond, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_interactive_requests_go_first() -> None:
+    clock = FakeClock()
+    sched = RequestScheduler(rate=20.0, cfg=RateLimitConfig(burst=1.0), clock=clock)
+    sched.acquire(1.0)  # drain the bucket; with the clock stopped nothing refills
+
+    order: list[str] = []
+
+    def worker(name: str, priority: int, rank: int) -> None:
+        sched.acquire(1.0, priority=priority, rank=rank)
+        order.append(name)
+
+    threads = [
+        threading.Thread(target=worker, args=("bg", PRIORITY_BACKGROUND, 0)),
+        threading.Thread(target=worker, args=("ui-2", PRIORITY_INTERACTIVE, 2)),
+        threading.Thread(target=worker, args=("ui-1", PRIORITY_INTERACTIVE, 1)),
+    ]
+    for t in threads:
+        t.start()
+    _wait_until(lambda: len(sched._waiting) == 3)
+
+    for served in range(1, 4):  # one token per tick
+        clock.now += 0.1  # refills past the 1-token burst cap
+        with sched._cond:
+            sched._cond.notify_all()
+        _wait_until(lambda n=served: len(order) == n)
+    for t in threads:
+        t.join(timeout=2)
+
+    assert order == ["ui-1", "ui-2", "bg"]
+
+
+def test_penalize_backs_off_and_recovers() -> None:
+    sched = RequestScheduler(rate=10.0, cfg=RateLimitConfig(penalty_s=0.01, recovery_step=0.5))
+    sched.penalize()
+    assert sched.rate == 5.0
+    sched.record_success()
+    sched.record_success()
+    assert sched.rate == 10.0
+
+
+@pytest.mark.parametrize(("max_pairs", "where", "calls"), [(50, None, 0), (5, None, 1), (50, "quote_volume > 0", 1)])
+def test_tickers_fetched_only_when_they_change_the_scan(monkeypatch, max_pairs, where, calls) -> None:
+    saved = stub_config()
+    configure_stub(StubConfig(symbols=8, latency_ms=0.0, jitter_ms=0.0))
+    fetched: list[int] = []
+    real = StubExchange.fetch_tickers
+    monkeypatch.setattr(StubExchange, "fetch_tickers", lambda self, *a, **k: fetched.append(1) or real(self, *a, **k))
+    try:
+        run_scan(ScanRequest(exchange="stub", quality=False, setups=False, brief=False, max_pairs=max_pairs, where=where))
+    finally:
+        configure_stub(saved)
+    assert len(fetched) == calls
@@ -0,0 +1,47 @@
+import numpy as np
+
+from sentinel.core.indicators import atr_pct
+from sentinel.core.mathutils import ema
+from sentinel.core.regime import MarketRegime, classify_regime
+from sentinel.core.regime_batch import (
+    CHAOS,
+    RANGE,
+    TREND,
+    classify_regime_batch,
+    ema_matrix,
+    regime_history,
+    rolling_atr_pct,
+    stack_ohlcv,
+)
+
+
+def test_batch_matches_scalar_classifier() -> None:
+    atr = np.array([[1.2, 0.1, 12.0, 1.2]])
+    ts = np.array([[0.01, 0.05, 0.4, 0.001]])
+    assert classify_regime_batch(atr, ts).tolist() == [[TREND, RANGE, CHAOS, RANGE]]
+    assert classify_regime(1.2, 0.001) == MarketRegime.RANGE
+
+
+def test_ema_and_atr_match_scalar_versions_with_padding() -> None:
+    rng = np.random.default_rng(0)
+    closes = list(100 * np.cumprod(1 + rng.normal(0, 0.01, 150)))
+    rows = [[i, c, c * 1.01, c * 0.99, c, 1.0] for i, c in enumerate(closes)]
+    _syms, highs, lows, mat = stack_ohlcv({"A/USDT": rows, "B/USDT": rows[:120]})
+
+    assert abs(ema_matrix(mat, 20)[1, -1] - ema(closes[:120], 20)) < 1e-9
+    assert abs(ema_matrix(mat, 50)[0, 99] - ema(closes[:100], 50)) < 1e-9
+    window = rolling_atr_pct(highs, lows, mat, window=149)
+    assert abs(window[0, -1] - atr_pct(list(highs[0]), list(lows[0]), closes)) < 1e-9
+
+
+def test_history_reports_transitions_and_run_length() -> None:
+    flat = [100.0] * 80
+    trend = [100.0 * 1.01**i for i in range(1, 121)]
+    rows = [[i, c, c * 1.005, c * 0.995, c, 1.0] for i, c in enumerate(flat + trend)]
+    symbols, highs, lows, closes = stack_ohlcv({"X/USDT": rows})
+
+    hist = regime_history(symbols, highs, lows, closes, atr_window=20)
+    regime, bars = hist.current("X/USDT")
+    assert regime == MarketRegime.TREND
+    assert hist.transitions and hist.transitions[-1].to_regime == MarketRegime.TREND
+    assert bars == 200 - hist.transitions[-1].bar
@@ -0,0 +1,37 @@
+from dataclasses import replace
+
+from sentinel.core.report import SymbolResult, build_briefing_text
+from sentinel.core.risk import RiskConfig, compute_position_sizing
+from sentinel.core.setups import TradePlan
+
+
+def _setup(symbol: str) -> SymbolResult:
+    plan = TradePlan(symbol, "long", "PULLBACK", "READY", 100.0, "close > EMA20", 95.0, 105.0, 110.0, "")
+    sizing = compute_position_sizing(100.0, 95.0, RiskConfig())
+    return SymbolResult(symbol, "trend", 1.2, 0.02, "A+ PULLBACK READY", "risk 1.00", plan, sizing, 0.05)
+
+
+def test_views_render_from_one_slotted_record() -> None:
+    r = _setup("SOL/USDT")
+    assert not hasattr(r, "__dict__")
+    assert set(r.summary()) < set(r.to_json())
+    assert r.to_json()["plan"].stop == 95.0
+
+    lines = r.text_lines()
+    assert lines[0].startswith("SOL/USDT") and "SPREAD=0.050%" in lines[2]
+    assert len(replace(r, action="trade-allowed").text_lines()) == 1  # demoted: no plan lines
+
+
+def test_briefing_sections_and_caps_in_one_pass() -> None:
+    rows = [_setup("SOL/USDT")]
+    rows += [SymbolResult(f"T{i}/USDT", "trend", 1.0, 0.01, "trade-allowed", "wait A+") for i in range(25)]
+    rows += [SymbolResult("R/USDT", "range", 0.5, 0.0, "limited", "avoid chop")]
+    rows += [SymbolResult("C/USDT", "chaos", 9.0, 0.0, "NO TRADE", "")]
+
+    text = build_briefing_text(rows)
+    order = [text.index(h) for h in ("A+ SETUPS", "TREND WATCHLIST", "RANGE / LIMITED", "CHAOS", "RISK RULES")]
+    assert order == sorted(order)
+    assert "- SOL/USDT: A+ PULLBACK READY  risk 1.00" in text
+    assert "T19/USDT" in text and "T20/USDT" not in text
+    assert "- C/USDT: protect capital" in text
+    assert build_briefing_text([]) == "No briefing rows.\n"
@@ -0,0 +1,110 @@
+import importlib
+import math
+import os
+
+import numpy as np
+import pytest
+
+import sentinel.backtest as bt
+import sentinel.core
+from sentinel.core.config import SentinelConfig
+from sentinel.core.resultcache import ResultCache, code_fingerprint, content_key
+from sentinel.core.setups import PullbackConfig
+
+
+class FakeExchange:
+    id = "fake-results"
+
+    def __init__(self, drift: float = 0.05) -> None:
+        self.drift = drift
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls += 1
+        rows = []
+        for i in range(limit):
+            c = 100 + 10 * math.sin(i / 15) + i * self.drift
+            rows.append([i * 3_600_000, c, c * 1.01, c * 0.99, c, 1.0])
+        return rows
+
+
+def test_content_key_tracks_data_and_config() -> None:
+    closes = [1.0, 2.0, 3.0]
+    base = content_key(closes, PullbackConfig())
+    assert base == content_key(np.array(closes), PullbackConfig())
+    assert base != content_key([1.0, 2.0, 3.5], PullbackConfig())
+    assert base != content_key(closes, PullbackConfig(pullback_tolerance_pct=9.0))
+
+
+def test_prune_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResultCache(tmp_path, max_bytes=10_000)
+    for i, key in enumerate(["aa1", "bb2", "cc3"]):
+        cache.put(key, b"x" * 4000)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    assert cache.get("aa1") is not None  # read bumps it past the others
+
+    assert cache.prune() == 1
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None and cache.get("cc3") is not None
+    assert cache.size_bytes() <= 10_000
+
+
+def test_corrupt_entry_is_a_miss(tmp_path) -> None:
+    cache = ResultCache(tmp_path)
+    cache.put("dd4", [1, 2])
+    cache._path("dd4").write_bytes(b"not a pickle")
+    assert cache.get("dd4") is None
+    assert not cache._path("dd4").exists()
+
+
+def test_backtest_pair_reuses_cached_series(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(bt, "_RESULT_CACHE", None)
+    opts = {k: None for k in bt._PAIR_OPTIONS} | {
+        "bars": 400,
+        "bootstrap": 50,
+        "block_size": 1,
+        "seed": 7,
+        "walk_forward": False,
+        "portfolio": False,
+        "result_cache": str(tmp_path),
+        "result_cache_mb": 16,
+    }
+    first = bt.backtest_pair(FakeExchange(), "BTC/USDT", ["1h"], opts, None, None, 0)
+    assert first.cache_hits == 0 and first.cache_misses == 2
+
+    calls = []
+    monkeypatch.setattr(bt, "detect_signals", lambda *a, **k: calls.append(a) or [])
+    again = bt.backtest_pair(FakeExchange(), "BTC/USDT", ["1h"], opts, None, None, 0)
+    assert again.cache_hits == 2 and not calls
+    assert again.results == first.results and again.boots == first.boots
+    assert first.results[0].trades > 0
+
+    # new candles → recomputed
+    bt.backtest_pair(FakeExchange(drift=0.06), "BTC/USDT", ["1h"], opts, None, None, 0)
+    assert len(calls) == 1
+
+    # a different detector setting → recomputed, without touching code
+    pb, br = bt.setup_configs(SentinelConfig(), "pullback_tolerance_pct=3.5")
+    assert pb.pullback_tolerance_pct == 3.5
+    with pytest.raises(ValueError):
+        bt.setup_configs(SentinelConfig(), "pullback_tolerance_pct=1,2")
+    bt.backtest_pair(FakeExchange(), "BTC/USDT", ["1h"], opts | {"pb": pb, "br": br}, None, None, 0)
+    assert len(calls) == 2
+
+
+def test_code_version_covers_the_backtest_module() -> None:
+    assert bt._code_version() != code_fingerprint(sentinel.core)
+
+
+def test_code_fingerprint_covers_every_module_of_a_package(tmp_path, monkeypatch) -> None:
+    pkg = tmp_path / "fp_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "detector.py").write_text("from fp_pkg.mathutils import ema\n")
+    (pkg / "mathutils.py").write_text("def ema(x):\n    return x\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    mod = importlib.import_module("fp_pkg")
+
+    before = code_fingerprint(mod)
+    (pkg / "mathutils.py").write_text("def ema(x):\n    return 2 * x\n")
+    assert code_fingerprint(mod) != before
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from sentinel.core.regime import MarketRegime
+from sentinel.core.report import SymbolResult
+from sentinel.core.screen import ScreenError, compile_screen, screen_table
+from sentinel.core.setups import DetectorRegistry
+from sentinel.core.stub import StubConfig, configure_stub, stub_config
+from sentinel.ui import service
+from sentinel.ui.schemas import ScanRequest
+from sentinel.ui.service import run_scan
+
+ROWS = [
+    SymbolResult("AAA/USDT", "trend", 0.5, 0.020, "trade-allowed"),
+    SymbolResult("BBB/USDT", "trend", 2.0, 0.015, "A+ pullback ready"),
+    SymbolResult("CCC/USDT", "range", 3.0, 0.000, "limited"),
+    SymbolResult("DDD/USDT", "chaos", 6.0, 0.030, "NO TRADE"),
+    SymbolResult("EEE/USDT", "trend", 1.5, 0.012, "trade-allowed"),
+]
+TICKERS = {
+    "AAA/USDT": {"quoteVolume": 9e6, "percentage": 1.0},
+    "BBB/USDT": {"quoteVolume": 5e6, "percentage": -2.0},
+    "CCC/USDT": {"quoteVolume": 7e6},
+    "EEE/USDT": {"quoteVolume": 8e6, "percentage": 3.0},
+}
+TABLE = screen_table(ROWS, {r.symbol: 10.0 for r in ROWS}, TICKERS, {})
+
+
+def symbols(where=None, sort=None) -> list[str]:
+    return [TABLE.symbols[i] for i in compile_screen(where, sort).apply(TABLE)]
+
+
+def test_filter_and_order() -> None:
+    assert symbols("atr_pct between 1 and 4 and trend_strength > 0.01 order by quote_volume desc") == ["EEE/USDT", "BBB/USDT"]
+    assert symbols("regime in ('TREND') and not setup = 1", sort="change_pct desc") == ["EEE/USDT", "AAA/USDT"]
+    assert symbols("abs(change_pct) >= 2 or symbol = 'ccc/usdt'") == ["BBB/USDT", "CCC/USDT", "EEE/USDT"]
+
+
+def test_unknown_values_fail_filters_and_sort_last() -> None:
+    assert "DDD/USDT" not in symbols("quote_volume > 0")
+    assert symbols(sort="quote_volume")[-1] == "DDD/USDT"
+    assert symbols(sort="quote_volume desc")[-1] == "DDD/USDT"
+    assert symbols(sort="regime, atr_pct desc") == ["DDD/USDT", "CCC/USDT", "BBB/USDT", "EEE/USDT", "AAA/USDT"]
+
+
+@pytest.mark.parametrize(
+    "where",
+    ["atr_pct >", "volume > 1", "regime > 'a'", "atr_pct", "atr_pct > 1 junk", "(atr_pct > 1", "atr_pct ; 1"],
+)
+def test_bad_expressions_are_rejected_at_compile_time(where) -> None:
+    with pytest.raises(ScreenError):
+        compile_screen(where)
+
+
+def test_compiled_once_and_vectorized() -> None:
+    assert compile_screen("atr_pct > 1") is compile_screen("atr_pct > 1")
+    mask = compile_screen("atr_pct > 1").mask(TABLE)
+    assert mask.dtype == np.bool_ and mask.tolist() == [False, True, True, True, True]
+
+
+@pytest.fixture
+def restore_stub():
+    saved = stub_config()
+    yield
+    configure_stub(saved)
+
+
+def test_run_scan_applies_screen_before_limit(restore_stub) -> None:
+    configure_stub(StubConfig(symbols=12, latency_ms=0.0, jitter_ms=0.0))
+    base = {"exchange": "stub", "quality": False, "setups": False, "brief": False, "limit": 3}
+    everything = run_scan(ScanRequest(**(base | {"limit": 50})))
+    screened = run_scan(ScanRequest(**base, where="atr_pct > 0", sort="atr_pct desc"))
+
+    expected = sorted(everything.rows, key=lambda r: -r.atr_pct)[:3]
+    assert [r.symbol for r in screened.rows] == [r.symbol for r in expected]
+    with pytest.raises(ScreenError):
+        run_scan(ScanRequest(**base, where="nonsense > 1"))
+
+
+def test_run_scan_reports_detector_failures(restore_stub, monkeypatch) -> None:
+    def broken(f, cfg):
+        raise ValueError("bad swing")
+
+    registry = DetectorRegistry()
+    registry.register("broken", broken, None)
+    monkeypatch.setattr(service, "default_detectors", lambda pb, br: registry)
+    monkeypatch.setattr(service, "_compute_regime", lambda f: (MarketRegime.TREND, 1.0, 0.01))
+    service.ANALYSIS_CACHE.clear()
+    configure_stub(StubConfig(symbols=3, latency_ms=0.0, jitter_ms=0.0))
+
+    res = run_scan(ScanRequest(exchange="stub", quality=False, brief=False, limit=3))
+    assert len(res.rows) == 3 and all(r.plan is None for r in res.rows)
+    assert [s["reason"] for s in res.skipped] == ["detector: bad swing"] * 3
@@ -0,0 +1,84 @@
+import multiprocessing as mp
+import threading
+import time
+
+import pytest
+
+from sentinel.core.sharedcache import SharedCache
+from sentinel.ui.snapshots import SnapshotStore
+
+
+def _fill(path: str, calls: str) -> None:
+    def compute() -> list[int]:
+        with open(calls, "a") as f:
+            f.write("x")
+        time.sleep(0.3)
+        return [1, 2, 3]
+
+    assert SharedCache(path).get_or_compute("ohlcv:BTC/USDT", 60.0, compute) == [1, 2, 3]
+
+
+def test_values_expire(tmp_path) -> None:
+    c = SharedCache(tmp_path / "c.sqlite3")
+    c.set("a", {"x": 1}, ttl_s=60.0)
+    c.set("b", "gone", ttl_s=-1.0)
+    assert c.get("a") == {"x": 1}
+    assert c.get("b") is None
+
+
+def test_lease_excludes_other_holders(tmp_path) -> None:
+    c = SharedCache(tmp_path / "c.sqlite3")
+    assert c.try_lease("k", ttl_s=30.0)
+    other: list[bool] = []
+    t = threading.Thread(target=lambda: other.append(c.try_lease("k", ttl_s=30.0)))
+    t.start()
+    t.join()
+    assert other == [False]
+    c.release("k")
+    t = threading.Thread(target=lambda: other.append(c.try_lease("k", ttl_s=30.0)))
+    t.start()
+    t.join()
+    assert other == [False, True]
+
+
+def test_concurrent_misses_across_processes_compute_once(tmp_path) -> None:
+    path, calls = str(tmp_path / "c.sqlite3"), str(tmp_path / "calls")
+    SharedCache(path).close()  # create the schema before the race
+    ctx = mp.get_context("fork")
+    procs = [ctx.Process(target=_fill, args=(path, calls)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=30)
+    assert [p.exitcode for p in procs] == [0, 0, 0, 0]
+    assert open(calls).read() == "x"
+
+
+def test_snapshot_versions_agree_across_stores(tmp_path) -> None:
+    a = SnapshotStore(shared=SharedCache(tmp_path / "c.sqlite3"))
+    b = SnapshotStore(shared=SharedCache(tmp_path / "c.sqlite3"))
+    row = {"symbol": "A", "regime": "trend", "atr_pct": 1.0, "trend_strength": 0.01, "action": "x"}
+    v1 = a.publish("k", {"rows": [row]})
+    assert b.publish("k", {"rows": [row]}).etag == v1.etag  # unchanged → same version
+    v2 = b.publish("k", {"rows": [{**row, "action": "y"}]})
+    assert v2.version == v1.version + 1
+    assert a.get("k", v2.version) == v2
+
+
+def test_snapshot_publish_without_the_lease_does_not_write(tmp_path) -> None:
+    cache = SharedCache(tmp_path / "c.sqlite3")
+    store = SnapshotStore(shared=cache, lease_wait_s=0.1)
+    row = {"symbol": "A", "regime": "trend", "atr_pct": 1.0, "trend_strength": 0.01, "action": "x"}
+
+    holder = threading.Thread(target=lambda: cache.try_lease("snapshots:k", ttl_s=30.0))
+    holder.start()
+    holder.join()
+    with pytest.raises(TimeoutError):
+        store.publish("k", {"rows": [row]})
+
+    local = SnapshotStore()
+    local.publish("k", {"rows": [row]})
+    cache.set("snapshots:k", local._by_key["k"], 60.0)  # what another worker published
+    served = store.publish("k", {"rows": [{**row, "action": "y"}]})
+    assert served.version == 1 and served.rows["A"]["action"] == "x"
+    assert store.latest("k") == served
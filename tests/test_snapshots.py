@@ -0,0 +1,36 @@
+from sentinel.ui.schemas import ScanRequest
+from sentinel.ui.snapshots import SnapshotStore, diff_snapshots, scan_key
+
+
+def _row(sym: str, atr: float, action: str = "limited") -> dict:
+    return {"symbol": sym, "regime": "range", "atr_pct": atr, "trend_strength": 0.0, "action": action, "note": ""}
+
+
+def test_version_moves_only_on_visible_change() -> None:
+    store = SnapshotStore()
+    v1 = store.publish("k", {"exchange": "x", "rows": [_row("A", 1.001), _row("B", 2.0)]})
+    same = store.publish("k", {"exchange": "x", "rows": [_row("A", 1.002), _row("B", 2.0)]})
+    assert same.version == v1.version and same.etag == v1.etag
+
+    v2 = store.publish("k", {"exchange": "x", "rows": [_row("B", 2.0, "A+ PULLBACK READY"), _row("C", 3.0)]})
+    assert v2.version == 2
+    delta = diff_snapshots(store.get("k", 1), v2)
+    assert [r["symbol"] for r in delta["added"]] == ["C"]
+    assert [r["symbol"] for r in delta["changed"]] == ["B"]
+    assert delta["removed"] == ["A"]
+    assert delta["order"] == ["B", "C"]
+
+
+def test_scan_key_ignores_background_flag() -> None:
+    assert scan_key(ScanRequest(background=True)) == scan_key(ScanRequest())
+    assert scan_key(ScanRequest(preset="scalping")) != scan_key(ScanRequest())
+
+
+def test_etag_names_content_not_process_state() -> None:
+    rows = {"exchange": "x", "rows": [_row("A", 1.0), _row("B", 2.0)]}
+    first, restarted = SnapshotStore(), SnapshotStore()
+    first.publish("k", {"exchange": "x", "rows": [_row("C", 5.0)]})
+    a = first.publish("k", rows)
+    b = restarted.publish("k", rows)
+    assert a.version != b.version and a.etag == b.etag
+    assert restarted.publish("k", {"exchange": "x", "rows": [_row("A", 1.5)]}).etag != b.etag
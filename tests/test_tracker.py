@@ -0,0 +1,77 @@
+from sentinel.core.setups import TradePlan
+from sentinel.core.tracker import EXPIRED, OPEN, PENDING, STOPPED, TP1, TP2, LevelIndex, PlanTracker
+
+H = 3_600_000
+
+
+def _plan(symbol: str, status: str = "READY", entry: float = 100.0, stop: float = 95.0) -> TradePlan:
+    risk = entry - stop
+    return TradePlan(symbol, "long", "PULLBACK", status, entry, "", stop, entry + risk, entry + 2 * risk, "")
+
+
+def test_level_index_pops_only_crossed_levels() -> None:
+    up, down = LevelIndex(), LevelIndex(upward=False)
+    for i, level in enumerate([101.0, 103.0, 105.0, 107.0]):
+        up.add(level, i, "tp1")
+        down.add(level, i, "stop")
+    up.remove(101.0, 0, "tp1")
+    assert [pid for _l, pid, _k in up.pop_crossed(104.0)] == [1]
+    assert [pid for _l, pid, _k in down.pop_crossed(105.0)] == [3, 2]
+    assert (len(up), len(down)) == (2, 2)
+
+    for i in range(100):  # removals compact the heap instead of leaving it to grow
+        up.add(200.0 + i, 10 + i, "tp1")
+        up.remove(200.0 + i, 10 + i, "tp1")
+    assert len(up._heap) < 40 and [pid for _l, pid, _k in up.pop_crossed(1e9)] == [2, 3]
+
+
+def test_plans_resolve_on_later_candles() -> None:
+    t = PlanTracker(expire_bars=10)
+    ready = t.add(_plan("A/USDT"), "1h", emitted_at=0)
+    runner = t.add(_plan("B/USDT", stop=90.0), "1h", emitted_at=0)
+    watch = t.add(_plan("C/USDT", status="WATCH"), "1h", emitted_at=0)
+    assert t.add(_plan("A/USDT", entry=100.5), "1h", emitted_at=H) is None  # same setup, same stop
+
+    assert (ready.state, watch.state) == (OPEN, PENDING)
+
+    # the emission candle itself never counts
+    t.update("A/USDT", "1h", [(0, 200.0, 1.0)])
+    assert ready.state == OPEN
+
+    t.update("A/USDT", "1h", [(H, 106.0, 99.0), (2 * H, 107.0, 94.0)])
+    assert (ready.state, ready.tp1_hit) == (TP1, True)  # TP1, then stopped before TP2
+
+    t.update("B/USDT", "1h", [(H, 121.0, 99.0)])
+    assert runner.state == TP2
+
+    t.update("C/USDT", "1h", [(H, 100.2, 99.0)])  # triggers the WATCH plan
+    assert watch.state == OPEN
+    t.update("C/USDT", "1h", [(H, 120.0, 50.0), (2 * H, 101.0, 94.0)])  # first candle already seen
+    assert watch.state == STOPPED
+
+    (rate,) = t.hit_rates()
+    assert (rate.emitted, rate.tp1, rate.tp2, rate.stopped) == (3, 1, 1, 1)
+    assert rate.hit_rate == 2 / 3
+
+
+def test_expiry_and_persistence(tmp_path) -> None:
+    t = PlanTracker(expire_bars=2)
+    p = t.add(_plan("A/USDT", status="WATCH"), "1h", emitted_at=0)
+    q = t.add(_plan("B/USDT"), "1h", emitted_at=0)
+    assert t.expire(H) == 0
+    t.save(tmp_path / "t.json")
+
+    again = PlanTracker.load(tmp_path / "t.json", expire_bars=2)
+    assert again.open_books() == [("A/USDT", "1h"), ("B/USDT", "1h")]
+    again.update("B/USDT", "1h", [(H, 111.0, 99.0)])
+    assert again.plans[q.id].state == TP2
+    assert again.expire(2 * H) == 1
+    assert again.plans[p.id].state == EXPIRED
+
+
+def test_reindexing_does_not_grow_the_expiry_heap() -> None:
+    t = PlanTracker(expire_bars=10)
+    watch = t.add(_plan("A/USDT", status="WATCH", stop=90.0), "1h", emitted_at=0)
+    t.update("A/USDT", "1h", [(H, 100.5, 99.0), (2 * H, 111.0, 99.0)])  # trigger, then TP1
+    assert (watch.state, watch.tp1_hit) == (OPEN, True)
+    assert len(t._expiry) == 1
@@ -0,0 +1,65 @@
+from sentinel.core.filters import quote_volume_in_usdt, rank_quality_pairs
+from sentinel.core.universe import build_universe, load_universe, read_universe, save_universe
+
+MARKETS = {
+    "BTC/USDT": {"base": "BTC", "quote": "USDT", "type": "spot", "active": True},
+    "JUP/USDT": {"base": "JUP", "quote": "USDT", "type": "spot", "active": True},
+    "BTCUP/USDT": {"base": "BTCUP", "quote": "USDT", "type": "spot", "active": True},
+    "USDC/USDT": {"base": "USDC", "quote": "USDT", "type": "spot", "active": True},
+    "OLD/USDT": {"base": "OLD", "quote": "USDT", "type": "spot", "active": False},
+    "ETH/FDUSD": {"base": "ETH", "quote": "FDUSD", "type": "spot", "active": True},
+    "ETH/USDT:USDT": {"base": "ETH", "quote": "USDT", "type": "swap", "active": None},
+}
+
+
+def test_select_by_quote_type_and_flags() -> None:
+    u = build_universe("test", MARKETS)
+
+    assert u.select() == ["BTC/USDT", "JUP/USDT", "USDC/USDT"]
+    assert u.select(exclude_stables=True) == ["BTC/USDT", "JUP/USDT"]
+    assert "BTCUP/USDT" in u.select(exclude_leveraged=False)
+    assert "OLD/USDT" in u.select(active_only=False)
+    assert u.select(quote="fdusd") == ["ETH/FDUSD"]
+    assert u.select(market_type="swap") == ["ETH/USDT:USDT"]
+    assert u.quotes == ["FDUSD", "USDT"]
+
+
+def test_save_load_round_trip(tmp_path) -> None:
+    u = build_universe("test", MARKETS)
+    save_universe(u, tmp_path / "test.json")
+    again = read_universe(tmp_path / "test.json")
+
+    assert again is not None
+    assert again.fingerprint == u.fingerprint
+    assert again.entries == u.entries
+    assert again.select(exclude_stables=True) == u.select(exclude_stables=True)
+
+
+def test_load_universe_rebuilds_when_markets_change(tmp_path) -> None:
+    first = load_universe("test-reload", MARKETS, cache_dir=str(tmp_path))
+    assert (tmp_path / "test-reload.json").exists()
+
+    changed = {**MARKETS, "SOL/USDT": {"base": "SOL", "quote": "USDT", "type": "spot", "active": True}}
+    second = load_universe("test-reload", changed, cache_dir=str(tmp_path))
+    assert second.fingerprint != first.fingerprint
+    assert "SOL/USDT" in second.select()
+
+
+def test_quality_ranking_compares_usdt_volume_across_quotes() -> None:
+    tickers = {
+        "BTC/USDT": {"quoteVolume": 9e8, "last": 60_000.0},
+        "ETH/BTC": {"quoteVolume": 200.0},  # 200 BTC ≈ 12M USDT
+        "DOGE/BTC": {"quoteVolume": 20.0},  # ≈ 1.2M USDT, below the bar
+        "ETH/FDUSD": {"quoteVolume": 7e6},  # no FDUSD/USDT ticker: at par
+        "ETH/TRY": {"quoteVolume": 5e8},  # unconvertible: threshold skipped, ranked last
+    }
+    assert quote_volume_in_usdt("ETH/BTC", tickers) == 12_000_000.0
+    assert quote_volume_in_usdt("ETH/TRY", tickers) is None
+
+    ranked = rank_quality_pairs({}, list(tickers), 5e6, tickers)
+    assert ranked == ["BTC/USDT", "ETH/BTC", "ETH/FDUSD", "ETH/TRY"]
+
+
+def test_fingerprint_tracks_precision_and_limits() -> None:
+    ticked = {**MARKETS, "BTC/USDT": {**MARKETS["BTC/USDT"], "precision": {"price": 0.01}}}
+    assert build_universe("test", ticked).fingerprint != build_universe("test", MARKETS).fingerprint
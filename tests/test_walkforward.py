@@ -0,0 +1,54 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import sentinel.backtest as bt
+import sentinel.core.walkforward as wf
+from sentinel.core.backtest import detect_signals
+from sentinel.core.walkforward import WalkForwardConfig, make_folds, parse_grid, walk_forward
+
+
+def test_make_folds_rolling_and_anchored() -> None:
+    folds = make_folds(1000, WalkForwardConfig(train_bars=400, test_bars=200))
+    assert [(f.train_start, f.train_end, f.test_end) for f in folds] == [(0, 400, 600), (200, 600, 800), (400, 800, 1000)]
+
+    anchored = make_folds(1000, WalkForwardConfig(train_bars=400, test_bars=200, anchored=True))
+    assert all(f.train_start == 0 for f in anchored)
+
+
+def test_parse_grid_casts_to_field_types() -> None:
+    grid = parse_grid("pullback_tolerance_pct=1.5,2;breakout_lookback=30,40")
+    assert grid == {"pullback_tolerance_pct": [1.5, 2.0], "breakout_lookback": [30, 40]}
+
+
+def test_walk_forward_runs_every_fold() -> None:
+    closes = [100 + 10 * math.sin(i / 15) + i * 0.05 for i in range(700)]
+    lows = [c * 0.99 for c in closes]
+    cfg = WalkForwardConfig(train_bars=300, test_bars=100, min_train_trades=1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        (res,) = walk_forward([("X/USDT", "1h", closes, lows)], cfg, grid=parse_grid("pullback_tolerance_pct=1,2.2"), executor=pool)
+
+    assert len(res.folds) == 4
+    assert res.aggregate.trades == sum(f.test.trades for f in res.folds)
+
+
+@pytest.mark.parametrize("extra", [["--portfolio"], ["--bootstrap", "100"], ["--regime-filter", "trend"]])
+def test_walk_forward_rejects_options_it_would_ignore(monkeypatch, capsys, extra) -> None:
+    monkeypatch.setattr("sys.argv", ["backtest", "--walk-forward", *extra])
+    monkeypatch.setattr(bt, "create_exchange", lambda cfg: pytest.fail("exchange created"))
+    assert bt.main() == 2
+    assert extra[0] in capsys.readouterr().err
+
+
+def test_variant_maps_combine_like_detect_signals() -> None:
+    closes = [100 + 10 * math.sin(i / 15) + i * 0.05 for i in range(400)]
+    lows = [c * 0.99 for c in closes]
+    pb_map = wf._detect_variant(("X/USDT", closes, lows, "pb", {}, 100))
+    br_map = wf._detect_variant(("X/USDT", closes, lows, "br", {}, 100))
+
+    combined = [pb_map.get(i) or br_map.get(i) for i in range(400)]
+    assert [s for s in combined if s is not None] == detect_signals("X/USDT", closes, lows)
+
+    fold = wf.Fold(0, 150, 250, 250, 300)
+    assert set(wf._fold_slice(pb_map, fold)) == {i for i in pb_map if 150 <= i < 300}
@@ -0,0 +1,65 @@
+import re
+
+from fastapi.testclient import TestClient
+
+from sentinel import webapp
+from sentinel.core.report import SymbolResult
+from sentinel.ui.schemas import ScanResponse
+from sentinel.ui.snapshots import SnapshotStore
+from sentinel.webapp import app
+
+
+def test_index_links_fingerprinted_assets_with_long_cache() -> None:
+    client = TestClient(app)
+    page = client.get("/")
+    assert page.status_code == 200
+    assert page.headers["content-encoding"] == "gzip"
+
+    url = re.search(r'src="(/static/app\.[0-9a-f]{10}\.js)"', page.text).group(1)
+    js = client.get(url)
+    assert js.status_code == 200
+    assert "immutable" in js.headers["cache-control"]
+    assert client.get(url, headers={"if-none-match": js.headers["etag"]}).status_code == 304
+
+    # gzip and identity bodies differ, so their validators must too
+    plain = client.get(url, headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.headers["etag"] != js.headers["etag"]
+    assert client.get(url, headers={"accept-encoding": "identity", "if-none-match": js.headers["etag"]}).status_code == 200
+    assert client.get("/static/app.js").headers["cache-control"] == "no-cache"
+
+
+def test_scan_poll_validation_and_fresh_304(monkeypatch) -> None:
+    calls = []
+
+    def fake_scan(req):
+        calls.append(req)
+        row = SymbolResult("A/USDT", "trend", 1.0, 0.02, "trade-allowed")
+        return ScanResponse("x", "4h", 120, 60, [row], "")
+
+    monkeypatch.setattr(webapp, "run_scan", fake_scan)
+    monkeypatch.setattr(webapp, "SNAPSHOTS", SnapshotStore())
+    client = TestClient(app)
+
+    assert client.post("/api/scan", json={"since_version": "abc"}).status_code == 400
+    first = client.post("/api/scan", json={})
+    assert first.status_code == 200 and len(calls) == 1
+
+    # the same content was just published: no rescan
+    again = client.post("/api/scan", json={"since_version": first.json()["version"]}, headers={"if-none-match": first.headers["etag"]})
+    assert again.status_code == 304 and len(calls) == 1
+
+
+def test_scan_etag_is_weak_across_encodings(monkeypatch) -> None:
+    rows = [SymbolResult(f"S{i}/USDT", "trend", 1.0, 0.02, "trade-allowed") for i in range(40)]  # > gzip minimum
+    monkeypatch.setattr(webapp, "run_scan", lambda req: ScanResponse("x", "4h", 120, 0, rows, ""))
+    monkeypatch.setattr(webapp, "SNAPSHOTS", SnapshotStore())
+    client = TestClient(app)
+
+    gz = client.post("/api/scan", json={})
+    assert gz.headers["content-encoding"] == "gzip" and "Accept-Encoding" in gz.headers["vary"]
+    assert gz.headers["etag"].startswith('W/"')
+
+    # the identity body carries the same data, so the gzip validator still matches it
+    plain = client.post("/api/scan", json={}, headers={"accept-encoding": "identity", "if-none-match": gz.headers["etag"]})
+    assert plain.status_code == 304 and plain.headers["etag"] == gz.headers["etag"] and plain.headers["vary"] == "Accept-Encoding"
+    assert client.post("/api/scan", json={}, headers={"if-none-match": gz.headers["etag"][2:]}).status_code == 304